@@ -1,15 +1,41 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import os
 import re
+import sys
+from collections.abc import Mapping
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
+LIB_DIR = Path(__file__).resolve().parent / "ci" / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from content_cache import ContentCache, string_list  # noqa: E402
+from file_store import walk_files  # noqa: E402
+from worker_pool import script_pool  # noqa: E402
+
 ROOT = Path(__file__).resolve().parents[1]
 DOCS_DIR = ROOT / "docs"
 SRC_DIR = ROOT / "src"
 TESTS_DIR = ROOT / "tests"
 ROOT_README = ROOT / "README.md"
+DRIFT_RULES_PATH = ROOT / "tools" / "ci" / "policies" / "rules" / "docs_drift.yaml"
+DRIFT_HINTS_PATH = ROOT / "tools" / "ci" / "policies" / "data" / "docs_drift_hints.json"
+RULE_CACHE_PATH = ROOT / "artifacts" / "cache" / "docs-consistency" / "drift-rules.json"
+RULE_CACHE_SCHEMA_VERSION = 2
+RESULT_CACHE_PATH = ROOT / "artifacts" / "cache" / "docs-consistency" / "results.json"
+GLOBAL_FLAGS_RE = re.compile(r"^\(\?(?P<flags>[aiLmsux]+)\)")
+REGEX_META = frozenset(".^$*+?{}[]()|\\")
+YAML_KEY_RE = re.compile(r"^(?P<key>[A-Za-z_][A-Za-z0-9_-]*):(?:\s+(?P<value>.*))?$")
+YAML_INT_RE = re.compile(r"^-?[0-9]+$")
+# Flow collections, anchors, aliases, tags, block scalars, double quotes and directives are outside the subset.
+YAML_UNSUPPORTED_INDICATORS = frozenset("[]{}&*!|>\"%@`")
 
 
 @dataclass(frozen=True)
@@ -17,96 +43,358 @@ class DriftRule:
     rule_id: str
     pattern: re.Pattern[str]
     guidance: str
+    docs_paths: tuple[str, ...] = ()
+    allowed_paths: tuple[str, ...] = ()
+
+    def applies_to(self, rel: str) -> bool:
+        if rel in self.allowed_paths:
+            return False
+        return not self.docs_paths or any(rel == p or rel.startswith(f"{p}/") for p in self.docs_paths)
+
+
+@dataclass(frozen=True)
+class RuleMatcher:
+    """Drift rules confirmed line by line, behind a literal prefilter.
+
+    A rule whose required literal occurs nowhere in a file is skipped for that file; otherwise its regex only runs
+    on lines containing the literal.
+    """
+
+    rules: tuple[DriftRule, ...]
+    literals: tuple[str, ...]
+
+    def hits(self, text: str) -> list[tuple[int, str, DriftRule]]:
+        folded_text = fold_case(text)
+        candidates = [
+            (rule, literal, bool(rule.pattern.flags & re.IGNORECASE))
+            for rule, literal in zip(self.rules, self.literals)
+            if literal in (folded_text if rule.pattern.flags & re.IGNORECASE else text)
+        ]
+        if not candidates:
+            return []
+        found: list[tuple[int, str, DriftRule]] = []
+        for line_no, line in enumerate(text.splitlines(), start=1):
+            folded = fold_case(line)
+            for rule, literal, ignore_case in candidates:
+                if literal in (folded if ignore_case else line) and rule.pattern.search(line):
+                    found.append((line_no, line, rule))
+        return found
+
+
+def fold_case(text: str) -> str:
+    # casefold() keeps the dotless i, which IGNORECASE matches against i and I.
+    return text.casefold().replace("\u0131", "i")
+
+
+def required_literal(pattern: re.Pattern[str]) -> str:
+    """Longest literal every match of `pattern` contains (case-folded when it ignores case); "" if none is known.
+
+    Group contents, classes, escapes such as \\b and characters made optional by a quantifier do not count, and a
+    top-level alternation has no required literal. Case-insensitive literals are ASCII only, where folding is exact.
+    """
+    if pattern.flags & re.VERBOSE:
+        return ""
+    source = GLOBAL_FLAGS_RE.sub("", pattern.pattern, count=1)
+    runs = [""]
+    depth = pos = 0
+    while pos < len(source):
+        ch = source[pos]
+        pos += 1
+        if ch == "\\":
+            escaped = source[pos : pos + 1]
+            pos += 1
+            if escaped and not escaped.isalnum() and depth == 0:
+                runs[-1] += escaped
+                continue
+        elif ch not in REGEX_META:
+            if depth == 0:
+                runs[-1] += ch
+                continue
+        elif ch in "?*{":
+            runs[-1] = runs[-1][:-1]
+        elif ch == "[":
+            pos += 1 if source.startswith("]", pos) else 2 if source.startswith("^]", pos) else 0
+            while pos < len(source) and source[pos] != "]":
+                pos += 2 if source[pos] == "\\" else 1
+            pos += 1
+        elif ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        elif ch == "|" and depth == 0:
+            return ""
+        runs.append("")
+    literal = max(runs, key=len)
+    if pattern.flags & re.IGNORECASE:
+        return fold_case(literal) if literal.isascii() else ""
+    return literal
+
+
+def compile_rules(rules: tuple[DriftRule, ...]) -> RuleMatcher:
+    return RuleMatcher(rules=rules, literals=tuple(required_literal(rule.pattern) for rule in rules))
+
+
+def yaml_scalar(text: str, line_no: int) -> str | int:
+    """Plain or single-quoted scalar; plain integers become ints."""
+    if text.startswith("'"):
+        if len(text) < 2 or not text.endswith("'") or "'" in text[1:-1].replace("''", ""):
+            raise ValueError(f"line {line_no}: malformed single-quoted scalar")
+        return text[1:-1].replace("''", "'")
+    text = text.split(" #", 1)[0].rstrip()
+    if text[:1] in YAML_UNSUPPORTED_INDICATORS:
+        raise ValueError(f"line {line_no}: unsupported YAML construct {text!r}")
+    return int(text) if YAML_INT_RE.match(text) else text
+
+
+def yaml_block(lines: list[tuple[int, str, int]], pos: int, indent: int) -> tuple[object, int]:
+    """Parse the mapping or sequence starting at `lines[pos]`; returns it with the position after it."""
+    if lines[pos][1].startswith("- "):
+        items: list[object] = []
+        while pos < len(lines) and lines[pos][0] == indent and lines[pos][1].startswith("- "):
+            _, text, line_no = lines[pos]
+            rest = text[2:].lstrip()
+            if YAML_KEY_RE.match(rest):
+                # "- key: value" opens a mapping aligned with its first key.
+                lines[pos] = (indent + len(text) - len(rest), rest, line_no)
+                item, pos = yaml_block(lines, pos, lines[pos][0])
+            else:
+                item, pos = yaml_scalar(rest, line_no), pos + 1
+            items.append(item)
+        return items, pos
+
+    mapping: dict[str, object] = {}
+    while pos < len(lines) and lines[pos][0] == indent and not lines[pos][1].startswith("-"):
+        _, text, line_no = lines[pos]
+        m = YAML_KEY_RE.match(text)
+        if m is None:
+            raise ValueError(f"line {line_no}: expected 'key: value'")
+        pos += 1
+        value = m.group("value")
+        if value and not value.startswith("#"):
+            mapping[m.group("key")] = yaml_scalar(value, line_no)
+        elif pos < len(lines) and (
+            lines[pos][0] > indent or (lines[pos][0] == indent and lines[pos][1].startswith("- "))
+        ):
+            mapping[m.group("key")], pos = yaml_block(lines, pos, lines[pos][0])
+        else:
+            raise ValueError(f"line {line_no}: '{m.group('key')}' has no value")
+    return mapping, pos
+
+
+def parse_policy_yaml(text: str) -> object:
+    """Read the YAML subset the policy rule files use: block mappings and sequences of plain or quoted scalars."""
+    lines: list[tuple[int, str, int]] = []
+    for line_no, raw in enumerate(text.splitlines(), start=1):
+        stripped = raw.strip()
+        if not stripped or stripped.startswith("#"):
+            continue
+        if "\t" in raw[: len(raw) - len(raw.lstrip())]:
+            raise ValueError(f"line {line_no}: tab indentation")
+        lines.append((len(raw) - len(raw.lstrip(" ")), stripped, line_no))
+    if not lines:
+        raise ValueError("empty policy file")
+    data, pos = yaml_block(lines, 0, lines[0][0])
+    if pos != len(lines):
+        raise ValueError(f"line {lines[pos][2]}: unexpected indentation")
+    return data
+
 
+def load_hints(raw: bytes) -> dict[str, tuple[str, str]]:
+    """Legacy DOC-CONSISTENCY id and replacement hint, keyed by the retired path a forbidden pattern requires."""
+    data = json.loads(raw)
+    if not isinstance(data, dict) or data.get("schema_version") != 2:
+        raise ValueError("unsupported drift hints schema")
+    return {
+        fold_case(str(legacy)): (str(hint["id"]), f"Use {hint['replacement']}")
+        for legacy, hint in data["legacy_paths"].items()
+    }
 
-RULES: tuple[DriftRule, ...] = (
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-001",
-        pattern=re.compile(r"(?i)\b(?:docs/)?01_FUNCTIONS\.md\b"),
-        guidance="Use docs/010_API_CORE.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-002",
-        pattern=re.compile(r"(?i)\b(?:docs/)?02_ARCHITECTURE_AND_FLOWS\.md\b"),
-        guidance="Use docs/020_ARCH_CORE.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-003",
-        pattern=re.compile(r"(?i)\b(?:docs/)?03_REFERENCES\.md\b"),
-        guidance="Use docs/references/001_REFERENCES_CORE.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-004",
-        pattern=re.compile(r"(?i)\b(?:docs/)?DIN_SPECIFICATION_DE\.md\b"),
-        guidance="Use docs/specs/001_SPEC_DIN.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-005",
-        pattern=re.compile(r"(?i)\b(?:docs/)?guides/OPTIONS_CHANGE_GUIDE\.md\b|\bOPTIONS_CHANGE_GUIDE\.md\b"),
-        guidance="Use docs/guides/001_GUIDE_OPTIONS.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-006",
-        pattern=re.compile(r"(?i)\b(?:docs/)?guides/DATATYPE_EXTENSION_GUIDE\.md\b|\bDATATYPE_EXTENSION_GUIDE\.md\b"),
-        guidance="Use docs/guides/002_GUIDE_DATATYPE.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-007",
-        pattern=re.compile(r"(?i)\b(?:docs/)?guides/README\.md\b"),
-        guidance="Use docs/guides/000_INDEX_GUIDES.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-008",
-        pattern=re.compile(r"(?i)\bdocs/04_[A-Z0-9_]+\.md\b"),
-        guidance="Use canonical 3-digit uppercase path under docs/ (for example docs/contracts/001_CONTRACT_HASHING.MD)",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-009",
-        pattern=re.compile(r"(?i)\b(?:docs/)?04_DETERMINISTIC_HASHING_API_CONTRACT\.md\b"),
-        guidance="Use docs/contracts/001_CONTRACT_HASHING.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-010",
-        pattern=re.compile(r"(?i)\b(?:docs/)?04_DIN_SPECIFICATION_DE\.md\b"),
-        guidance="Use docs/specs/001_SPEC_DIN.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-011",
-        pattern=re.compile(r"(?i)\b(?:docs/)?04_REFERENCES\.md\b"),
-        guidance="Use docs/references/001_REFERENCES_CORE.MD",
-    ),
-    DriftRule(
-        rule_id="DOC-CONSISTENCY-012",
-        pattern=re.compile(r"(?i)\b(?:docs/)?04_API_FUNCTIONS\.md\b"),
-        guidance="Use docs/010_API_CORE.MD",
-    ),
-)
-
-
-def collect_markdown_files() -> list[Path]:
+
+def parse_rule_records(raw: bytes, hints: dict[str, tuple[str, str]] | None = None) -> list[dict[str, object]]:
+    """Expand every docs_drift policy rule into one record per forbidden pattern."""
+    data = parse_policy_yaml(raw.decode("utf-8"))
+    if not isinstance(data, dict):
+        raise ValueError("rule file root must be a mapping")
+    hints = hints or {}
+    records: list[dict[str, object]] = []
+    for rule in data.get("rules") or []:
+        if rule.get("policy_type") != "docs_drift":
+            continue
+        params = rule.get("params") or {}
+        for pattern in params.get("forbidden_patterns") or []:
+            legacy = fold_case(required_literal(re.compile(pattern)))
+            rule_id, guidance = hints.get(legacy, (rule["rule_id"], rule["title"]))
+            records.append({
+                "rule_id": rule_id,
+                "pattern": pattern,
+                "guidance": guidance,
+                "docs_paths": list(params.get("docs_paths") or []),
+                "allowed_paths": list(params.get("allowed_paths") or []),
+            })
+    if not records:
+        raise ValueError("no docs_drift forbidden_patterns declared")
+    required = {fold_case(required_literal(re.compile(str(record["pattern"])))) for record in records}
+    stale = sorted(set(hints) - required)
+    if stale:
+        raise ValueError(f"drift hints for paths no forbidden pattern requires: {', '.join(stale)}")
+    return records
+
+
+def build_matcher(records: list[dict[str, object]]) -> RuleMatcher:
+    rules = tuple(
+        DriftRule(
+            rule_id=str(record["rule_id"]),
+            pattern=re.compile(str(record["pattern"])),
+            guidance=str(record["guidance"]),
+            docs_paths=tuple(record["docs_paths"]),
+            allowed_paths=tuple(record["allowed_paths"]),
+        )
+        for record in records
+    )
+    return compile_rules(rules)
+
+
+def load_matcher(
+    rules_path: Path = DRIFT_RULES_PATH,
+    cache_path: Path | None = RULE_CACHE_PATH,
+    hints_path: Path | None = DRIFT_HINTS_PATH,
+) -> RuleMatcher:
+    """Build the matcher from the policy rule file and hints, reusing parsed rules cached under their content hash."""
+    raw = rules_path.read_bytes()
+    raw_hints = hints_path.read_bytes() if hints_path is not None else b""
+    digest = hashlib.sha256(raw + b"\0" + raw_hints).hexdigest()
+    if cache_path is not None and cache_path.exists():
+        try:
+            cached = json.loads(cache_path.read_text(encoding="utf-8"))
+            if cached.get("schema_version") == RULE_CACHE_SCHEMA_VERSION and cached.get("rules_sha256") == digest:
+                return build_matcher(cached["rules"])
+        except (OSError, ValueError, KeyError, TypeError, AttributeError, re.error):
+            pass
+
+    records = parse_rule_records(raw, load_hints(raw_hints) if hints_path is not None else None)
+    matcher = build_matcher(records)
+    if cache_path is not None:
+        payload = {"schema_version": RULE_CACHE_SCHEMA_VERSION, "rules_sha256": digest, "rules": records}
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f"{cache_path.name}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, cache_path)
+    return matcher
+
+
+def ruleset_hash(rules_path: Path = DRIFT_RULES_PATH) -> str:
+    """Digest of the rule file, its hints and this checker, so a change to any of them invalidates cached results."""
+    digest = hashlib.sha256(rules_path.read_bytes())
+    digest.update(DRIFT_HINTS_PATH.read_bytes())
+    digest.update(Path(__file__).read_bytes())
+    return digest.hexdigest()
+
+
+def collect_markdown_files(texts: Mapping[Path, str] | None = None) -> list[Path]:
     files: list[Path] = []
-    if ROOT_README.exists():
+    if ROOT_README.exists() if texts is None else ROOT_README in texts:
         files.append(ROOT_README)
-    files.extend(sorted(DOCS_DIR.rglob("*.MD")))
-    files.extend(sorted(DOCS_DIR.rglob("*.md")))
-    files.extend(sorted(SRC_DIR.rglob("README.md")))
-    files.extend(sorted(TESTS_DIR.rglob("README.md")))
+    files.extend(walk_files(DOCS_DIR, "*.MD", texts))
+    files.extend(walk_files(DOCS_DIR, "*.md", texts))
+    files.extend(walk_files(SRC_DIR, "README.md", texts))
+    files.extend(walk_files(TESTS_DIR, "README.md", texts))
     return files
 
 
-def main() -> int:
+def check_text(file: Path, text: str, matcher: RuleMatcher, root: Path | None = None) -> list[str]:
     violations: list[str] = []
-    for file in collect_markdown_files():
+    rel = file.relative_to(ROOT if root is None else root)
+    for line_no, line, rule in matcher.hits(text):
+        if not rule.applies_to(rel.as_posix()):
+            continue
+        snippet = line.strip()
+        violations.append(
+            f"{rel}:{line_no} [{rule.rule_id}] {snippet} -> {rule.guidance}"
+        )
+    return violations
+
+
+def scan_file(file: Path, text: str | None, matcher: RuleMatcher, root: Path | None = None) -> list[str]:
+    if text is None:
         text = file.read_text(encoding="utf-8")
-        for line_no, line in enumerate(text.splitlines(), start=1):
-            for rule in RULES:
-                if not rule.pattern.search(line):
-                    continue
-                rel = file.relative_to(ROOT)
-                snippet = line.strip()
-                violations.append(
-                    f"{rel}:{line_no} [{rule.rule_id}] {snippet} -> {rule.guidance}"
-                )
+    return check_text(file, text, matcher, root)
+
+
+def scan_files(
+    files: list[Path],
+    texts: Mapping[Path, str] | None,
+    matcher: RuleMatcher,
+    jobs: int = 1,
+    cache: ContentCache | None = None,
+) -> list[str]:
+    """Violations in file order; cached files are replayed, the rest scanned (in a process pool if `jobs` > 1)."""
+    contents = [texts[f] if texts is not None else None for f in files]
+    results: list[list[str] | None] = [None] * len(files)
+    digests: list[str] = []
+    if cache is not None:
+        for idx, file in enumerate(files):
+            text = contents[idx]
+            if text is None:
+                text = contents[idx] = file.read_text(encoding="utf-8")
+            digests.append(hashlib.sha256(text.encode("utf-8")).hexdigest())
+            results[idx] = cache.get(file.relative_to(ROOT).as_posix(), digests[idx], string_list)
+
+    pending = [idx for idx, found in enumerate(results) if found is None]
+    pending_files = [files[idx] for idx in pending]
+    pending_contents = [contents[idx] for idx in pending]
+    if jobs <= 1 or len(pending) < 2:
+        scanned = list(map(scan_file, pending_files, pending_contents, [matcher] * len(pending)))
+    else:
+        chunksize = max(1, len(pending) // (jobs * 4))
+        with script_pool(sys.modules[__name__], jobs) as pool:
+            # Workers get the root explicitly: under spawn they re-import this module and see its default ROOT.
+            scan = partial(scan_file, matcher=matcher, root=ROOT)
+            scanned = list(pool.map(scan, pending_files, pending_contents, chunksize=chunksize))
+
+    for idx, found in zip(pending, scanned):
+        results[idx] = found
+        if cache is not None:
+            cache.put(files[idx].relative_to(ROOT).as_posix(), digests[idx], found)
+    return [violation for found in results if found is not None for violation in found]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Flag references to legacy doc paths declared in docs_drift.yaml.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Scan files in N worker processes (0 = one per CPU; default: 1).",
+    )
+    parser.add_argument(
+        "--result-cache",
+        default=str(RESULT_CACHE_PATH.relative_to(ROOT)),
+        help="Per-file result cache, relative to the repository root.",
+    )
+    parser.add_argument(
+        "--no-result-cache",
+        action="store_true",
+        help="Rescan every file and leave the cache untouched.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None, texts: Mapping[Path, str] | None = None) -> int:
+    args = parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    try:
+        matcher = load_matcher()
+    except (OSError, ValueError, KeyError, TypeError, AttributeError, re.error) as ex:
+        print("Doc consistency check failed:")
+        print(f"- unable to load drift rules from {DRIFT_RULES_PATH.relative_to(ROOT)} ({ex})")
+        return 1
+
+    cache: ContentCache | None = None
+    if not args.no_result_cache:
+        cache = ContentCache(ROOT / args.result_cache, ruleset_hash()).load()
+    violations = scan_files(collect_markdown_files(texts), texts, matcher, jobs, cache)
+    if cache is not None:
+        cache.save()
 
     if violations:
         print("Doc consistency check failed:")
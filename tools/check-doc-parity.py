@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import hashlib
+import posixpath
+import re
+import sys
+import time
+from collections.abc import Mapping
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+LIB_DIR = Path(__file__).resolve().parent / "ci" / "lib"
+LANG_SWITCH_DIR = Path(__file__).resolve().parent / "lang_switch"
+for import_dir in (LIB_DIR, LANG_SWITCH_DIR):
+    if str(import_dir) not in sys.path:
+        sys.path.insert(0, str(import_dir))
+
+from content_cache import ContentCache  # noqa: E402
+from file_store import walk_files  # noqa: E402
+from markdown_doc import parse_markdown  # noqa: E402
+from update_lang_headers import detect_lang, load_lang_map, schema_counterpart  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+DOCS_DIR = ROOT / "docs"
+DE_DIR = DOCS_DIR / "0_de"
+EN_DIR = DOCS_DIR / "1_en"
+LANG_MAP_PATH = DOCS_DIR / "lang_map.json"
+FINGERPRINT_CACHE_PATH = ROOT / "artifacts" / "cache" / "docs-parity" / "fingerprints.json"
+
+TABLE_DELIMITER_RE = re.compile(r"^[ \t]*\|?[ \t]*:?-+:?[ \t]*(?:\|[ \t]*:?-+:?[ \t]*)+\|?[ \t]*$")
+INTERNAL_REPO_URL_RE = re.compile(
+    r"^https://github\.com/tomtastisch/FileClassifier/(?:blob|tree)/[A-Za-z0-9._-]+/(?P<path>[^\s?#]+)"
+)
+LANG_TREE_RE = re.compile(r"^docs/(?:0_de|1_en)(?=/|$)")
+# Schema-numbered counterparts (0xx German, 1xx English) of the flat docs/ layout.
+SCHEMA_NAME_RE = re.compile(r"^(?P<dir>docs/(?:.*/)?)[01](?P<nn>\d{2}_[^/]+)$")
+
+
+@dataclass(frozen=True)
+class Fingerprint:
+    """Language-independent structure of a document: heading outline, block counts and link targets."""
+
+    headings: tuple[tuple[int, str, int], ...]
+    tables: int
+    fences: int
+    mermaid: int
+    links: tuple[str, ...]
+
+    @property
+    def outline(self) -> tuple[int, ...]:
+        return tuple(level for level, _, _ in self.headings)
+
+    def to_json(self) -> dict[str, object]:
+        return asdict(self)
+
+    @classmethod
+    def from_json(cls, data: dict[str, object]) -> Fingerprint:
+        return cls(
+            headings=tuple((int(level), str(text), int(line)) for level, text, line in data["headings"]),
+            tables=int(data["tables"]),
+            fences=int(data["fences"]),
+            mermaid=int(data["mermaid"]),
+            links=tuple(str(link) for link in data["links"]),
+        )
+
+
+def normalize_link(rel: str, url: str) -> str | None:
+    """Link target without fragment, with language trees and 0xx/1xx names folded; None for in-page anchors."""
+    url = url.strip().strip("<>")
+    if not url or url.startswith("#"):
+        return None
+    internal = INTERNAL_REPO_URL_RE.match(url)
+    if internal:
+        target = internal.group("path").rstrip("/")
+    elif re.match(r"^[A-Za-z][A-Za-z0-9+.-]*:", url):
+        return url.split("#", 1)[0]
+    else:
+        path = url.split("#", 1)[0]
+        if not path:
+            return None
+        base = "" if path.startswith("/") else posixpath.dirname(rel)
+        target = posixpath.normpath(posixpath.join(base, path.lstrip("/")))
+    if LANG_TREE_RE.match(target):
+        return LANG_TREE_RE.sub("docs/<lang>", target)
+    return SCHEMA_NAME_RE.sub(r"\g<dir>x\g<nn>", target)
+
+
+def fingerprint(rel: str, text: str) -> Fingerprint:
+    doc = parse_markdown(Path(rel), text)
+    fenced = {line for fence in doc.fences for line in range(fence.start_line, fence.end_line + 1)}
+    tables = 0
+    previous = ""
+    for line_no, line in enumerate(doc.text.splitlines(), start=1):
+        if line_no in fenced:
+            previous = ""
+            continue
+        if "|" in previous and TABLE_DELIMITER_RE.match(line):
+            tables += 1
+        previous = line
+    mermaid = sum(fence.info == "mermaid" for fence in doc.fences)
+    links = {normalize_link(rel, link.url) for link in doc.links if link.line not in fenced}
+    links.discard(None)
+    return Fingerprint(
+        headings=tuple((heading.level, heading.text, heading.line) for heading in doc.headings),
+        tables=tables,
+        fences=len(doc.fences) - mermaid,
+        mermaid=mermaid,
+        links=tuple(sorted(links)),
+    )
+
+
+def describe_heading(lang: str, headings: tuple[tuple[int, str, int], ...], index: int) -> str:
+    if index >= len(headings):
+        return f"{lang} (none)"
+    level, text, line = headings[index]
+    return f"{lang} h{level} '{text}' (line {line})"
+
+
+def compare(de: Fingerprint, en: Fingerprint) -> list[str]:
+    """Structural divergences between a German document and its English counterpart."""
+    found: list[str] = []
+    if de.outline != en.outline:
+        index = next(
+            (i for i, (a, b) in enumerate(zip(de.outline, en.outline)) if a != b),
+            min(len(de.outline), len(en.outline)),
+        )
+        found.append(
+            f"heading outline differs at heading {index + 1} ({len(de.headings)} DE vs {len(en.headings)} EN): "
+            f"{describe_heading('DE', de.headings, index)} vs {describe_heading('EN', en.headings, index)}"
+        )
+    for label in ("tables", "fences", "mermaid"):
+        de_count, en_count = getattr(de, label), getattr(en, label)
+        if de_count != en_count:
+            found.append(f"{label}: {de_count} DE vs {en_count} EN")
+    de_links, en_links = set(de.links), set(en.links)
+    if de_links - en_links:
+        found.append(f"link targets only in DE: {', '.join(sorted(de_links - en_links))}")
+    if en_links - de_links:
+        found.append(f"link targets only in EN: {', '.join(sorted(en_links - de_links))}")
+    return found
+
+
+def checker_hash() -> str:
+    """Digest of this checker and its document model, so a rule change invalidates cached fingerprints."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update((LIB_DIR / "markdown_doc.py").read_bytes())
+    return digest.hexdigest()
+
+
+def tree_root(path: Path) -> Path | None:
+    for tree in (DE_DIR, EN_DIR):
+        if path.is_relative_to(tree):
+            return tree
+    return None
+
+
+def counterpart(path: Path, lang_map: Mapping[str, str]) -> Path | None:
+    """The other-language document for `path`, resolved like tools/lang_switch does.
+
+    A lang_map.json entry wins; documents in docs/0_de and docs/1_en pair by relative path across the trees;
+    elsewhere the 0xx German and 1xx English names pair within a directory.
+    """
+    mapped = lang_map.get(path.relative_to(ROOT).as_posix())
+    if mapped is not None:
+        return Path(posixpath.normpath((ROOT / mapped).as_posix()))
+    tree = tree_root(path)
+    if tree is not None:
+        return (EN_DIR if tree == DE_DIR else DE_DIR) / path.relative_to(tree)
+    return schema_counterpart(path)
+
+
+def is_german(path: Path, other: Path) -> bool:
+    tree = tree_root(path)
+    if tree is not None:
+        return tree == DE_DIR
+    lang = detect_lang(path)
+    return lang == "DE" or (lang is None and detect_lang(other) != "DE")
+
+
+def collect_pairs(texts: Mapping[Path, str] | None = None) -> tuple[list[tuple[Path, Path]], list[str]]:
+    """(DE, EN) counterpart pairs of the docs tree and messages for documents whose counterpart is missing."""
+    lang_map = load_lang_map(LANG_MAP_PATH)
+    pairs: set[tuple[Path, Path]] = set()
+    unpaired: list[str] = []
+    for path in walk_files(DOCS_DIR, "*.MD", texts):
+        other = counterpart(path, lang_map)
+        if other is None or other == path:
+            continue
+        if not (other in texts if texts is not None else other.is_file()):
+            unpaired.append(f"{path.relative_to(ROOT)}: no counterpart {other.relative_to(ROOT)}")
+            continue
+        pairs.add((path, other) if is_german(path, other) else (other, path))
+    return sorted(pairs), unpaired
+
+
+def fingerprint_files(
+    files: list[Path],
+    texts: Mapping[Path, str] | None,
+    cache: ContentCache | None = None,
+) -> tuple[dict[Path, Fingerprint], int]:
+    """Fingerprints of `files` and how many had to be computed (the rest come from the cache)."""
+    found: dict[Path, Fingerprint] = {}
+    computed = 0
+    for path in files:
+        text = texts[path] if texts is not None else path.read_text(encoding="utf-8")
+        rel = path.relative_to(ROOT).as_posix()
+        digest = hashlib.sha256(text.encode("utf-8")).hexdigest() if cache is not None else ""
+        cached = cache.get(rel, digest, Fingerprint.from_json) if cache is not None else None
+        if cached is None:
+            cached = fingerprint(rel, text)
+            computed += 1
+            if cache is not None:
+                cache.put(rel, digest, cached.to_json())
+        found[path] = cached
+    return found, computed
+
+
+def check_pairs(pairs: list[tuple[Path, Path]], fingerprints: Mapping[Path, Fingerprint]) -> list[str]:
+    return [
+        f"{de.relative_to(ROOT)} <-> {en.relative_to(ROOT)}: {divergence}"
+        for de, en in pairs
+        for divergence in compare(fingerprints[de], fingerprints[en])
+    ]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare the structure of German and English doc counterparts.")
+    parser.add_argument(
+        "--fingerprint-cache",
+        default=str(FINGERPRINT_CACHE_PATH.relative_to(ROOT)),
+        help="Per-file fingerprint cache, relative to the repository root.",
+    )
+    parser.add_argument(
+        "--no-fingerprint-cache",
+        action="store_true",
+        help="Fingerprint every file and leave the cache untouched.",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None, texts: Mapping[Path, str] | None = None) -> int:
+    args = parse_args(argv)
+    started = time.monotonic()
+    cache: ContentCache | None = None
+    if not args.no_fingerprint_cache:
+        cache = ContentCache(ROOT / args.fingerprint_cache, checker_hash()).load()
+
+    pairs, unpaired = collect_pairs(texts)
+    fingerprints, computed = fingerprint_files([path for pair in pairs for path in pair], texts, cache)
+    if cache is not None:
+        cache.save()
+    divergences = unpaired + check_pairs(pairs, fingerprints)
+    elapsed_ms = (time.monotonic() - started) * 1000
+    summary = f"{len(pairs)} pair(s), {computed} fingerprinted, {elapsed_ms:.0f} ms"
+
+    if divergences:
+        print(f"Doc parity check failed ({summary}):")
+        for divergence in divergences:
+            print(f"- {divergence}")
+        return 1
+
+    print(f"Doc parity check OK ({summary})")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
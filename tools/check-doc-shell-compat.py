@@ -1,15 +1,37 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import hashlib
+import json
+import os
 import re
+import shutil
+import subprocess
+import sys
+import tempfile
+from collections.abc import Mapping
+from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 
+LIB_DIR = Path(__file__).resolve().parent / "ci" / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from content_cache import ContentCache, string_list  # noqa: E402
+from file_store import walk_files  # noqa: E402
+from worker_pool import script_pool  # noqa: E402
+
 ROOT = Path(__file__).resolve().parents[1]
 DOCS_DIR = ROOT / "docs"
 SRC_DIR = ROOT / "src"
 TESTS_DIR = ROOT / "tests"
 ROOT_README = ROOT / "README.md"
 SECURITY_FILES = (ROOT / "SECURITY.md", ROOT / "SECURITY_ASSURANCE_INDEX.md")
+RESULT_CACHE_PATH = ROOT / "artifacts" / "cache" / "doc-shell-compat" / "results.json"
+SHELLCHECK_SEVERITIES = ("error", "warning", "info", "style")
+SHELLCHECK_BATCH_SIZE = 1000
 
 BASH_FENCE_START = re.compile(r"^```bash\s*$", re.IGNORECASE)
 FENCE_END = re.compile(r"^```\s*$")
@@ -35,27 +57,37 @@ def has_unquoted_gh_api_query(line: str) -> bool:
     return UNQUOTED_ENDPOINT_QUERY_RE.search(line) is not None
 
 
-def collect_markdown_files() -> list[Path]:
+def ruleset_hash(shellcheck: str = "") -> str:
+    """The checks live in this file, so its digest (plus the shellcheck identity) versions cached results."""
+    digest = hashlib.sha256(Path(__file__).read_bytes())
+    digest.update(shellcheck.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def collect_markdown_files(texts: Mapping[Path, str] | None = None) -> list[Path]:
     files: list[Path] = []
-    if ROOT_README.exists():
+    if ROOT_README.exists() if texts is None else ROOT_README in texts:
         files.append(ROOT_README)
 
     for sec in SECURITY_FILES:
-        if sec.exists():
+        if sec.exists() if texts is None else sec in texts:
             files.append(sec)
 
-    files.extend(sorted(DOCS_DIR.rglob("*.MD")))
-    files.extend(sorted(DOCS_DIR.rglob("*.md")))
-    files.extend(sorted(SRC_DIR.rglob("README.md")))
-    files.extend(sorted(TESTS_DIR.rglob("README.md")))
+    files.extend(walk_files(DOCS_DIR, "*.MD", texts))
+    files.extend(walk_files(DOCS_DIR, "*.md", texts))
+    files.extend(walk_files(SRC_DIR, "README.md", texts))
+    files.extend(walk_files(TESTS_DIR, "README.md", texts))
     return files
 
 
-def check_file(path: Path) -> list[str]:
+def check_file(path: Path, text: str | None = None, root: Path | None = None) -> list[str]:
     errors: list[str] = []
+    rel = path.relative_to(ROOT if root is None else root)
     in_bash = False
+    if text is None:
+        text = path.read_text(encoding="utf-8")
 
-    for idx, raw_line in enumerate(path.read_text(encoding="utf-8").splitlines(), start=1):
+    for idx, raw_line in enumerate(text.splitlines(), start=1):
         line = raw_line.rstrip("\n")
 
         if not in_bash and BASH_FENCE_START.match(line):
@@ -75,21 +107,214 @@ def check_file(path: Path) -> list[str]:
 
         if has_unquoted_gh_api_query(stripped):
             errors.append(
-                f"{path.relative_to(ROOT)}:{idx} [DOC-SHELL-001] Unquoted gh api endpoint with query string; quote endpoint, e.g. gh api \"repos/...?...\""
+                f"{rel}:{idx} [DOC-SHELL-001] Unquoted gh api endpoint with query string; quote endpoint, e.g. gh api \"repos/...?...\""
             )
 
         if NUPKG_GLOB_RE.search(stripped):
             errors.append(
-                f"{path.relative_to(ROOT)}:{idx} [DOC-SHELL-002] Fragile nupkg glob; resolve package path first (find + test -n)"
+                f"{rel}:{idx} [DOC-SHELL-002] Fragile nupkg glob; resolve package path first (find + test -n)"
             )
 
     return errors
 
 
-def main() -> int:
-    violations: list[str] = []
-    for md in collect_markdown_files():
-        violations.extend(check_file(md))
+@dataclass(frozen=True)
+class BashFence:
+    path: Path
+    first_line: int
+    script: str
+
+
+def extract_bash_fences(path: Path, text: str) -> list[BashFence]:
+    """Bash fences of a markdown file as virtual scripts; `first_line` maps script line 1 back to the file."""
+    fences: list[BashFence] = []
+    body: list[str] | None = None
+    first_line = 0
+    for idx, line in enumerate(text.splitlines(), start=1):
+        if body is None:
+            if BASH_FENCE_START.match(line):
+                body = []
+                first_line = idx + 1
+            continue
+        if FENCE_END.match(line):
+            fences.append(BashFence(path, first_line, "".join(f"{item}\n" for item in body)))
+            body = None
+            continue
+        body.append(line)
+    if body is not None:
+        fences.append(BashFence(path, first_line, "".join(f"{item}\n" for item in body)))
+    return fences
+
+
+class ShellcheckError(Exception):
+    """shellcheck could not be run, failed itself, or printed output that cannot be read."""
+
+
+@dataclass(frozen=True)
+class Shellcheck:
+    binary: str
+    severity: str = "error"
+
+    def identity(self) -> str:
+        result = subprocess.run([self.binary, "--version"], capture_output=True, text=True, check=False)
+        return f"{result.stdout.strip()}|severity={self.severity}"
+
+    def check(self, fences: list[BashFence]) -> dict[Path, list[str]]:
+        """Lint all fences in one shellcheck process per SHELLCHECK_BATCH_SIZE scripts, mapped to `file:line:column`."""
+        findings: dict[Path, list[tuple[int, int, int, str]]] = {}
+        with tempfile.TemporaryDirectory(prefix="doc-shellcheck-") as tmp:
+            scripts: dict[str, BashFence] = {}
+            for number, fence in enumerate(fences):
+                name = f"{number:05d}.sh"
+                (Path(tmp) / name).write_text(fence.script, encoding="utf-8")
+                scripts[name] = fence
+            names = list(scripts)
+            for start in range(0, len(names), SHELLCHECK_BATCH_SIZE):
+                batch = names[start:start + SHELLCHECK_BATCH_SIZE]
+                for fence, line, column, code, message in self.run_batch(tmp, batch, scripts):
+                    findings.setdefault(fence.path, []).append((line, column, code, message))
+        return {path: [message for *_, message in sorted(found)] for path, found in findings.items()}
+
+    def run_batch(
+        self,
+        cwd: str,
+        names: list[str],
+        scripts: dict[str, BashFence],
+    ) -> list[tuple[BashFence, int, int, int, str]]:
+        try:
+            result = subprocess.run(
+                [self.binary, "--format=json1", "--shell=bash", f"--severity={self.severity}", *names],
+                cwd=cwd,
+                capture_output=True,
+                text=True,
+                check=False,
+            )
+        except OSError as ex:
+            raise ShellcheckError(f"unable to run shellcheck: {ex}") from ex
+        # 0 = clean, 1 = findings; anything else means shellcheck itself failed.
+        if result.returncode not in (0, 1):
+            raise ShellcheckError(f"shellcheck exited with {result.returncode}: {result.stderr.strip()}")
+        found: list[tuple[BashFence, int, int, int, str]] = []
+        try:
+            for comment in json.loads(result.stdout or '{"comments": []}')["comments"]:
+                fence = scripts[comment["file"]]
+                # Fence lines are copied verbatim, so shellcheck's column is the markdown column too.
+                line = fence.first_line + int(comment["line"]) - 1
+                column = int(comment["column"])
+                code = int(comment["code"])
+                message = f"{fence.path.relative_to(ROOT)}:{line}:{column} [SC{code}] {comment['message']}"
+                found.append((fence, line, column, code, message))
+        except (ValueError, KeyError, TypeError) as ex:
+            raise ShellcheckError(f"unreadable shellcheck output ({ex})") from ex
+        return found
+
+
+def find_shellcheck(severity: str = "error") -> Shellcheck | None:
+    binary = shutil.which("shellcheck")
+    return Shellcheck(binary, severity) if binary else None
+
+
+def scan_files(
+    files: list[Path],
+    texts: Mapping[Path, str] | None,
+    jobs: int = 1,
+    cache: ContentCache | None = None,
+    shellcheck: Shellcheck | None = None,
+) -> list[str]:
+    """Errors in file order; cached files are replayed, the rest checked (in a process pool if `jobs` > 1)."""
+    contents = [texts[f] if texts is not None else None for f in files]
+    results: list[list[str] | None] = [None] * len(files)
+    digests: list[str] = []
+    if cache is not None:
+        for idx, file in enumerate(files):
+            text = contents[idx]
+            if text is None:
+                text = contents[idx] = file.read_text(encoding="utf-8")
+            digests.append(hashlib.sha256(text.encode("utf-8")).hexdigest())
+            results[idx] = cache.get(file.relative_to(ROOT).as_posix(), digests[idx], string_list)
+
+    pending = [idx for idx, found in enumerate(results) if found is None]
+    pending_files = [files[idx] for idx in pending]
+    pending_contents = [contents[idx] for idx in pending]
+    if jobs <= 1 or len(pending) < 2:
+        checked = list(map(check_file, pending_files, pending_contents))
+    else:
+        chunksize = max(1, len(pending) // (jobs * 4))
+        with script_pool(sys.modules[__name__], jobs) as pool:
+            # Workers get the root explicitly: under spawn they re-import this module and see its default ROOT.
+            check = partial(check_file, root=ROOT)
+            checked = list(pool.map(check, pending_files, pending_contents, chunksize=chunksize))
+
+    if shellcheck is not None and pending:
+        fences = [
+            fence
+            for file, text in zip(pending_files, pending_contents)
+            for fence in extract_bash_fences(file, text if text is not None else file.read_text(encoding="utf-8"))
+        ]
+        diagnostics = shellcheck.check(fences)
+        for file, found in zip(pending_files, checked):
+            found.extend(diagnostics.get(file, []))
+
+    for idx, found in zip(pending, checked):
+        results[idx] = found
+        if cache is not None:
+            cache.put(files[idx].relative_to(ROOT).as_posix(), digests[idx], found)
+    return [error for found in results if found is not None for error in found]
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Flag zsh-incompatible commands in bash fences of the docs.")
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Check files in N worker processes (0 = one per CPU; default: 1).",
+    )
+    parser.add_argument(
+        "--result-cache",
+        default=str(RESULT_CACHE_PATH.relative_to(ROOT)),
+        help="Per-file result cache, relative to the repository root.",
+    )
+    parser.add_argument(
+        "--no-result-cache",
+        action="store_true",
+        help="Recheck every file and leave the cache untouched.",
+    )
+    parser.add_argument(
+        "--shellcheck",
+        choices=("auto", "on", "off"),
+        default="off",
+        help="Lint bash fences with one batched shellcheck run (auto: only if the binary is on PATH; default: off).",
+    )
+    parser.add_argument(
+        "--shellcheck-severity",
+        choices=SHELLCHECK_SEVERITIES,
+        default="error",
+        help="Minimum shellcheck severity to report (default: error).",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None, texts: Mapping[Path, str] | None = None) -> int:
+    args = parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
+    shellcheck = find_shellcheck(args.shellcheck_severity) if args.shellcheck != "off" else None
+    if shellcheck is None and args.shellcheck == "on":
+        print("Doc shell compatibility check failed:")
+        print("- shellcheck requested but not found on PATH")
+        return 1
+
+    cache: ContentCache | None = None
+    if not args.no_result_cache:
+        cache = ContentCache(ROOT / args.result_cache, ruleset_hash(shellcheck.identity() if shellcheck else "")).load()
+    try:
+        violations = scan_files(collect_markdown_files(texts), texts, jobs, cache, shellcheck)
+    except ShellcheckError as ex:
+        print("Doc shell compatibility check failed:")
+        print(f"- shellcheck run failed ({ex})")
+        return 1
+    if cache is not None:
+        cache.save()
 
     if violations:
         print("Doc shell compatibility check failed:")
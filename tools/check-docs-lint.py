@@ -0,0 +1,408 @@
+#!/usr/bin/env python3
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import os
+import sys
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+LIB_DIR = Path(__file__).resolve().parent / "ci" / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from file_store import WALK_EXCLUDED_DIRS, FileStore  # noqa: E402
+
+ROOT = Path(__file__).resolve().parents[1]
+TOOLS_DIR = ROOT / "tools"
+DEFAULT_ROC_OUT = "artifacts/policy_roc_matrix.tsv"
+DOCS_DIR = ROOT / "docs"
+SRC_DIR = ROOT / "src"
+TESTS_DIR = ROOT / "tests"
+POLICY_RULES_DIR = ROOT / "tools" / "ci" / "policies" / "rules"
+WATCH_INTERVAL_SECONDS = 0.5
+WATCH_EXCLUDED_DIRS = WALK_EXCLUDED_DIRS | {"bin", "obj"}
+
+
+@dataclass(frozen=True)
+class LintPlugin:
+    name: str
+    script: str
+    run: Callable[[ModuleType, FileStore, argparse.Namespace], int]
+    # Opt-in plugins run only when named with --only.
+    default: bool = True
+
+
+PLUGINS: tuple[LintPlugin, ...] = (
+    LintPlugin(
+        name="docs",
+        script="check-docs.py",
+        run=lambda module, store, args: module.main(args.docs_argv, texts=store),
+    ),
+    LintPlugin(
+        name="drift",
+        script="check-doc-consistency.py",
+        run=lambda module, store, args: module.main(["--jobs", str(args.jobs)], texts=store),
+    ),
+    LintPlugin(
+        name="shell",
+        script="check-doc-shell-compat.py",
+        run=lambda module, store, args: module.main(
+            ["--jobs", str(args.jobs), "--shellcheck", args.shellcheck], texts=store
+        ),
+    ),
+    LintPlugin(
+        name="roc",
+        script="check-policy-roc.py",
+        run=lambda module, store, args: module.main(["--out", args.roc_out], texts=store),
+    ),
+    LintPlugin(
+        name="parity",
+        script="check-doc-parity.py",
+        run=lambda module, store, args: module.main([], texts=store),
+        default=False,
+    ),
+)
+
+
+def load_checker(script: str) -> ModuleType:
+    path = TOOLS_DIR / script
+    spec = importlib.util.spec_from_file_location(path.stem.replace("-", "_"), path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def selected_plugins(args: argparse.Namespace) -> list[LintPlugin]:
+    return [plugin for plugin in PLUGINS if (plugin.name in args.only if args.only else plugin.default)]
+
+
+def scan_stats(directory: Path, keep: Callable[[str], bool], recursive: bool = True) -> dict[Path, tuple[int, int]]:
+    stats: dict[Path, tuple[int, int]] = {}
+    pending = [directory]
+    while pending:
+        try:
+            entries = os.scandir(pending.pop())
+        except OSError:
+            continue
+        with entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive and entry.name not in WATCH_EXCLUDED_DIRS:
+                        pending.append(Path(entry.path))
+                elif entry.is_file() and keep(entry.name):
+                    st = entry.stat()
+                    stats[Path(entry.path)] = (st.st_mtime_ns, st.st_size)
+    return stats
+
+
+def watched_stats() -> dict[Path, tuple[int, int]]:
+    """mtime and size of docs/, top-level markdown, src|tests/**/README.md and the policy rule files."""
+    stats = scan_stats(ROOT, lambda name: name.endswith((".md", ".MD")), recursive=False)
+    stats.update(scan_stats(DOCS_DIR, lambda name: True))
+    stats.update(scan_stats(SRC_DIR, lambda name: name == "README.md"))
+    stats.update(scan_stats(TESTS_DIR, lambda name: name == "README.md"))
+    stats.update(scan_stats(POLICY_RULES_DIR, lambda name: True, recursive=False))
+    return stats
+
+
+class WatchSession:
+    """Keeps per-file results of every check in memory and re-runs only what a change can affect."""
+
+    def __init__(self, args: argparse.Namespace, store: FileStore, modules: dict[str, ModuleType]) -> None:
+        self.args = args
+        self.store = store
+        self.modules = modules
+        self.per_file: dict[str, dict[Path, list[str]]] = {name: {} for name in self.modules}
+        self.global_errors: dict[str, list[str]] = {}
+        self.matcher = None
+        self.documents: dict[Path, object] = {}
+        self.url_store = None
+        self.link_targets: dict[Path, set[str]] = {}
+        self.fingerprints: dict[Path, object] = {}
+        docs = self.modules.get("docs")
+        if docs is not None:
+            self.docs_args = docs.parse_args(args.docs_argv)
+            self.anchor_index = docs.AnchorIndex()
+            self.http_cache: dict[str, str | None] = {}
+            if not self.docs_args.no_url_cache:
+                self.url_store = docs.UrlVerdictStore(
+                    ROOT / self.docs_args.url_cache,
+                    self.docs_args.url_cache_ttl,
+                    self.docs_args.url_cache_negative_ttl,
+                ).load()
+            docs.HTTP_POOL.max_per_host = max(1, self.docs_args.link_per_host)
+
+    def close(self) -> None:
+        docs = self.modules.get("docs")
+        if docs is not None:
+            docs.HTTP_POOL.close()
+            docs.close_git_resolvers()
+            if self.url_store is not None:
+                self.url_store.save()
+
+    def cycle(self, changed: set[Path] | None) -> int:
+        """Re-check after `changed` paths were modified, added or removed (`None` checks everything)."""
+        started = time.monotonic()
+        for path in changed or ():
+            self.store.refresh(path)
+        rechecked: set[Path] = set()
+        if "docs" in self.modules:
+            rechecked |= self.refresh_docs(changed)
+        if "drift" in self.modules:
+            rechecked |= self.refresh_drift(changed)
+        if "shell" in self.modules:
+            rechecked |= self.refresh_shell(changed)
+        if "roc" in self.modules:
+            self.refresh_roc(changed)
+        if "parity" in self.modules:
+            rechecked |= self.refresh_parity(changed)
+
+        errors = {
+            f"[{name}] {error}"
+            for name, found in self.per_file.items()
+            for file_errors in found.values()
+            for error in file_errors
+        }
+        errors.update(
+            f"[{name.split(':')[0]}] {error}" for name, found in self.global_errors.items() for error in found
+        )
+        elapsed_ms = (time.monotonic() - started) * 1000
+        stamp = time.strftime("%H:%M:%S")
+        changes = "full check" if changed is None else f"{len(changed)} change(s)"
+        print(f"[{stamp}] {changes}, {len(rechecked)} file(s) re-checked in {elapsed_ms:.0f} ms")
+        if errors:
+            print("Docs lint failed:")
+            for error in sorted(errors):
+                print(f"- {error}")
+        else:
+            print("Docs lint OK")
+        sys.stdout.flush()
+        return 1 if errors else 0
+
+    def refresh_line_check(
+        self,
+        name: str,
+        files: list[Path],
+        changed: set[Path] | None,
+        check: Callable[[Path, str], list[str]],
+    ) -> set[Path]:
+        results = self.per_file[name]
+        current = set(files)
+        for path in set(results) - current:
+            del results[path]
+        todo = [f for f in files if changed is None or f in changed or f not in results]
+        for path in todo:
+            results[path] = check(path, self.store[path])
+        return set(todo)
+
+    def refresh_drift(self, changed: set[Path] | None) -> set[Path]:
+        drift = self.modules["drift"]
+        if self.matcher is None or changed is None or drift.DRIFT_RULES_PATH in changed:
+            try:
+                self.matcher = drift.load_matcher()
+            except (OSError, ValueError, KeyError, TypeError, AttributeError, drift.re.error) as ex:
+                self.matcher = None
+                self.per_file["drift"].clear()
+                self.global_errors["drift"] = [f"unable to load drift rules ({ex})"]
+                return set()
+            self.global_errors.pop("drift", None)
+            changed = None
+        matcher = self.matcher
+        files = drift.collect_markdown_files(self.store)
+        return self.refresh_line_check(
+            "drift", files, changed, lambda path, text: drift.check_text(path, text, matcher)
+        )
+
+    def refresh_shell(self, changed: set[Path] | None) -> set[Path]:
+        shell = self.modules["shell"]
+        results = self.per_file["shell"]
+        files = shell.collect_markdown_files(self.store)
+        rechecked = self.refresh_line_check("shell", files, changed, shell.check_file)
+        if self.args.shellcheck == "off" or not rechecked:
+            return rechecked
+        shellcheck = shell.find_shellcheck()
+        if shellcheck is None:
+            self.global_errors["shell"] = ["shellcheck requested but not found on PATH"]
+            return rechecked
+        # One batched shellcheck run over the fences of every re-checked file.
+        fences = [fence for path in sorted(rechecked) for fence in shell.extract_bash_fences(path, self.store[path])]
+        try:
+            diagnostics = shellcheck.check(fences)
+        except shell.ShellcheckError as ex:
+            self.global_errors["shell"] = [f"shellcheck run failed ({ex})"]
+            return rechecked
+        self.global_errors.pop("shell", None)
+        for path in rechecked:
+            results[path].extend(diagnostics.get(path, []))
+        return rechecked
+
+    def refresh_docs(self, changed: set[Path] | None) -> set[Path]:
+        """Re-check changed documents plus every document whose internal links point at a changed path."""
+        docs = self.modules["docs"]
+        targets = docs.collect_targets(self.store)
+        current = set(targets)
+        for path in set(self.documents) - current:
+            del self.documents[path]
+            self.link_targets.pop(path, None)
+            self.per_file["docs"].pop(path, None)
+            self.anchor_index.forget(path)
+        for path in changed or ():
+            if path not in current:
+                self.anchor_index.forget(path)
+
+        affected: set[Path] = set()
+        for path in targets:
+            if changed is None or path in changed or path not in self.documents:
+                doc = docs.parse_document(path, self.store[path])
+                self.documents[path] = doc
+                self.anchor_index.update(doc)
+                self.link_targets[path] = docs.internal_link_targets(doc)
+                affected.add(path)
+        if changed:
+            touched: set[str] = set()
+            for path in changed:
+                rel = path.relative_to(self.store.root)
+                touched.add(rel.as_posix())
+                touched.update(parent.as_posix() for parent in rel.parents if parent.parts)
+            affected.update(path for path, linked in self.link_targets.items() if linked & touched)
+
+        documents = [self.documents[path] for path in targets if path in affected]
+        by_document = docs.check_links_by_document(
+            documents,
+            self.docs_args.link_workers,
+            self.docs_args.link_per_host,
+            self.url_store,
+            self.anchor_index,
+            http_cache=self.http_cache,
+        )
+        for doc in documents:
+            by_document[doc.path].extend(docs.check_diagrams([doc]))
+        self.per_file["docs"].update(by_document)
+
+        if changed is None or any(path.is_relative_to(docs.DOCS_DIR) for path in changed):
+            self.global_errors["docs:naming"] = docs.check_docs_naming(self.store)
+        if changed is None or any(path.is_relative_to(docs.SRC_FTD_DIR) for path in changed):
+            self.global_errors["docs:readme"] = docs.check_readme_coverage_and_template(
+                list(self.documents.values()), self.store
+            )
+        return affected
+
+    def refresh_roc(self, changed: set[Path] | None) -> None:
+        roc = self.modules["roc"]
+        if changed is not None and not any("POLICY" in path.name or path.parent == roc.RULES for path in changed):
+            return
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            rc = roc.main(["--out", self.args.roc_out], texts=self.store)
+        self.global_errors["roc"] = [f"policy/RoC bijection failed: {output.getvalue().strip()}"] if rc else []
+
+    def refresh_parity(self, changed: set[Path] | None) -> set[Path]:
+        """Re-fingerprint changed DE/EN documents and re-compare only the pairs they belong to."""
+        parity = self.modules["parity"]
+        pairs, unpaired = parity.collect_pairs(self.store)
+        self.global_errors["parity"] = unpaired
+        paired = {path for pair in pairs for path in pair}
+        for path in set(self.fingerprints) - paired:
+            del self.fingerprints[path]
+        todo = [path for path in sorted(paired) if changed is None or path in changed or path not in self.fingerprints]
+        self.fingerprints.update(parity.fingerprint_files(todo, self.store)[0])
+
+        results = self.per_file["parity"]
+        results.clear()
+        for de, en in pairs:
+            results[de] = parity.check_pairs([(de, en)], self.fingerprints)
+        return set(todo)
+
+
+def watch(args: argparse.Namespace) -> int:
+    """Poll watched paths and re-check after every change until interrupted."""
+    stats = watched_stats()
+    modules = {plugin.name: load_checker(plugin.script) for plugin in selected_plugins(args)}
+    session = WatchSession(args, FileStore(ROOT), modules)
+    try:
+        session.cycle(None)
+        while True:
+            time.sleep(args.watch_interval)
+            current = watched_stats()
+            changed = {path for path in stats.keys() | current.keys() if stats.get(path) != current.get(path)}
+            stats = current
+            if changed:
+                session.cycle(changed)
+    except KeyboardInterrupt:
+        return 0
+    finally:
+        session.close()
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(
+        description="Run the doc checkers over one shared walk of the repository.",
+        epilog="Options not listed here are passed through to check-docs.py.",
+    )
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=[plugin.name for plugin in PLUGINS],
+        help="Run only the named check (repeatable; default: every check except parity).",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Worker processes for the drift and shell line scans (0 = one per CPU; default: 1).",
+    )
+    parser.add_argument(
+        "--shellcheck",
+        choices=("on", "off"),
+        default="off",
+        help="Also lint the bash fences with shellcheck in the shell check (default: off).",
+    )
+    parser.add_argument("--roc-out", default=DEFAULT_ROC_OUT, help="Policy/RoC matrix output path.")
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and re-check only what is affected whenever a watched doc changes.",
+    )
+    parser.add_argument(
+        "--watch-interval",
+        type=float,
+        default=WATCH_INTERVAL_SECONDS,
+        help=f"Polling interval in seconds for --watch (default: {WATCH_INTERVAL_SECONDS:g}).",
+    )
+    args, docs_argv = parser.parse_known_args(argv)
+    if docs_argv and args.only and "docs" not in args.only:
+        parser.error(f"unrecognized arguments: {' '.join(docs_argv)}")
+    args.docs_argv = docs_argv
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    if args.watch:
+        return watch(args)
+    store = FileStore(ROOT)
+    failed: list[str] = []
+    plugins = selected_plugins(args)
+    for plugin in plugins:
+        if plugin.run(load_checker(plugin.script), store, args) != 0:
+            failed.append(plugin.name)
+
+    print(
+        f"Docs lint: {len(plugins)} check(s) over {len(store)} file(s), {store.reads} read(s); "
+        f"failed: {', '.join(failed) if failed else 'none'}"
+    )
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,13 +1,35 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import argparse
+import base64
+import email.utils
+import http.client
+import json
+import os
+import random
 import re
+import ssl
 import subprocess
+import sys
+import threading
 import time
-import urllib.error
+import urllib.parse
 import urllib.request
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
+LIB_DIR = Path(__file__).resolve().parent / "ci" / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from file_store import walk_files  # noqa: E402
+from markdown_doc import MarkdownDocument, parse_markdown  # noqa: E402
+
 ROOT = Path(__file__).resolve().parents[1]
 DOCS_DIR = ROOT / "docs"
 SRC_FTD_DIR = ROOT / "src" / "FileTypeDetection"
@@ -16,14 +38,6 @@ ROOT_README = ROOT / "README.md"
 REPO = "https://github.com/tomtastisch/FileClassifier"
 SCAN_EXCLUDED_DIRS = {".git", "bin", "obj", "artifacts", ".qodana", ".idea", ".vscode", "node_modules", ".tmp"}
 
-LINK_RE = re.compile(r'(?<!\!)\[(?P<text>[^\]]+)\]\((?P<url>[^)\s]+)(?:\s+"[^"]*")?\)')
-RELATIVE_RE = re.compile(
-    r'\]\(\s*(?!https?://|mailto:|#)(?:\.{1,2}/|/|docs/|src/|tests/|tools/|README\.md|[^)]+\.md(?:#[^)]+)?)(?:\s+"[^"]*")?\s*\)'
-)
-LANG_SWITCH_BLOCK_RE = re.compile(
-    r"<!-- LANG_SWITCH:BEGIN -->\r?\n.*?\r?\n<!-- LANG_SWITCH:END -->",
-    re.DOTALL,
-)
 PATH_TEXT_RE = re.compile(r'(?i)^\s*(?:\.{1,2}/|/)?(?:[A-Za-z0-9_.-]+/)+[A-Za-z0-9_.-]+\s*$')
 FILE_TEXT_RE = re.compile(r'(?i)^\s*[A-Za-z0-9_.-]+\.(md|mdx|vb|cs|fs|java|kt|ts|js|json|yml|yaml|toml|xml|sh|ps1|sql)\s*$')
 INTERNAL_REPO_URL_RE = re.compile(
@@ -31,14 +45,40 @@ INTERNAL_REPO_URL_RE = re.compile(
     r"(?P<kind>blob|tree)/"
     r"(?P<ref>[A-Za-z0-9._-]+)/"
     r"(?P<path>[^\s)#]+)"
-    r"(?:#[A-Za-z0-9\-_\.]+)?$"
+    r"(?:#(?P<fragment>[A-Za-z0-9\-_\.]+))?$"
 )
 ANCHOR_RE = re.compile(r'^#[A-Za-z0-9\-_\.]+$')
 DOC_NAME_RE = re.compile(r'^[0-9]{3}_(?:[A-Z0-9]+_)*[A-Z0-9]+\.MD$')
-PLAIN_URL_RE = re.compile(r'(?P<url>https?://[^\s<>"\)\]]+)')
+HTML_ANCHOR_RE = re.compile(r"""<a\s+[^>]*?(?:id|name)\s*=\s*["'](?P<id>[^"']+)["']""", re.IGNORECASE)
+SLUG_INLINE_LINK_RE = re.compile(r"!?\[(?P<text>[^\]]*)\]\([^)]*\)")
+SLUG_HTML_TAG_RE = re.compile(r"<[^>]+>")
+SLUG_DROP_RE = re.compile(r"[^\w\- ]")
 REF_EXISTS_CACHE: dict[str, bool] = {}
 REF_COMMIT_CACHE: dict[str, str | None] = {}
 MUTABLE_WORKSPACE_REFS = {"main", "master"}
+LINK_CHECK_WORKERS = 16
+LINK_CHECK_PER_HOST = 4
+LINK_CHECK_BUDGET_SECONDS = 600.0
+LINK_RETRY_ATTEMPTS = 3
+LINK_RETRY_BASE_DELAY_SECONDS = 0.5
+LINK_RETRY_MAX_DELAY_SECONDS = 30.0
+LINK_CIRCUIT_THRESHOLD = 4
+HTTP_HEAD_TIMEOUT_SECONDS = 12.0
+HTTP_GET_TIMEOUT_SECONDS = 20.0
+HTTP_RETRYABLE_CODES = {408, 425, 429, 500, 502, 503, 504}
+HTTP_POOL_IDLE_SECONDS = 30.0
+HTTP_MAX_REDIRECTS = 5
+HTTP_DRAIN_LIMIT_BYTES = 1 << 20
+HTTP_REDIRECT_CODES = {301, 302, 303, 307, 308}
+URL_CACHE_PATH = ROOT / "artifacts" / "cache" / "docs-links" / "url-verdicts.json"
+URL_CACHE_SCHEMA_VERSION = 1
+LATENCY_TOP_N = 10
+LINK_FIXTURE_SCHEMA_VERSION = 1
+LINK_FIXTURE_HEADERS = ("etag", "last-modified", "retry-after")
+LINK_INDEX_PATH = ROOT / "artifacts" / "cache" / "docs-links" / "link-index.json"
+LINK_INDEX_SCHEMA_VERSION = 1
+URL_CACHE_TTL_SECONDS = 7 * 24 * 3600
+URL_CACHE_NEGATIVE_TTL_SECONDS = 3600
 
 DOC_TYPES_REQUIRE_DIAGRAM = (
     "_API_",
@@ -57,11 +97,9 @@ RELEVANT_SUFFIXES = {".vb", ".cs", ".json", ".md", ".MD"}
 EXCLUDED_DIRS = {"bin", "obj"}
 
 
-def collect_targets() -> list[Path]:
+def collect_targets(texts: Mapping[Path, str] | None = None) -> list[Path]:
     files: list[Path] = []
-    for path in sorted(ROOT.rglob("*")):
-        if not path.is_file():
-            continue
+    for path in walk_files(ROOT, "*", texts):
         if path.suffix not in {".md", ".MD"}:
             continue
         rel = path.relative_to(ROOT)
@@ -71,12 +109,193 @@ def collect_targets() -> list[Path]:
     return files
 
 
-def check_docs_naming() -> list[str]:
+def parse_document(path: Path, text: str | None = None) -> MarkdownDocument:
+    return parse_markdown(path, text, ROOT)
+
+
+def github_slug(text: str) -> str:
+    """Heading anchor as rendered by GitHub: formatting stripped, lower-cased, punctuation dropped, spaces to '-'."""
+    text = SLUG_INLINE_LINK_RE.sub(lambda m: m.group("text"), text)
+    text = SLUG_HTML_TAG_RE.sub("", text)
+    text = text.replace("`", "").replace("*", "")
+    return SLUG_DROP_RE.sub("", text.strip().lower()).replace(" ", "-")
+
+
+def document_anchors(doc: MarkdownDocument) -> set[str]:
+    anchors: set[str] = set()
+    seen: dict[str, int] = {}
+    for heading in doc.headings:
+        slug = github_slug(heading.text)
+        count = seen.get(slug, 0)
+        seen[slug] = count + 1
+        anchors.add(slug if count == 0 else f"{slug}-{count}")
+    anchors.update(m.group("id").lower() for m in HTML_ANCHOR_RE.finditer(doc.text))
+    return anchors
+
+
+class AnchorIndex:
+    """Heading-slug sets per markdown file, built once per file and looked up in O(1)."""
+
+    def __init__(self, documents: list[MarkdownDocument] | None = None) -> None:
+        self._anchors: dict[Path, set[str] | None] = {}
+        for doc in documents or []:
+            self._anchors[doc.path] = document_anchors(doc)
+
+    def anchors(self, path: Path) -> set[str] | None:
+        if path not in self._anchors:
+            self._anchors[path] = document_anchors(parse_document(path)) if path.is_file() else None
+        return self._anchors[path]
+
+    def update(self, doc: MarkdownDocument) -> None:
+        self._anchors[doc.path] = document_anchors(doc)
+
+    def forget(self, path: Path) -> None:
+        self._anchors.pop(path, None)
+
+    def has_anchor(self, path: Path, fragment: str) -> bool:
+        anchors = self.anchors(path)
+        return anchors is not None and urllib.parse.unquote(fragment).lower() in anchors
+
+
+def internal_link_targets(doc: MarkdownDocument) -> set[str]:
+    targets: set[str] = set()
+    for token in (*doc.links, *doc.plain_urls):
+        match = INTERNAL_REPO_URL_RE.match(token.url.rstrip(".,;:"))
+        if match:
+            targets.add(match.group("path").rstrip("/"))
+    return targets
+
+
+def git_output(args: list[str]) -> list[str] | None:
+    """Run a NUL-delimited git query in ROOT; `None` signals that git could not answer."""
+    result = subprocess.run(["git", *args], cwd=ROOT, capture_output=True, check=False)
+    if result.returncode != 0:
+        return None
+    return [item for item in result.stdout.decode("utf-8", errors="replace").split("\0") if item]
+
+
+def changed_paths_since(base_ref: str) -> set[str] | None:
+    """Paths added, modified, renamed (old and new name) or deleted since `base_ref`, including the work tree."""
+    entries = git_output(["diff", "--name-status", "-z", "-M", base_ref, "--"])
+    untracked = git_output(["ls-files", "--others", "--exclude-standard", "-z"])
+    if entries is None or untracked is None:
+        return None
+    changed: set[str] = set(untracked)
+    index = 0
+    while index < len(entries):
+        status = entries[index]
+        width = 2 if status[:1] in {"R", "C"} else 1
+        changed.update(entries[index + 1 : index + 1 + width])
+        index += 1 + width
+    return changed
+
+
+def tracked_blob_ids() -> dict[str, str]:
+    """Blob ids of tracked files whose work-tree content matches the index."""
+    staged = git_output(["ls-files", "-s", "-z"]) or []
+    dirty = set(git_output(["diff", "--name-only", "-z"]) or [])
+    blobs: dict[str, str] = {}
+    for entry in staged:
+        meta, _, path = entry.partition("\t")
+        parts = meta.split()
+        if len(parts) == 3 and path not in dirty:
+            blobs[path] = parts[1]
+    return blobs
+
+
+class LinkIndex:
+    """Persisted reverse index from internal link targets to the documents that reference them."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.documents: dict[str, dict[str, object]] = {}
+
+    def load(self) -> LinkIndex:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self
+        if isinstance(data, dict) and data.get("schema_version") == LINK_INDEX_SCHEMA_VERSION:
+            documents = data.get("documents")
+            if isinstance(documents, dict):
+                self.documents = {
+                    rel: entry
+                    for rel, entry in documents.items()
+                    if isinstance(entry, dict) and isinstance(entry.get("targets"), list)
+                }
+        return self
+
+    def save(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        payload = {
+            "schema_version": LINK_INDEX_SCHEMA_VERSION,
+            "documents": dict(sorted(self.documents.items())),
+        }
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def is_current(self, rel: str, blob: str | None) -> bool:
+        entry = self.documents.get(rel)
+        return blob is not None and entry is not None and entry.get("blob") == blob
+
+    def update(self, rel: str, blob: str | None, targets: set[str]) -> None:
+        self.documents[rel] = {"blob": blob, "targets": sorted(targets)}
+
+    def retain(self, rels: set[str]) -> None:
+        self.documents = {rel: entry for rel, entry in self.documents.items() if rel in rels}
+
+    def referrers(self, changed: set[str]) -> set[str]:
+        """Documents linking to a changed path or to any directory containing one."""
+        affected: set[str] = set()
+        for path in changed:
+            parts = path.split("/")
+            affected.update("/".join(parts[:depth]) for depth in range(1, len(parts) + 1))
+        return {
+            rel
+            for rel, entry in self.documents.items()
+            if any(target in affected for target in entry["targets"])  # type: ignore[union-attr]
+        }
+
+
+def select_documents(
+    files: list[Path],
+    index: LinkIndex,
+    base_ref: str | None = None,
+    texts: Mapping[Path, str] | None = None,
+) -> list[MarkdownDocument] | None:
+    """Refresh the link index and return the documents to check (`None` if `base_ref` cannot be diffed)."""
+    changed: set[str] | None = None
+    if base_ref is not None:
+        changed = changed_paths_since(base_ref)
+        if changed is None:
+            return None
+
+    blobs = tracked_blob_ids()
+    rels = {f.relative_to(ROOT).as_posix(): f for f in files}
+    parsed: dict[str, MarkdownDocument] = {}
+    for rel, f in rels.items():
+        if changed is not None and rel not in changed and index.is_current(rel, blobs.get(rel)):
+            continue
+        doc = parse_document(f, texts[f] if texts is not None else None)
+        parsed[rel] = doc
+        index.update(rel, blobs.get(rel), internal_link_targets(doc))
+    index.retain(set(rels))
+
+    if changed is None:
+        return [parsed[rel] for rel in rels]
+    selected = (changed & set(rels)) | index.referrers(changed)
+    return [
+        parsed.get(rel) or parse_document(rels[rel], texts[rels[rel]] if texts is not None else None)
+        for rel in rels
+        if rel in selected
+    ]
+
+
+def check_docs_naming(texts: Mapping[Path, str] | None = None) -> list[str]:
     errors: list[str] = []
     allowed_lowercase_docs = {"lang_switch_report.md"}
-    for f in sorted(DOCS_DIR.rglob("*")):
-        if not f.is_file():
-            continue
+    for f in walk_files(DOCS_DIR, "*", texts):
         if f.suffix not in {".MD", ".md"}:
             continue
         if f.name.lower() == "readme.md":
@@ -92,49 +311,812 @@ def check_docs_naming() -> list[str]:
     return errors
 
 
-def check_http_url(url: str, cache: dict[str, str | None]) -> str | None:
+@dataclass(frozen=True)
+class UrlVerdict:
+    error: str | None
+    status: int
+    checked_at: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+
+class UrlVerdictStore:
+    """On-disk URL verdicts shared across runs; positive and negative verdicts expire independently."""
+
+    def __init__(
+        self,
+        path: Path,
+        ttl: float = URL_CACHE_TTL_SECONDS,
+        negative_ttl: float = URL_CACHE_NEGATIVE_TTL_SECONDS,
+    ) -> None:
+        self.path = path
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self._entries: dict[str, UrlVerdict] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def load(self) -> UrlVerdictStore:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self
+        if not isinstance(data, dict) or data.get("schema_version") != URL_CACHE_SCHEMA_VERSION:
+            return self
+        entries = data.get("entries")
+        if not isinstance(entries, dict):
+            return self
+        for url, raw in entries.items():
+            try:
+                self._entries[url] = UrlVerdict(
+                    error=raw.get("error"),
+                    status=int(raw.get("status", 0)),
+                    checked_at=float(raw["checked_at"]),
+                    etag=raw.get("etag"),
+                    last_modified=raw.get("last_modified"),
+                )
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+        return self
+
+    def save(self) -> None:
+        if not self._dirty:
+            return
+        with self._lock:
+            payload = {
+                "schema_version": URL_CACHE_SCHEMA_VERSION,
+                "entries": {url: asdict(entry) for url, entry in sorted(self._entries.items())},
+            }
+            self._dirty = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def get(self, url: str) -> UrlVerdict | None:
+        with self._lock:
+            return self._entries.get(url)
+
+    def is_fresh(self, entry: UrlVerdict, now: float | None = None) -> bool:
+        ttl = self.ttl if entry.error is None else self.negative_ttl
+        return ((time.time() if now is None else now) - entry.checked_at) < ttl
+
+    def put(self, url: str, entry: UrlVerdict) -> None:
+        with self._lock:
+            self._entries[url] = entry
+            self._dirty = True
+
+
+class HttpConnectionPool:
+    """Keep-alive `http.client` connections keyed by scheme+host and shared by all link checks."""
+
+    def __init__(
+        self,
+        max_per_host: int = LINK_CHECK_PER_HOST,
+        idle_timeout: float = HTTP_POOL_IDLE_SECONDS,
+        use_proxies: bool = True,
+    ) -> None:
+        self.max_per_host = max_per_host
+        self.idle_timeout = idle_timeout
+        self.use_proxies = use_proxies
+        self._idle: dict[str, list[tuple[float, http.client.HTTPConnection]]] = {}
+        self._slots: dict[str, threading.BoundedSemaphore] = {}
+        self._lock = threading.Lock()
+        self._ssl_context = ssl.create_default_context()
+
+    def _slot(self, key: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is None:
+                slot = threading.BoundedSemaphore(max(1, self.max_per_host))
+                self._slots[key] = slot
+            return slot
+
+    def _proxy_for(self, parts: urllib.parse.SplitResult) -> urllib.parse.SplitResult | None:
+        if not self.use_proxies:
+            return None
+        proxy = urllib.request.getproxies().get(parts.scheme)
+        if not proxy or urllib.request.proxy_bypass(parts.hostname or ""):
+            return None
+        return urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+
+    @staticmethod
+    def _proxy_headers(proxy: urllib.parse.SplitResult) -> dict[str, str]:
+        """Basic `Proxy-Authorization` for `user:pass@` proxy URLs, sent the way urllib's ProxyHandler does."""
+        if not proxy.username or not proxy.password:
+            return {}
+        creds = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password)}"
+        return {"Proxy-Authorization": "Basic " + base64.b64encode(creds.encode()).decode("ascii")}
+
+    def _connect(self, parts: urllib.parse.SplitResult, timeout: float) -> http.client.HTTPConnection:
+        # A proxy without an explicit port gets the connection class default (80/443), as with urllib.
+        host = parts.hostname or ""
+        proxy = self._proxy_for(parts)
+        if parts.scheme == "https":
+            if proxy is not None:
+                conn = http.client.HTTPSConnection(
+                    proxy.hostname or "", proxy.port, timeout=timeout, context=self._ssl_context
+                )
+                conn.set_tunnel(host, parts.port or 443, headers=self._proxy_headers(proxy))
+                return conn
+            return http.client.HTTPSConnection(host, parts.port, timeout=timeout, context=self._ssl_context)
+        if proxy is not None:
+            return http.client.HTTPConnection(proxy.hostname or "", proxy.port, timeout=timeout)
+        return http.client.HTTPConnection(host, parts.port, timeout=timeout)
+
+    def _checkout(self, key: str) -> http.client.HTTPConnection | None:
+        now = time.monotonic()
+        stale: list[http.client.HTTPConnection] = []
+        conn: http.client.HTTPConnection | None = None
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                released_at, candidate = idle.pop()
+                if now - released_at < self.idle_timeout:
+                    conn = candidate
+                    break
+                stale.append(candidate)
+            # Evict everything older than the idle timeout, not only the entries we passed over.
+            kept = [(t, c) for t, c in idle if now - t < self.idle_timeout]
+            stale.extend(c for t, c in idle if now - t >= self.idle_timeout)
+            self._idle[key] = kept
+        for candidate in stale:
+            candidate.close()
+        return conn
+
+    def _checkin(self, key: str, conn: http.client.HTTPConnection, reusable: bool) -> None:
+        if not reusable:
+            conn.close()
+            return
+        with self._lock:
+            self._idle.setdefault(key, []).append((time.monotonic(), conn))
+
+    def _send(
+        self,
+        key: str,
+        parts: urllib.parse.SplitResult,
+        method: str,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[int, dict[str, str]]:
+        target = parts.path or "/"
+        if parts.query:
+            target = f"{target}?{parts.query}"
+        # Plain HTTP through a forward proxy needs the absolute URL as request target.
+        proxy = self._proxy_for(parts) if parts.scheme == "http" else None
+        if proxy is not None:
+            target = urllib.parse.urlunsplit(parts)
+            headers = {**headers, **self._proxy_headers(proxy)}
+        with self._slot(key):
+            conn = self._checkout(key)
+            reused = conn is not None
+            if conn is None:
+                conn = self._connect(parts, timeout)
+            while True:
+                conn.timeout = timeout
+                if conn.sock is not None:
+                    conn.sock.settimeout(timeout)
+                try:
+                    conn.request(method, target, headers=headers)
+                    resp = conn.getresponse()
+                except (http.client.RemoteDisconnected, ConnectionResetError, BrokenPipeError):
+                    conn.close()
+                    if not reused:
+                        raise
+                    # The server dropped an idle keep-alive connection; retry once on a fresh one.
+                    conn = self._connect(parts, timeout)
+                    reused = False
+                    continue
+                except BaseException:
+                    conn.close()
+                    raise
+                break
+
+            reusable = False
+            try:
+                drained = 0
+                while True:
+                    chunk = resp.read(64 * 1024)
+                    if not chunk:
+                        reusable = not resp.will_close
+                        break
+                    drained += len(chunk)
+                    if drained > HTTP_DRAIN_LIMIT_BYTES:
+                        break
+            except (OSError, http.client.HTTPException):
+                reusable = False
+            response_headers = {name.lower(): value for name, value in resp.getheaders()}
+            self._checkin(key, conn, reusable)
+            return int(resp.status), response_headers
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[int, str, dict[str, str]]:
+        """Send a request following redirects; returns `(status, final_url, lower-cased headers)`."""
+        current = url
+        for _ in range(HTTP_MAX_REDIRECTS + 1):
+            parts = urllib.parse.urlsplit(current)
+            if parts.scheme not in {"http", "https"} or not parts.hostname:
+                raise ValueError(f"unsupported URL: {current}")
+            key = url_host_key(current)
+            status, response_headers = self._send(key, parts, method, headers, timeout)
+            location = response_headers.get("location")
+            if status in HTTP_REDIRECT_CODES and location:
+                current = urllib.parse.urljoin(current, location)
+                if method != "HEAD":
+                    method = "GET"
+                continue
+            return status, current, response_headers
+        raise http.client.HTTPException(f"too many redirects ({HTTP_MAX_REDIRECTS}) for {url}")
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for entries in idle.values():
+            for _, conn in entries:
+                conn.close()
+
+
+HTTP_POOL: HttpConnectionPool | RecordingHttpClient | ReplayHttpClient | StandInHttpClient = HttpConnectionPool()
+
+
+def fixture_key(method: str, url: str) -> str:
+    return f"{method} {url}"
+
+
+class RecordingHttpClient:
+    """Forwards requests to a real pool and captures every outcome for later hermetic replay."""
+
+    def __init__(self, inner: HttpConnectionPool) -> None:
+        self.inner = inner
+        self.responses: dict[str, dict[str, object]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def max_per_host(self) -> int:
+        return self.inner.max_per_host
+
+    @max_per_host.setter
+    def max_per_host(self, value: int) -> None:
+        self.inner.max_per_host = value
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[int, str, dict[str, str]]:
+        try:
+            status, final_url, response_headers = self.inner.request(method, url, headers, timeout)
+        except Exception as ex:  # noqa: BLE001
+            with self._lock:
+                self.responses[fixture_key(method, url)] = {"error": (str(ex).splitlines() or [type(ex).__name__])[0]}
+            raise
+        kept = {name: response_headers[name] for name in LINK_FIXTURE_HEADERS if name in response_headers}
+        with self._lock:
+            self.responses[fixture_key(method, url)] = {"status": status, "final_url": final_url, "headers": kept}
+        return status, final_url, response_headers
+
+    def write(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            payload = {
+                "schema_version": LINK_FIXTURE_SCHEMA_VERSION,
+                "responses": dict(sorted(self.responses.items())),
+            }
+        path.write_text(json.dumps(payload, indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+
+    def close(self) -> None:
+        self.inner.close()
+
+
+def load_link_fixture(path: Path) -> dict[str, dict[str, object]]:
+    data = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(data, dict) or data.get("schema_version") != LINK_FIXTURE_SCHEMA_VERSION:
+        raise ValueError(f"unsupported link fixture: {path}")
+    responses = data.get("responses")
+    if not isinstance(responses, dict):
+        raise ValueError(f"link fixture without responses: {path}")
+    return responses
+
+
+def replay_response(
+    responses: dict[str, dict[str, object]],
+    method: str,
+    url: str,
+) -> tuple[int, str, dict[str, str]]:
+    """Recorded outcome for a request; unrecorded requests fail closed instead of reaching the network."""
+    entry = responses.get(fixture_key(method, url))
+    if entry is None:
+        raise OSError(f"no recorded response for {method} {url} (replay)")
+    if "error" in entry:
+        raise OSError(str(entry["error"]))
+    headers = entry.get("headers") or {}
+    return int(entry["status"]), str(entry.get("final_url") or url), {str(k): str(v) for k, v in headers.items()}
+
+
+class ReplayHttpClient:
+    """Answers link checks straight from a recorded fixture without any socket I/O."""
+
+    def __init__(self, responses: dict[str, dict[str, object]]) -> None:
+        self.responses = responses
+        self.max_per_host = LINK_CHECK_PER_HOST
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[int, str, dict[str, str]]:
+        return replay_response(self.responses, method, url)
+
+    def close(self) -> None:
+        return None
+
+
+class ReplayServer:
+    """Local stand-in HTTP server that serves recorded responses; the original URL is the quoted request path."""
+
+    def __init__(self, responses: dict[str, dict[str, object]]) -> None:
+        fixture = responses
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _respond(self) -> None:
+                original = urllib.parse.unquote(self.path.lstrip("/"))
+                try:
+                    status, final_url, headers = replay_response(fixture, self.command, original)
+                except OSError as ex:
+                    # Recorded transport failures surface as a 599 carrying the original message.
+                    status, final_url, headers = 599, original, {"x-replay-error": str(ex)}
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("X-Replay-Final-Url", final_url)
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+
+            do_HEAD = _respond
+            do_GET = _respond
+
+            def log_message(self, format: str, *args: object) -> None:  # noqa: A002
+                return None
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="link-replay", daemon=True)
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> ReplayServer:
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class StandInHttpClient:
+    """Routes every link check through the pooled client to a local ReplayServer."""
+
+    def __init__(self, server: ReplayServer, pool: HttpConnectionPool | None = None) -> None:
+        self.server = server
+        # The stand-in listens on loopback; environment proxies must never see replayed traffic.
+        self.pool = pool or HttpConnectionPool(use_proxies=False)
+
+    @property
+    def max_per_host(self) -> int:
+        return self.pool.max_per_host
+
+    @max_per_host.setter
+    def max_per_host(self, value: int) -> None:
+        self.pool.max_per_host = value
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        headers: dict[str, str],
+        timeout: float,
+    ) -> tuple[int, str, dict[str, str]]:
+        target = f"{self.server.base_url}/{urllib.parse.quote(url, safe='')}"
+        status, _, response_headers = self.pool.request(method, target, headers, timeout)
+        if status == 599 and "x-replay-error" in response_headers:
+            raise OSError(response_headers["x-replay-error"])
+        return status, response_headers.get("x-replay-final-url", url), response_headers
+
+    def close(self) -> None:
+        self.pool.close()
+        self.server.stop()
+
+
+@dataclass(frozen=True)
+class UrlTiming:
+    url: str
+    host: str
+    elapsed_ms: float
+    attempts: int
+    method: str | None
+    status: int
+    error: str | None
+    cache: str
+    get_fallbacks: int = 0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of `values` (0 for an empty list)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, -(-len(ordered) * pct // 100))
+    return ordered[int(rank) - 1]
+
+
+class LinkTelemetry:
+    """Collects per-URL timings from concurrent link checks and renders the latency report."""
+
+    def __init__(self) -> None:
+        self._timings: dict[str, UrlTiming] = {}
+        self._lock = threading.Lock()
+        self.started = time.monotonic()
+
+    def record(self, timing: UrlTiming) -> None:
+        with self._lock:
+            self._timings[timing.url] = timing
+
+    def timings(self) -> list[UrlTiming]:
+        with self._lock:
+            return sorted(self._timings.values(), key=lambda t: t.url)
+
+    def report(self, top_n: int = LATENCY_TOP_N) -> dict[str, object]:
+        timings = self.timings()
+        hosts: dict[str, list[UrlTiming]] = {}
+        for timing in timings:
+            hosts.setdefault(timing.host, []).append(timing)
+
+        host_stats: dict[str, dict[str, object]] = {}
+        for host, entries in sorted(hosts.items()):
+            # Aggregates describe network behaviour; cache hits would only dilute the percentiles.
+            network = [t.elapsed_ms for t in entries if t.cache in {"miss", "revalidated"}]
+            host_stats[host] = {
+                "urls": len(entries),
+                "network_requests": len(network),
+                "cache_hits": sum(1 for t in entries if t.cache in {"memory", "store"}),
+                "attempts": sum(t.attempts for t in entries),
+                "get_fallbacks": sum(t.get_fallbacks for t in entries),
+                "failures": sum(1 for t in entries if t.error),
+                "p50_ms": round(percentile(network, 50), 1),
+                "p95_ms": round(percentile(network, 95), 1),
+                "max_ms": round(max(network, default=0.0), 1),
+            }
+
+        slowest = sorted(timings, key=lambda t: (-t.elapsed_ms, t.url))[: max(0, top_n)]
+        return {
+            "schema_version": 1,
+            "summary": {
+                "urls": len(timings),
+                "network_requests": sum(1 for t in timings if t.cache in {"miss", "revalidated"}),
+                "cache_hits": sum(1 for t in timings if t.cache in {"memory", "store"}),
+                "failures": sum(1 for t in timings if t.error),
+                "wall_ms": round((time.monotonic() - self.started) * 1000, 1),
+            },
+            "hosts": host_stats,
+            "slowest": [{"url": t.url, "elapsed_ms": round(t.elapsed_ms, 1)} for t in slowest],
+            "urls": [{**asdict(t), "elapsed_ms": round(t.elapsed_ms, 1)} for t in timings],
+        }
+
+    def write(self, path: Path, top_n: int = LATENCY_TOP_N) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(self.report(top_n), indent=2, ensure_ascii=True) + "\n", encoding="utf-8")
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = LINK_RETRY_ATTEMPTS
+    base_delay: float = LINK_RETRY_BASE_DELAY_SECONDS
+    max_delay: float = LINK_RETRY_MAX_DELAY_SECONDS
+    circuit_threshold: int = LINK_CIRCUIT_THRESHOLD
+    budget: float = LINK_CHECK_BUDGET_SECONDS
+
+    def delay(self, attempt: int, retry_after: float | None, rng: random.Random) -> float:
+        """Exponential backoff with equal jitter; a server `Retry-After` takes precedence (capped)."""
+        if retry_after is not None:
+            return min(max(0.0, retry_after), self.max_delay)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** max(0, attempt - 1)))
+        return ceiling / 2 + rng.uniform(0, ceiling / 2)
+
+
+LINK_RETRY_POLICY = RetryPolicy()
+
+
+@dataclass(frozen=True)
+class AttemptResult:
+    error: str | None
+    status: int
+    method: str | None
+    requests: int
+    get_fallback: bool
+    validators: dict[str, str]
+    retry_after: float | None = None
+
+    @property
+    def retryable(self) -> bool:
+        return self.error is not None and (self.status == 0 or self.status in HTTP_RETRYABLE_CODES)
+
+
+@dataclass
+class UrlCheck:
+    """Scheduler state of one URL across its (re)queued attempts."""
+
+    url: str
+    host: str
+    conditional: dict[str, str]
+    previous: UrlVerdict | None
+    started: float = 0.0
+    tries: int = 0
+    requests: int = 0
+    get_fallbacks: int = 0
+    method: str | None = None
+    not_before: float = 0.0
+    last: AttemptResult | None = None
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def http_attempt(url: str, conditional: dict[str, str], timeout_cap: float | None = None) -> AttemptResult:
+    """One HEAD request, with a GET fallback for endpoints that reject HEAD; never raises."""
+    requests = 0
+    method: str | None = None
+    get_fallback = False
+    try:
+        headers = {"User-Agent": "FileClassifier-LinkCheck/1.0", **conditional}
+        head_timeout = HTTP_HEAD_TIMEOUT_SECONDS if timeout_cap is None else max(1.0, min(HTTP_HEAD_TIMEOUT_SECONDS, timeout_cap))
+        method, requests = "HEAD", requests + 1
+        code, _, response_headers = HTTP_POOL.request("HEAD", url, headers, head_timeout)
+        # Fallback to GET for endpoints that don't support HEAD.
+        if code in {405, 403}:
+            get_fallback = True
+            get_timeout = HTTP_GET_TIMEOUT_SECONDS if timeout_cap is None else max(1.0, min(HTTP_GET_TIMEOUT_SECONDS, timeout_cap))
+            method, requests = "GET", requests + 1
+            code, _, response_headers = HTTP_POOL.request("GET", url, headers, get_timeout)
+    except Exception as ex:  # noqa: BLE001
+        error = (str(ex).splitlines() or [type(ex).__name__])[0][:200]
+        return AttemptResult(error, 0, method, requests, get_fallback, {})
+
+    validators = {
+        "etag": response_headers.get("etag", ""),
+        "last_modified": response_headers.get("last-modified", ""),
+    }
+    if code == 304 and conditional:
+        return AttemptResult(None, 304, method, requests, get_fallback, {})
+    if code < 400:
+        return AttemptResult(None, code, method, requests, get_fallback, validators)
+    return AttemptResult(
+        f"HTTP {code}",
+        code,
+        method,
+        requests,
+        get_fallback,
+        validators,
+        parse_retry_after(response_headers.get("retry-after")),
+    )
+
+
+def resolve_without_network(
+    url: str,
+    cache: dict[str, str | None],
+    store: UrlVerdictStore | None,
+    telemetry: LinkTelemetry | None,
+) -> UrlCheck | None:
+    """Answer from memory, commit-link policy or a fresh stored verdict; otherwise return the pending check."""
+    host = url_host_key(url)
+
+    def observe(error: str | None, status: int, source: str) -> None:
+        if telemetry is not None:
+            telemetry.record(UrlTiming(url, host, 0.0, 0, None, status, error, source))
+
     if url in cache:
-        return cache[url]
+        observe(cache[url], 0, "memory")
+        return None
 
     # Commit links are immutable objects; keep deterministic and avoid flaky remote checks.
     if url.startswith(f"{REPO}/commit/"):
         cache[url] = None
+        observe(None, 0, "skipped")
         return None
 
-    def request_once(method: str, timeout: int) -> tuple[int, str]:
-        req = urllib.request.Request(url, method=method, headers={"User-Agent": "FileClassifier-LinkCheck/1.0"})
-        with urllib.request.urlopen(req, timeout=timeout) as resp:
-            return int(resp.getcode() or 0), str(resp.geturl())
+    previous = store.get(url) if store is not None else None
+    if previous is not None and store is not None and store.is_fresh(previous):
+        cache[url] = previous.error
+        observe(previous.error, previous.status, "store")
+        return None
 
-    last_error: str | None = None
-    for _ in range(3):
-        try:
-            code, _ = request_once("HEAD", 12)
-            if code < 400:
-                cache[url] = None
-                return None
-            last_error = f"HTTP {code}"
-        except urllib.error.HTTPError as ex:
-            # Fallback to GET for endpoints that don't support HEAD.
-            if ex.code in {405, 403}:
+    # Expired positive verdicts are revalidated conditionally; a 304 keeps the verdict alive.
+    conditional: dict[str, str] = {}
+    if previous is not None and previous.error is None:
+        if previous.etag:
+            conditional["If-None-Match"] = previous.etag
+        if previous.last_modified:
+            conditional["If-Modified-Since"] = previous.last_modified
+    return UrlCheck(url=url, host=host, conditional=conditional, previous=previous)
+
+
+def finish_url_check(
+    check: UrlCheck,
+    error: str | None,
+    cache: dict[str, str | None],
+    store: UrlVerdictStore | None,
+    telemetry: LinkTelemetry | None,
+) -> None:
+    last = check.last
+    status = last.status if last is not None else 0
+    cache[check.url] = error
+    if telemetry is not None:
+        telemetry.record(
+            UrlTiming(
+                url=check.url,
+                host=check.host,
+                elapsed_ms=(time.monotonic() - check.started) * 1000 if check.started else 0.0,
+                attempts=check.requests,
+                method=check.method,
+                status=status,
+                error=error,
+                cache="revalidated" if check.conditional else "miss",
+                get_fallbacks=check.get_fallbacks,
+            )
+        )
+    # Scheduler verdicts (budget exhausted, open circuit) say nothing about the URL itself.
+    if store is not None and last is not None and error == last.error:
+        keep = check.previous if status == 304 else None
+        store.put(
+            check.url,
+            UrlVerdict(
+                error=error,
+                status=keep.status if keep else status,
+                checked_at=time.time(),
+                etag=last.validators.get("etag") or (keep.etag if keep else None),
+                last_modified=last.validators.get("last_modified") or (keep.last_modified if keep else None),
+            ),
+        )
+
+
+def check_http_url(
+    url: str,
+    cache: dict[str, str | None],
+    store: UrlVerdictStore | None = None,
+    telemetry: LinkTelemetry | None = None,
+) -> str | None:
+    return check_http_urls([url], cache, 1, 1, store, telemetry)[url]
+
+
+class GitObjectResolver:
+    """Answers `<rev>` and `<rev>:<path>` lookups over one long-lived `git cat-file --batch-check` pipe."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self._proc: subprocess.Popen[str] | None = None
+        self._unavailable = False
+        self._lock = threading.Lock()
+
+    def _ensure_process(self) -> subprocess.Popen[str] | None:
+        if self._proc is None and not self._unavailable:
+            try:
+                self._proc = subprocess.Popen(
+                    ["git", "cat-file", "--batch-check"],
+                    cwd=self.root,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    bufsize=1,
+                )
+            except OSError:
+                self._unavailable = True
+        return self._proc
+
+    def lookup(self, spec: str) -> tuple[str, str] | None:
+        """Return `(object_id, object_type)` for a revision spec or `None` when it does not resolve."""
+        with self._lock:
+            proc = self._ensure_process()
+            line = ""
+            if proc is not None and proc.stdin is not None and proc.stdout is not None:
                 try:
-                    code, _ = request_once("GET", 20)
-                    if code < 400:
-                        cache[url] = None
-                        return None
-                    last_error = f"HTTP {code}"
-                except urllib.error.HTTPError as ex2:
-                    last_error = f"HTTP {ex2.code}"
-                except Exception as ex2:  # noqa: BLE001
-                    last_error = str(ex2).splitlines()[0][:200]
-            else:
-                last_error = f"HTTP {ex.code}"
-        except Exception as ex:  # noqa: BLE001
-            last_error = str(ex).splitlines()[0][:200]
-        time.sleep(0.2)
+                    proc.stdin.write(f"{spec}\n")
+                    proc.stdin.flush()
+                    line = proc.stdout.readline()
+                except OSError:
+                    line = ""
+                if not line:
+                    # Coprocess died (e.g. not a git work tree); degrade to one-shot commands.
+                    self._close_locked()
+                    self._unavailable = True
+            if not line:
+                return self._lookup_once(spec)
 
-    cache[url] = last_error
-    return last_error
+        parts = line.split()
+        if len(parts) == 3 and parts[1] in {"blob", "tree", "commit", "tag"}:
+            return parts[0], parts[1]
+        return None
+
+    def _lookup_once(self, spec: str) -> tuple[str, str] | None:
+        object_id = subprocess.run(
+            ["git", "rev-parse", "--verify", "--quiet", spec],
+            cwd=self.root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if object_id.returncode != 0 or not object_id.stdout.strip():
+            return None
+        object_type = subprocess.run(
+            ["git", "cat-file", "-t", spec],
+            cwd=self.root,
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if object_type.returncode != 0:
+            return None
+        return object_id.stdout.strip(), object_type.stdout.strip()
+
+    def _close_locked(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        for stream in (proc.stdin, proc.stdout):
+            try:
+                if stream is not None:
+                    stream.close()
+            except OSError:
+                pass
+        try:
+            proc.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+    def close(self) -> None:
+        with self._lock:
+            self._close_locked()
+
+
+GIT_RESOLVERS: dict[Path, GitObjectResolver] = {}
+
+
+def git_object_resolver() -> GitObjectResolver:
+    resolver = GIT_RESOLVERS.get(ROOT)
+    if resolver is None:
+        resolver = GitObjectResolver(ROOT)
+        GIT_RESOLVERS[ROOT] = resolver
+    return resolver
+
+
+def close_git_resolvers() -> None:
+    for resolver in GIT_RESOLVERS.values():
+        resolver.close()
+    GIT_RESOLVERS.clear()
 
 
 def check_internal_repo_url(url: str, cache: dict[str, str | None]) -> str | None:
@@ -174,17 +1156,12 @@ def check_internal_repo_url(url: str, cache: dict[str, str | None]) -> str | Non
             return cache[url]
 
     # Immutable commit-like refs (or resolved named refs) are verified against git objects.
+    resolver = git_object_resolver()
     if resolved_ref in REF_EXISTS_CACHE:
         ref_exists = REF_EXISTS_CACHE[resolved_ref]
     else:
-        exists = subprocess.run(
-            ["git", "cat-file", "-e", f"{resolved_ref}^{{commit}}"],
-            cwd=ROOT,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        ref_exists = exists.returncode == 0
+        commit = resolver.lookup(f"{resolved_ref}^{{commit}}")
+        ref_exists = commit is not None and commit[1] == "commit"
         REF_EXISTS_CACHE[resolved_ref] = ref_exists
 
     if not ref_exists:
@@ -192,29 +1169,12 @@ def check_internal_repo_url(url: str, cache: dict[str, str | None]) -> str | Non
         return cache[url]
 
     spec = f"{resolved_ref}:{rel_path}"
-    exists = subprocess.run(
-        ["git", "cat-file", "-e", spec],
-        cwd=ROOT,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if exists.returncode != 0:
+    target = resolver.lookup(spec)
+    if target is None:
         cache[url] = f"target not found at commit ({spec})"
         return cache[url]
 
-    type_result = subprocess.run(
-        ["git", "cat-file", "-t", spec],
-        cwd=ROOT,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
-    if type_result.returncode != 0:
-        cache[url] = f"unable to resolve object type ({spec})"
-        return cache[url]
-
-    git_type = type_result.stdout.strip()
+    git_type = target[1]
     expected = "blob" if kind == "blob" else "tree"
     if git_type != expected:
         cache[url] = f"expected {expected}, got {git_type} ({spec})"
@@ -233,46 +1193,191 @@ def resolve_named_ref_to_commit(ref: str) -> str | None:
         f"refs/heads/{ref}^{{commit}}",
         f"refs/tags/{ref}^{{commit}}",
     )
+    resolver = git_object_resolver()
     for candidate in candidates:
-        result = subprocess.run(
-            ["git", "rev-parse", "--verify", "--quiet", candidate],
-            cwd=ROOT,
-            capture_output=True,
-            text=True,
-            check=False,
-        )
-        if result.returncode == 0:
-            commit = result.stdout.strip()
-            if commit:
-                REF_COMMIT_CACHE[ref] = commit
-                return commit
+        resolved = resolver.lookup(candidate)
+        if resolved is not None and resolved[1] == "commit":
+            REF_COMMIT_CACHE[ref] = resolved[0]
+            return resolved[0]
 
     REF_COMMIT_CACHE[ref] = None
     return None
 
 
-def check_links_and_text(files: list[Path]) -> list[str]:
-    errors: list[str] = []
-    http_cache: dict[str, str | None] = {}
+def url_host_key(url: str) -> str:
+    parts = urllib.parse.urlsplit(url)
+    return f"{parts.scheme.lower()}://{parts.netloc.lower()}"
+
+
+def check_http_urls(
+    urls: list[str],
+    cache: dict[str, str | None],
+    workers: int = LINK_CHECK_WORKERS,
+    per_host: int = LINK_CHECK_PER_HOST,
+    store: UrlVerdictStore | None = None,
+    telemetry: LinkTelemetry | None = None,
+    policy: RetryPolicy | None = None,
+) -> dict[str, str | None]:
+    """Validate unique URLs on a bounded worker pool under one time budget.
+
+    Failed attempts are requeued behind the host's other URLs with backoff instead of
+    retrying inline, and a host whose URLs keep failing gets an open circuit so its
+    remaining URLs fail fast. Result order follows first occurrence.
+    """
+    policy = policy or LINK_RETRY_POLICY
+    unique = list(dict.fromkeys(urls))
+    queues: dict[str, deque[UrlCheck]] = {}
+    for url in unique:
+        check = resolve_without_network(url, cache, store, telemetry)
+        if check is not None:
+            queues.setdefault(check.host, deque()).append(check)
+
+    if not queues:
+        return {url: cache[url] for url in unique}
+
+    workers = max(1, workers)
+    per_host = max(1, per_host)
+    rng = random.Random()
+    deadline = time.monotonic() + policy.budget
+    in_flight: dict[str, int] = {host: 0 for host in queues}
+    host_failures: dict[str, int] = {host: 0 for host in queues}
+    open_circuits: dict[str, str] = {}
+    running: dict[Future[AttemptResult], UrlCheck] = {}
+
+    def finish(check: UrlCheck, error: str | None) -> None:
+        finish_url_check(check, error, cache, store, telemetry)
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="link-check") as pool:
+        while queues or running:
+            now = time.monotonic()
+            for host in sorted(queues):
+                queue = queues[host]
+                if host in open_circuits or now >= deadline:
+                    while queue:
+                        check = queue.popleft()
+                        last_error = check.last.error if check.last else "not attempted"
+                        if host in open_circuits:
+                            finish(check, f"host circuit open: {open_circuits[host]}")
+                        else:
+                            finish(check, f"link check budget exhausted after {policy.budget:g}s ({last_error})")
+                # Round-robin over hosts so one slow host never occupies the whole pool; entries that
+                # are still backing off rotate to the end so fresh URLs are not held up by retries.
+                for _ in range(len(queue)):
+                    if in_flight[host] >= per_host or len(running) >= workers:
+                        break
+                    check = queue.popleft()
+                    if check.not_before > now:
+                        queue.append(check)
+                        continue
+                    if not check.started:
+                        check.started = now
+                    check.tries += 1
+                    running[pool.submit(http_attempt, check.url, check.conditional, deadline - now)] = check
+                    in_flight[host] += 1
+                if not queue:
+                    del queues[host]
+
+            if not running:
+                if queues:
+                    wake = min(c.not_before for q in queues.values() for c in q)
+                    time.sleep(max(0.0, min(wake, deadline) - time.monotonic()))
+                continue
+
+            waiting = [c.not_before for q in queues.values() for c in q if c.not_before > now]
+            timeout = max(0.0, min([*waiting, deadline]) - now) if queues else None
+            done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                check = running.pop(future)
+                host = check.host
+                in_flight[host] -= 1
+                result = future.result()
+                check.last = result
+                check.requests += result.requests
+                check.get_fallbacks += int(result.get_fallback)
+                check.method = result.method or check.method
+
+                if not result.retryable:
+                    if result.error is None:
+                        host_failures[host] = 0
+                    finish(check, result.error)
+                    continue
+
+                host_failures[host] += 1
+                if host_failures[host] >= max(1, policy.circuit_threshold) and host not in open_circuits:
+                    open_circuits[host] = f"{host_failures[host]} consecutive failures, last: {result.error}"
+                if check.tries >= policy.attempts or host in open_circuits or time.monotonic() >= deadline:
+                    finish(check, result.error)
+                    continue
+                check.not_before = time.monotonic() + policy.delay(check.tries, result.retry_after, rng)
+                queues.setdefault(host, deque()).append(check)
+
+    return {url: cache[url] for url in unique}
+
+
+def check_links_and_text(
+    documents: list[MarkdownDocument],
+    workers: int = LINK_CHECK_WORKERS,
+    per_host: int = LINK_CHECK_PER_HOST,
+    store: UrlVerdictStore | None = None,
+    anchor_index: AnchorIndex | None = None,
+    telemetry: LinkTelemetry | None = None,
+) -> list[str]:
+    by_document = check_links_by_document(documents, workers, per_host, store, anchor_index, telemetry)
+    return [error for errors in by_document.values() for error in errors]
+
+
+def check_links_by_document(
+    documents: list[MarkdownDocument],
+    workers: int = LINK_CHECK_WORKERS,
+    per_host: int = LINK_CHECK_PER_HOST,
+    store: UrlVerdictStore | None = None,
+    anchor_index: AnchorIndex | None = None,
+    telemetry: LinkTelemetry | None = None,
+    http_cache: dict[str, str | None] | None = None,
+) -> dict[Path, list[str]]:
+    """Link and link-text errors per document; pass `http_cache` to keep URL verdicts across calls."""
+    by_document: dict[Path, list[str]] = {doc.path: [] for doc in documents}
+    if http_cache is None:
+        http_cache = {}
     internal_repo_cache: dict[str, str | None] = {}
+    if anchor_index is None:
+        anchor_index = AnchorIndex(documents)
 
-    for f in files:
-        text = f.read_text(encoding="utf-8")
-        text_for_link_check = LANG_SWITCH_BLOCK_RE.sub("", text)
+    def fragment_error(url: str) -> str | None:
+        """Validate `#fragment` of workspace blob links to markdown files against the anchor index."""
+        match = INTERNAL_REPO_URL_RE.match(url)
+        if not match or not match.group("fragment") or match.group("kind") != "blob":
+            return None
+        # Pinned refs may differ from the work tree; only mutable workspace refs are checked.
+        if match.group("ref") not in MUTABLE_WORKSPACE_REFS:
+            return None
+        target = ROOT / match.group("path")
+        if target.suffix.lower() != ".md":
+            return None
+        if anchor_index.has_anchor(target, match.group("fragment")):
+            return None
+        return f"anchor not found in {match.group('path')} (#{match.group('fragment')})"
+    # External URLs are collected across all files first and verified concurrently afterwards.
+    pending_http: list[tuple[Path, str, str, str]] = []
 
-        if RELATIVE_RE.search(text_for_link_check):
-            errors.append(f"relative link detected in {f.relative_to(ROOT)}")
+    for doc in documents:
+        errors = by_document[doc.path]
+        if doc.relative_link_line is not None:
+            errors.append(f"relative link detected in {doc.location(doc.relative_link_line)}")
 
-        for m in LINK_RE.finditer(text_for_link_check):
-            ltxt = m.group("text").strip()
-            url = m.group("url").strip()
+        for link in doc.links:
+            ltxt = link.text
+            url = link.url
+            where = doc.location(link.line)
 
             if PATH_TEXT_RE.match(ltxt):
-                errors.append(f"path-like link text in {f.relative_to(ROOT)}: '{ltxt}'")
+                errors.append(f"path-like link text in {where}: '{ltxt}'")
             if FILE_TEXT_RE.match(ltxt):
-                errors.append(f"filename-like link text in {f.relative_to(ROOT)}: '{ltxt}'")
+                errors.append(f"filename-like link text in {where}: '{ltxt}'")
 
             if ANCHOR_RE.match(url):
+                if not anchor_index.has_anchor(doc.path, url[1:]):
+                    errors.append(f"broken anchor in {where}: {url}")
                 continue
             if url.startswith("mailto:"):
                 continue
@@ -281,105 +1386,240 @@ def check_links_and_text(files: list[Path]) -> list[str]:
                     if url.startswith(f"{REPO}/commit/"):
                         continue
                     if INTERNAL_REPO_URL_RE.match(url):
-                        internal_error = check_internal_repo_url(url, internal_repo_cache)
+                        internal_error = check_internal_repo_url(url, internal_repo_cache) or fragment_error(url)
                         if internal_error:
-                            errors.append(
-                                f"broken internal repo URL in {f.relative_to(ROOT)}: {url} ({internal_error})"
-                            )
-                            continue
+                            errors.append(f"broken internal repo URL in {where}: {url} ({internal_error})")
                         continue
-                    http_error = check_http_url(url, http_cache)
-                    if http_error:
-                        errors.append(f"broken URL in {f.relative_to(ROOT)}: {url} ({http_error})")
-                        continue
-
-                http_error = check_http_url(url, http_cache)
-                if http_error:
-                    errors.append(f"broken URL in {f.relative_to(ROOT)}: {url} ({http_error})")
+                pending_http.append((doc.path, "broken URL", where, url))
                 continue
 
-            errors.append(f"non-absolute or unsupported URL in {f.relative_to(ROOT)}: {url}")
+            errors.append(f"non-absolute or unsupported URL in {where}: {url}")
 
         # Also validate plain URLs in text sections/tables.
-        for pm in PLAIN_URL_RE.finditer(text_for_link_check):
-            raw_url = pm.group("url")
-            cleaned = raw_url.rstrip(".,;:")
+        for plain in doc.plain_urls:
+            cleaned = plain.url.rstrip(".,;:")
+            where = doc.location(plain.line)
             if cleaned.startswith("mailto:"):
                 continue
             if cleaned.startswith(REPO) and cleaned.startswith(f"{REPO}/commit/"):
                 continue
-            if cleaned.startswith(REPO):
-                if INTERNAL_REPO_URL_RE.match(cleaned):
-                    internal_error = check_internal_repo_url(cleaned, internal_repo_cache)
-                    if internal_error:
-                        errors.append(
-                            f"broken internal plain-url in {f.relative_to(ROOT)}: {cleaned} ({internal_error})"
-                        )
-                    continue
-                http_error = check_http_url(cleaned, http_cache)
-                if http_error:
-                    errors.append(f"broken plain-url in {f.relative_to(ROOT)}: {cleaned} ({http_error})")
+            if cleaned.startswith(REPO) and INTERNAL_REPO_URL_RE.match(cleaned):
+                internal_error = check_internal_repo_url(cleaned, internal_repo_cache) or fragment_error(cleaned)
+                if internal_error:
+                    errors.append(f"broken internal plain-url in {where}: {cleaned} ({internal_error})")
                 continue
-            http_error = check_http_url(cleaned, http_cache)
-            if http_error:
-                errors.append(f"broken plain-url in {f.relative_to(ROOT)}: {cleaned} ({http_error})")
+            pending_http.append((doc.path, "broken plain-url", where, cleaned))
 
-    return errors
+    results = check_http_urls(
+        [url for _, _, _, url in pending_http], http_cache, workers, per_host, store, telemetry
+    )
+    for path, label, where, url in pending_http:
+        http_error = results[url]
+        if http_error:
+            by_document[path].append(f"{label} in {where}: {url} ({http_error})")
+
+    return by_document
 
 
-def check_diagrams(files: list[Path]) -> list[str]:
+def check_diagrams(documents: list[MarkdownDocument]) -> list[str]:
     errors: list[str] = []
-    for f in files:
-        if f.suffix != ".MD":
+    for doc in documents:
+        if doc.path.suffix != ".MD":
             continue
-        name = f.name
+        name = doc.path.name
         if any(t in name for t in DOC_TYPES_REQUIRE_DIAGRAM):
-            text = f.read_text(encoding="utf-8")
-            if "```mermaid" not in text:
-                errors.append(f"diagram required but missing in {f.relative_to(ROOT)}")
+            if not doc.has_fence("mermaid"):
+                errors.append(f"diagram required but missing in {doc.rel}")
     return errors
 
 
-def check_readme_coverage_and_template() -> list[str]:
+def check_readme_coverage_and_template(
+    documents: list[MarkdownDocument] | None = None,
+    texts: Mapping[Path, str] | None = None,
+) -> list[str]:
     errors: list[str] = []
-    for d in sorted(SRC_FTD_DIR.rglob("*")):
-        if not d.is_dir():
-            continue
+    parsed = {doc.path: doc for doc in documents or []}
+    dir_files: dict[Path, list[Path]] = {}
+    for f in walk_files(SRC_FTD_DIR, "*", texts):
+        if f.parent != SRC_FTD_DIR:
+            dir_files.setdefault(f.parent, []).append(f)
+    for d, files in sorted(dir_files.items()):
         if any(part.startswith(".") for part in d.parts):
             continue
         if any(part in EXCLUDED_DIRS for part in d.parts):
             continue
 
-        has_relevant = any(
-            f.is_file() and f.suffix in RELEVANT_SUFFIXES and f.name != "README.md"
-            for f in d.iterdir()
-        )
+        has_relevant = any(f.suffix in RELEVANT_SUFFIXES and f.name != "README.md" for f in files)
         if not has_relevant:
             continue
 
         readme = d / "README.md"
-        if not readme.exists():
+        if readme not in files:
             errors.append(f"missing README.md in content directory: {d.relative_to(ROOT)}")
             continue
 
-        text = readme.read_text(encoding="utf-8")
+        doc = parsed.get(readme) or parse_document(readme, texts[readme] if texts is not None else None)
+        text = doc.text
         for h in README_HEADINGS:
             if h not in text:
-                errors.append(f"README template heading missing in {readme.relative_to(ROOT)}: {h}")
-        section = text.split("## 5. Diagramm", 1)[1] if "## 5. Diagramm" in text else ""
-        if "```mermaid" not in section and "N/A" not in section:
-            errors.append(f"README diagram section requires mermaid or N/A in {readme.relative_to(ROOT)}")
+                errors.append(f"README template heading missing in {doc.rel}: {h}")
+        section_start = text.find("## 5. Diagramm")
+        if section_start < 0:
+            section_start = len(text)
+        section = text[section_start:]
+        has_mermaid = any(f.info == "mermaid" and f.start >= section_start for f in doc.fences)
+        if not has_mermaid and "N/A" not in section:
+            errors.append(f"README diagram section requires mermaid or N/A in {doc.rel}")
 
     return errors
 
 
-def main() -> int:
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Validate docs naming, links, diagrams and module READMEs.")
+    parser.add_argument(
+        "--link-workers",
+        type=int,
+        default=LINK_CHECK_WORKERS,
+        help=f"Concurrent external URL checks (default: {LINK_CHECK_WORKERS}).",
+    )
+    parser.add_argument(
+        "--link-per-host",
+        type=int,
+        default=LINK_CHECK_PER_HOST,
+        help=f"Concurrent external URL checks per scheme+host (default: {LINK_CHECK_PER_HOST}).",
+    )
+    parser.add_argument(
+        "--link-budget",
+        type=float,
+        default=LINK_CHECK_BUDGET_SECONDS,
+        help="Global time budget in seconds for all external URL checks (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--link-retries",
+        type=int,
+        default=LINK_RETRY_ATTEMPTS,
+        help="Maximum attempts per external URL for transient failures (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--link-circuit-threshold",
+        type=int,
+        default=LINK_CIRCUIT_THRESHOLD,
+        help="Consecutive transient failures after which a host fails fast (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--url-cache",
+        default=str(URL_CACHE_PATH.relative_to(ROOT)),
+        help="Persistent URL verdict cache relative to the repo root (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--no-url-cache",
+        action="store_true",
+        help="Disable the persistent URL verdict cache.",
+    )
+    parser.add_argument(
+        "--url-cache-ttl",
+        type=float,
+        default=URL_CACHE_TTL_SECONDS,
+        help="Seconds a successful URL verdict stays valid before revalidation (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--url-cache-negative-ttl",
+        type=float,
+        default=URL_CACHE_NEGATIVE_TTL_SECONDS,
+        help="Seconds a failed URL verdict is reused before the URL is retried (default: %(default)s).",
+    )
+    parser.add_argument(
+        "--latency-report",
+        metavar="PATH",
+        help="Write per-URL latency/retry telemetry and per-host aggregates as JSON to PATH.",
+    )
+    parser.add_argument(
+        "--latency-top",
+        type=int,
+        default=LATENCY_TOP_N,
+        help=f"Number of slowest URLs listed in the latency report (default: {LATENCY_TOP_N}).",
+    )
+    replay = parser.add_mutually_exclusive_group()
+    replay.add_argument(
+        "--record",
+        metavar="FIXTURE",
+        help="Record every external URL response into FIXTURE for later hermetic replay.",
+    )
+    replay.add_argument(
+        "--replay",
+        metavar="FIXTURE",
+        help="Answer external URL checks from FIXTURE without network access (implies --no-url-cache).",
+    )
+    parser.add_argument(
+        "--replay-server",
+        action="store_true",
+        help="With --replay, serve the fixture from a local stand-in HTTP server through the pooled client.",
+    )
+    parser.add_argument(
+        "--since",
+        metavar="BASE_REF",
+        help="Incremental mode: only check markdown changed since BASE_REF and documents linking to changed paths.",
+    )
+    parser.add_argument(
+        "--link-index",
+        default=str(LINK_INDEX_PATH.relative_to(ROOT)),
+        help="Persisted reverse link index relative to the repo root (default: %(default)s).",
+    )
+    args = parser.parse_args(argv)
+    if args.replay_server and not args.replay:
+        parser.error("--replay-server requires --replay")
+    return args
+
+
+def main(argv: list[str] | None = None, texts: Mapping[Path, str] | None = None) -> int:
+    args = parse_args(argv)
     errors: list[str] = []
-    files = collect_targets()
-    errors.extend(check_docs_naming())
-    errors.extend(check_links_and_text(files))
-    errors.extend(check_diagrams(files))
-    errors.extend(check_readme_coverage_and_template())
+    index = LinkIndex(ROOT / args.link_index).load()
+    documents = select_documents(collect_targets(texts), index, args.since, texts)
+    if documents is None:
+        print("Doc check failed:")
+        print(f"- unable to diff against base ref ({args.since})")
+        return 1
+    index.save()
+    if args.since is not None:
+        print(f"Incremental doc check since {args.since}: {len(documents)} document(s) selected")
+    errors.extend(check_docs_naming(texts))
+    global HTTP_POOL, LINK_RETRY_POLICY
+    recorder: RecordingHttpClient | None = None
+    if args.replay:
+        responses = load_link_fixture(Path(args.replay).resolve())
+        HTTP_POOL = (
+            StandInHttpClient(ReplayServer(responses).start()) if args.replay_server else ReplayHttpClient(responses)
+        )
+    elif args.record:
+        recorder = RecordingHttpClient(HttpConnectionPool())
+        HTTP_POOL = recorder
+
+    store: UrlVerdictStore | None = None
+    if not args.no_url_cache and not args.replay and not args.record:
+        store = UrlVerdictStore(ROOT / args.url_cache, args.url_cache_ttl, args.url_cache_negative_ttl).load()
+    LINK_RETRY_POLICY = RetryPolicy(
+        attempts=max(1, args.link_retries),
+        circuit_threshold=max(1, args.link_circuit_threshold),
+        budget=max(0.0, args.link_budget),
+    )
+    telemetry = LinkTelemetry() if args.latency_report else None
+    HTTP_POOL.max_per_host = max(1, args.link_per_host)
+    try:
+        errors.extend(
+            check_links_and_text(documents, args.link_workers, args.link_per_host, store, telemetry=telemetry)
+        )
+    finally:
+        HTTP_POOL.close()
+        close_git_resolvers()
+        if recorder is not None:
+            recorder.write(Path(args.record).resolve())
+        if store is not None:
+            store.save()
+        if telemetry is not None:
+            telemetry.write(Path(args.latency_report).resolve(), args.latency_top)
+    errors.extend(check_diagrams(documents))
+    errors.extend(check_readme_coverage_and_template(documents, texts))
 
     if errors:
         print("Doc check failed:")
@@ -2,9 +2,21 @@
 from __future__ import annotations
 
 import argparse
+import fnmatch
+import hashlib
+import json
+import os
 import re
+import sys
+from collections.abc import Mapping
 from pathlib import Path
 
+LIB_DIR = Path(__file__).resolve().parent / "ci" / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from file_store import walk_files  # noqa: E402
+
 ROOT = Path(__file__).resolve().parents[1]
 DOCS = ROOT / "docs"
 RULES = ROOT / "tools" / "ci" / "policies" / "rules"
@@ -16,36 +28,142 @@ RULE_URL_RE = re.compile(
     r"(?:#[A-Za-z0-9\-_\.]+)?$"
 )
 RULE_PATH_RE = re.compile(r"`(?P<path>tools/ci/policies/rules/.+\.(?:yml|yaml))`")
+INDEX_PATH = "artifacts/policy_roc_index.json"
+INDEX_SCHEMA_VERSION = 1
+
+
+def blob_id(text: str) -> str:
+    """Git blob id of the UTF-8 text, the cache key for a policy doc's extracted rule references."""
+    data = text.encode("utf-8")
+    return hashlib.sha1(b"blob %d\0" % len(data) + data).hexdigest()
+
+
+def extract_rule_refs(text: str) -> list[str]:
+    """Rule files cited by a policy doc (blob links first, then code-span paths), in order of appearance."""
+    refs: list[str] = []
+    for m in LINK_RE.finditer(text):
+        rule_match = RULE_URL_RE.match(m.group("url"))
+        if rule_match:
+            refs.append(str((ROOT / rule_match.group("path")).resolve().relative_to(ROOT)))
+    for m in RULE_PATH_RE.finditer(text):
+        refs.append(str((ROOT / m.group("path")).resolve().relative_to(ROOT)))
+    return refs
+
+
+class PolicyRocIndex:
+    """Persistent policy -> rules and rule -> policies index; policy entries are reused while their blob id matches."""
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self.policies: dict[str, dict[str, object]] = {}
+        self.rules: dict[str, list[str]] = {}
+        self.rule_files: list[str] = []
+        self.loaded = False
+
+    def load(self) -> PolicyRocIndex:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self
+        if not isinstance(data, dict) or data.get("schema_version") != INDEX_SCHEMA_VERSION:
+            return self
+        policies, rules, rule_files = data.get("policies"), data.get("rules"), data.get("rule_files")
+        if isinstance(policies, dict) and isinstance(rules, dict) and isinstance(rule_files, list):
+            self.policies, self.rules, self.rule_files = policies, rules, rule_files
+            self.loaded = True
+        return self
 
+    def refs(self, policy: str, blob: str) -> list[str] | None:
+        entry = self.policies.get(policy)
+        if not isinstance(entry, dict) or entry.get("blob") != blob:
+            return None
+        refs = entry.get("rules")
+        if not isinstance(refs, list) or not all(isinstance(ref, str) for ref in refs):
+            return None
+        return refs
 
-def main() -> int:
+    def rebuild(self, entries: dict[str, tuple[str, list[str]]], rule_files: list[str]) -> None:
+        """Replace the index with this run's policies; the rule -> policies direction is derived from them."""
+        self.policies = {policy: {"blob": blob, "rules": refs} for policy, (blob, refs) in sorted(entries.items())}
+        self.rule_files = sorted(rule_files)
+        cited: dict[str, set[str]] = {rule: set() for rule in self.rule_files}
+        for policy, (_, refs) in entries.items():
+            for ref in refs:
+                cited.setdefault(ref, set()).add(policy)
+        self.rules = {rule: sorted(policies) for rule, policies in sorted(cited.items())}
+
+    def save(self) -> None:
+        payload = {
+            "schema_version": INDEX_SCHEMA_VERSION,
+            "policies": self.policies,
+            "rules": self.rules,
+            "rule_files": self.rule_files,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
+
+    def policies_citing(self, rule: str) -> list[str]:
+        """Policies citing `rule`, given as a repo-relative path or a unique file name."""
+        matches = [key for key in self.rules if key == rule or Path(key).name == rule]
+        return sorted({policy for key in matches for policy in self.rules[key]})
+
+    def rules_cited_by(self, policy: str) -> list[str]:
+        matches = [key for key in self.policies if key == policy or Path(key).name == policy]
+        return sorted({ref for key in matches for ref in self.policies[key]["rules"]})
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser()
     parser.add_argument("--out", default="artifacts/policy_roc_matrix.tsv")
-    args = parser.parse_args()
+    parser.add_argument("--index", default=INDEX_PATH, help="Policy/rule index, relative to the repository root.")
+    query = parser.add_mutually_exclusive_group()
+    query.add_argument("--policies-citing", metavar="RULE", help="Print the policy docs that cite RULE and exit.")
+    query.add_argument("--rules-cited-by", metavar="POLICY", help="Print the rule files POLICY cites and exit.")
+    return parser.parse_args(argv)
 
-    policy_docs = sorted([p for p in DOCS.rglob("*.MD") if "POLICY" in p.name])
-    rule_files = sorted([p.resolve() for p in RULES.glob("*.y*ml")])
+
+def main(argv: list[str] | None = None, texts: Mapping[Path, str] | None = None) -> int:
+    args = parse_args(argv)
+    index = PolicyRocIndex(ROOT / args.index).load()
+
+    if args.policies_citing or args.rules_cited_by:
+        if not index.loaded:
+            print(f"policy/rule index not found or outdated: {args.index} (run without a query first)")
+            return 2
+        if args.policies_citing:
+            found = index.policies_citing(args.policies_citing)
+        else:
+            found = index.rules_cited_by(args.rules_cited_by)
+        for item in found:
+            print(item)
+        return 0 if found else 1
+
+    policy_docs = [p for p in walk_files(DOCS, "*.MD", texts) if "POLICY" in p.name]
+    if texts is None:
+        rule_files = sorted([p.resolve() for p in RULES.glob("*.y*ml")])
+    else:
+        rule_files = sorted([p.resolve() for p in texts if p.parent == RULES and fnmatch.fnmatchcase(p.name, "*.y*ml")])
 
     mappings: list[tuple[str, str]] = []
     policy_to_rules: dict[Path, set[Path]] = {p.resolve(): set() for p in policy_docs}
+    entries: dict[str, tuple[str, list[str]]] = {}
 
     for policy in policy_docs:
-        text = policy.read_text(encoding="utf-8")
-        for m in LINK_RE.finditer(text):
-            url = m.group("url")
-            rule_match = RULE_URL_RE.match(url)
-            if not rule_match:
-                continue
-            path_part = rule_match.group("path")
-            rule_path = (ROOT / path_part).resolve()
-            policy_to_rules[policy.resolve()].add(rule_path)
-            mappings.append((str(policy.relative_to(ROOT)), str(rule_path.relative_to(ROOT))))
-
-        for m in RULE_PATH_RE.finditer(text):
-            path_part = m.group("path")
-            rule_path = (ROOT / path_part).resolve()
-            policy_to_rules[policy.resolve()].add(rule_path)
-            mappings.append((str(policy.relative_to(ROOT)), str(rule_path.relative_to(ROOT))))
+        text = texts[policy] if texts is not None else policy.read_text(encoding="utf-8")
+        rel = str(policy.relative_to(ROOT))
+        blob = blob_id(text)
+        refs = index.refs(rel, blob)
+        if refs is None:
+            refs = extract_rule_refs(text)
+        entries[rel] = (blob, refs)
+        for ref in refs:
+            policy_to_rules[policy.resolve()].add(ROOT / ref)
+            mappings.append((rel, ref))
+
+    index.rebuild(entries, [str(r.relative_to(ROOT)) for r in rule_files])
+    index.save()
 
     referenced_rules = set()
     for rs in policy_to_rules.values():
@@ -1,13 +1,119 @@
 #!/usr/bin/env python3
 from __future__ import annotations
 
+import bisect
+import hashlib
 import json
+import mmap
 import re
 import subprocess
 import sys
 import xml.etree.ElementTree as ET
+from collections.abc import Iterable
 from pathlib import Path
 
+LIB_DIR = Path(__file__).resolve().parents[1] / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from content_cache import ContentCache  # noqa: E402
+
+# Files at least this large are searched as bytes through mmap instead of being decoded.
+LARGE_FILE_BYTES = 1 << 20
+# The line boundaries recognised by str.splitlines().
+LINE_BREAK_RE = re.compile(r"\r\n|[\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029]")
+# A deprecated package id on the same line as one of these is an install snippet.
+INSTALL_MARKERS = ("dotnet add package", "PackageReference")
+NAMESPACE_RE = re.compile(r"^\s*Namespace\s+([A-Za-z_][A-Za-z0-9_.]*)\s*$")
+BUILD_OUTPUT_DIRS = {"bin", "obj"}
+
+
+class NeedleSet:
+    """Fixed strings located with str.find, one C-level scan per needle; overlapping occurrences are all reported."""
+
+    def __init__(self, needles: Iterable[str]) -> None:
+        self.needles = tuple(dict.fromkeys(needle for needle in needles if needle))
+
+    def scan(self, text: str) -> list[tuple[int, str]]:
+        """`(start offset, needle)` for every hit, ordered by start offset."""
+        hits: list[tuple[int, str]] = []
+        for needle in self.needles:
+            start = text.find(needle)
+            while start >= 0:
+                hits.append((start, needle))
+                start = text.find(needle, start + 1)
+        hits.sort()
+        return hits
+
+
+class FileStore:
+    """Per-run file contents: every file is read at most once, line-offset tables are built on first use."""
+
+    def __init__(self) -> None:
+        self.texts: dict[Path, str] = {}
+        self.line_starts: dict[Path, list[int]] = {}
+        self.needle_hits: dict[Path, list[tuple[int, str]]] = {}
+        self.reads = 0
+
+    def text(self, path: Path) -> str:
+        text = self.texts.get(path)
+        if text is None:
+            text = self.texts[path] = path.read_text(encoding="utf-8", errors="ignore")
+            self.reads += 1
+        return text
+
+    def hits(self, path: Path, needle_set: NeedleSet) -> list[tuple[int, str]]:
+        """Every needle occurrence in `path`, searched once per file and run."""
+        found = self.needle_hits.get(path)
+        if found is None:
+            found = self.needle_hits[path] = needle_set.scan(self.text(path))
+        return found
+
+    def needles_in(self, path: Path, needle_set: NeedleSet) -> set[str]:
+        """Needles occurring in `path`; large files are probed as bytes through mmap instead of being decoded."""
+        if path not in self.texts and path.stat().st_size >= LARGE_FILE_BYTES:
+            with path.open("rb") as handle, mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                return {needle for needle in needle_set.needles if data.find(needle.encode("utf-8")) >= 0}
+        return {needle for _, needle in self.hits(path, needle_set)}
+
+    def line_of(self, path: Path, offset: int) -> int:
+        """1-based line number of a character offset, by bisection over the lazily built line-start table."""
+        starts = self.line_starts.get(path)
+        if starts is None:
+            starts = self.line_starts[path] = [0, *(m.end() for m in LINE_BREAK_RE.finditer(self.text(path)))]
+        return bisect.bisect_right(starts, offset)
+
+    def first_line(self, path: Path, needle: str) -> int:
+        """Line of the first occurrence of `needle`, or 1 when it does not occur."""
+        offset = self.text(path).find(needle)
+        return self.line_of(path, offset) if offset >= 0 else 1
+
+
+def declared_namespaces(data: bytes) -> list[tuple[int, str]]:
+    """`(line, namespace)` for every Namespace declaration, with a leading `Global.` removed."""
+    found: list[tuple[int, str]] = []
+    for idx, line in enumerate(data.decode("utf-8").splitlines(), start=1):
+        m = NAMESPACE_RE.match(line)
+        if m:
+            found.append((idx, re.sub(r"^Global\.", "", m.group(1))))
+    return found
+
+
+def decode_namespaces(value: object) -> list[tuple[int, str]]:
+    return [(int(line), str(ns)) for line, ns in value]
+
+
+def namespace_declarations(files: list[tuple[str, Path]], cache: ContentCache) -> dict[str, list[tuple[int, str]]]:
+    """Namespaces of every `(rel, path)`; only files missing from the cache are parsed."""
+    contents = {rel: path.read_bytes() for rel, path in files}
+    digests = {rel: hashlib.sha256(data).hexdigest() for rel, data in contents.items()}
+    result = {rel: cache.get(rel, digests[rel], decode_namespaces) for rel, _ in files}
+    for rel, found in result.items():
+        if found is None:
+            found = result[rel] = declared_namespaces(contents[rel])
+            cache.put(rel, digests[rel], [list(item) for item in found])
+    return result
+
 
 def main() -> int:
     if len(sys.argv) != 4:
@@ -19,7 +125,9 @@ def main() -> int:
     out_path = Path(sys.argv[3]).resolve()
     report_json_path = repo_root / "artifacts" / "naming_snt_report.json"
     report_tsv_path = repo_root / "artifacts" / "naming_snt_report.tsv"
+    namespace_cache_path = repo_root / "artifacts" / "cache" / "naming-snt" / "namespaces.json"
 
+    store = FileStore()
     violations: list[dict[str, str]] = []
     deprecated_hits: list[dict[str, str]] = []
     checked_paths: list[str] = []
@@ -38,13 +146,9 @@ def main() -> int:
 
     def file_line_hit(path: Path, needle: str) -> str:
         try:
-            lines = path.read_text(encoding="utf-8").splitlines()
-        except Exception:
+            return f"{rel(path)}:{store.first_line(path, needle)}"
+        except OSError:
             return f"{rel(path)}:1"
-        for idx, line in enumerate(lines, start=1):
-            if needle in line:
-                return f"{rel(path)}:{idx}"
-        return f"{rel(path)}:1"
 
     def normalize_repo_url(url: str) -> str:
         text = url.strip()
@@ -147,17 +251,20 @@ def main() -> int:
         if values.get("AssemblyName", "") != assembly_name:
             add_violation("vbproj.AssemblyName", assembly_name, values.get("AssemblyName", ""), file_line_hit(project_path, "<AssemblyName>"), "vbproj AssemblyName mismatch")
 
-    namespace_files = sorted((repo_root / "src" / "FileTypeDetection").rglob("*.vb"))
-    for vb in namespace_files:
-        checked_paths.append(rel(vb))
-        lines = vb.read_text(encoding="utf-8").splitlines()
-        for idx, line in enumerate(lines, start=1):
-            m = re.match(r"^\s*Namespace\s+([A-Za-z_][A-Za-z0-9_.]*)\s*$", line)
-            if not m:
-                continue
-            ns = re.sub(r"^Global\.", "", m.group(1))
+    source_dir = repo_root / "src" / "FileTypeDetection"
+    namespace_files = [
+        (rel(vb), vb)
+        for vb in sorted(source_dir.rglob("*.vb"))
+        if not BUILD_OUTPUT_DIRS.intersection(vb.relative_to(source_dir).parts[:-1])
+    ]
+    namespace_cache = ContentCache(namespace_cache_path, hashlib.sha256(Path(__file__).read_bytes()).hexdigest()).load()
+    namespaces = namespace_declarations(namespace_files, namespace_cache)
+    namespace_cache.save()
+    for rvb, _ in namespace_files:
+        checked_paths.append(rvb)
+        for idx, ns in namespaces[rvb]:
             if target_root_namespace and not ns.startswith(target_root_namespace):
-                add_violation("code.namespace.prefix", target_root_namespace + "*", ns, f"{rel(vb)}:{idx}", "Namespace must start with target_root_namespace")
+                add_violation("code.namespace.prefix", target_root_namespace + "*", ns, f"{rvb}:{idx}", "Namespace must start with target_root_namespace")
 
     scan_paths = [
         repo_root / "README.md",
@@ -175,6 +282,10 @@ def main() -> int:
             if marker in link:
                 docs_required.add(link.split(marker, 1)[1])
 
+    deprecated_ids: list[str] = []
+    if isinstance(deprecated_package_ids, list):
+        deprecated_ids = [dep for dep in deprecated_package_ids if isinstance(dep, str) and dep]
+    needle_set = NeedleSet([package_id, *deprecated_ids, *INSTALL_MARKERS])
     canonical_required_paths = set(docs_required) | {
         "samples/PortableConsumer/PortableConsumer.csproj",
         "tests/PackageBacked.Tests/PackageBacked.Tests.csproj",
@@ -188,8 +299,7 @@ def main() -> int:
                 continue
             rpath = rel(path)
             checked_paths.append(rpath)
-            text = path.read_text(encoding="utf-8", errors="ignore")
-            if package_id not in text and rpath in canonical_required_paths:
+            if rpath in canonical_required_paths and package_id and package_id not in store.needles_in(path, needle_set):
                 add_violation("canonical_reference", package_id, "missing", rpath, "Canonical package reference missing in required install/consumer file")
 
     install_targets = set(docs_required)
@@ -198,20 +308,14 @@ def main() -> int:
         path = repo_root / rpath
         if not path.exists():
             continue
-        text = path.read_text(encoding="utf-8", errors="ignore")
-        lines = text.splitlines()
-        for dep in deprecated_package_ids if isinstance(deprecated_package_ids, list) else []:
-            if not isinstance(dep, str) or not dep:
-                continue
-            in_install_snippet = False
-            for line in lines:
-                if dep in line and ("dotnet add package" in line or "PackageReference" in line):
-                    in_install_snippet = True
-                    break
-            if in_install_snippet:
+        hits = store.hits(path, needle_set)
+        marker_lines = {store.line_of(path, offset) for offset, needle in hits if needle in INSTALL_MARKERS}
+        for dep in deprecated_ids:
+            dep_lines = [store.line_of(path, offset) for offset, needle in hits if needle == dep]
+            if marker_lines.intersection(dep_lines):
                 hit = {
                     "id": dep,
-                    "evidence": file_line_hit(path, dep),
+                    "evidence": f"{rel(path)}:{dep_lines[0]}",
                 }
                 deprecated_hits.append(hit)
                 if rpath != migration_doc_rel:
@@ -183,11 +183,9 @@ run_preflight() {
   run_or_fail "CI-PREFLIGHT-001" "PR governance checks" bash "${ROOT_DIR}/tools/ci/check-pr-governance.sh"
   run_or_fail "CI-PREFLIGHT-001" "Code scanning tools open alerts must be zero" bash "${ROOT_DIR}/tools/ci/check-code-scanning-tools-zero.sh"
   run_or_fail "CI-CODEQL-001" "CodeQL default setup must be not-configured" bash "${ROOT_DIR}/tools/ci/check-codeql-default-setup.sh"
-  run_or_fail "CI-PREFLIGHT-001" "Doc consistency drift guard" python3 "${ROOT_DIR}/tools/check-doc-consistency.py"
-  run_or_fail "CI-PREFLIGHT-001" "Doc shell compatibility guard" python3 "${ROOT_DIR}/tools/check-doc-shell-compat.py"
+  run_or_fail "CI-PREFLIGHT-001" "Docs lint (drift guard, shell compatibility, Policy/RoC bijection)" python3 "${ROOT_DIR}/tools/check-docs-lint.py" --only drift --only shell --only roc --jobs 0 --shellcheck on --roc-out "${ROOT_DIR}/artifacts/policy_roc_matrix.tsv"
   run_or_fail "CI-PREFLIGHT-001" "PR scope guard" python3 "${ROOT_DIR}/tools/ci/check-pr-scope.py" --repo-root "${ROOT_DIR}" --manifest "${ROOT_DIR}/tools/ci/policies/data/pr_scope_allowlist.txt" --base-ref "${PR_SCOPE_BASE_REF:-origin/main}" --mode combined --out "${ROOT_DIR}/${OUT_DIR}/pr-scope-summary.json"
   run_or_fail "CI-PREFLIGHT-001" "Docs checker unit tests" python3 -m unittest discover -s "${ROOT_DIR}/tools/tests" -p "test_*.py" -v
-  run_or_fail "CI-PREFLIGHT-001" "Policy/RoC bijection" python3 "${ROOT_DIR}/tools/check-policy-roc.py" --out "${ROOT_DIR}/artifacts/policy_roc_matrix.tsv"
   run_or_fail "CI-PREFLIGHT-001" "VB Dim alignment check" python3 "${ROOT_DIR}/tools/ci/check-vb-dim-alignment.py" --root "${ROOT_DIR}/src/FileTypeDetection"
   run_or_fail "CI-PREFLIGHT-001" "Format check (style)" dotnet format "${ROOT_DIR}/FileClassifier.sln" style --verify-no-changes
   run_or_fail "CI-PREFLIGHT-001" "Format check (analyzers)" dotnet format "${ROOT_DIR}/FileClassifier.sln" analyzers --verify-no-changes
@@ -200,8 +198,7 @@ run_preflight() {
 }
 
 run_docs_links_full() {
-  run_or_fail "CI-DOCS-LINKS-001" "Doc consistency drift guard" python3 "${ROOT_DIR}/tools/check-doc-consistency.py"
-  run_or_fail "CI-DOCS-LINKS-001" "Full docs/link validation" python3 "${ROOT_DIR}/tools/check-docs.py"
+  run_or_fail "CI-DOCS-LINKS-001" "Doc drift guard and full docs/link validation" python3 "${ROOT_DIR}/tools/check-docs-lint.py" --only drift --only docs --latency-report "${ROOT_DIR}/${OUT_DIR}/latency.json"
   ci_result_append_summary "Docs links full validation completed."
 }
 
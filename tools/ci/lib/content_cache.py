@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import json
+import os
+from collections.abc import Callable
+from pathlib import Path
+from typing import TypeVar
+
+CACHE_SCHEMA_VERSION = 1
+
+T = TypeVar("T")
+
+
+def string_list(value: object) -> list[str]:
+    """Decoder for cached message lists."""
+    if not isinstance(value, list) or not all(isinstance(item, str) for item in value):
+        raise TypeError("expected a list of strings")
+    return list(value)
+
+
+class ContentCache:
+    """Per-file results keyed by content SHA-256, persisted as JSON between runs.
+
+    `version` identifies whatever produced the results (usually a digest of the checker and its rules); a cache
+    written under another version or schema is discarded as a whole.
+    """
+
+    def __init__(self, path: Path, version: str) -> None:
+        self.path = path
+        self.version = version
+        self.entries: dict[str, object] = {}
+        self.seen: dict[str, dict[str, object]] = {}
+
+    def load(self) -> ContentCache:
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return self
+        if not isinstance(data, dict):
+            return self
+        if data.get("schema_version") != CACHE_SCHEMA_VERSION or data.get("version") != self.version:
+            return self
+        files = data.get("files")
+        if isinstance(files, dict):
+            self.entries = files
+        return self
+
+    def get(self, rel: str, digest: str, decode: Callable[[object], T]) -> T | None:
+        """Cached result for `rel` if its content still hashes to `digest` and `decode` accepts it."""
+        entry = self.entries.get(rel)
+        if not isinstance(entry, dict) or entry.get("sha256") != digest:
+            return None
+        try:
+            found = decode(entry.get("value"))
+        except (KeyError, TypeError, ValueError):
+            return None
+        self.seen[rel] = entry
+        return found
+
+    def put(self, rel: str, digest: str, value: object) -> None:
+        self.seen[rel] = {"sha256": digest, "value": value}
+
+    def save(self) -> None:
+        """Persist the files seen this run, dropping entries for files that no longer exist."""
+        payload = {"schema_version": CACHE_SCHEMA_VERSION, "version": self.version, "files": self.seen}
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f"{self.path.name}.tmp")
+        tmp.write_text(json.dumps(payload, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import bisect
+import fnmatch
+import os
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+WALK_EXCLUDED_DIRS = {".git"}
+
+
+class FileStore(Mapping[Path, str]):
+    """Snapshot of the repository taken with one walk; each file is read at most once, on first access."""
+
+    def __init__(self, root: Path) -> None:
+        self.root = root
+        self.reads = 0
+        self._texts: dict[Path, str] = {}
+        paths: list[Path] = []
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames[:] = [d for d in dirnames if d not in WALK_EXCLUDED_DIRS]
+            base = Path(dirpath)
+            paths.extend(base / name for name in filenames)
+        self._paths = sorted(paths)
+        self._members = set(self._paths)
+
+    def __getitem__(self, path: Path) -> str:
+        text = self._texts.get(path)
+        if text is None:
+            if path not in self._members:
+                raise KeyError(path)
+            text = path.read_text(encoding="utf-8")
+            self._texts[path] = text
+            self.reads += 1
+        return text
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._members
+
+    def __iter__(self) -> Iterator[Path]:
+        return iter(self._paths)
+
+    def __len__(self) -> int:
+        return len(self._paths)
+
+    def refresh(self, path: Path) -> None:
+        """Drop the cached contents of `path` and add or remove it to match the disk."""
+        self._texts.pop(path, None)
+        exists = path.is_file()
+        if exists and path not in self._members:
+            bisect.insort(self._paths, path)
+            self._members.add(path)
+        elif not exists and path in self._members:
+            self._paths.remove(path)
+            self._members.discard(path)
+
+
+def walk_files(base: Path, pattern: str, texts: Mapping[Path, str] | None = None) -> list[Path]:
+    """Files below `base` matching `pattern`; `texts` is a `FileStore` snapshot when given."""
+    if texts is None:
+        return sorted(p for p in base.rglob(pattern) if p.is_file())
+    return [p for p in texts if p.is_relative_to(base) and fnmatch.fnmatchcase(p.name, pattern)]
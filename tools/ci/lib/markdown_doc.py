@@ -0,0 +1,148 @@
+from __future__ import annotations
+
+import bisect
+import re
+from dataclasses import dataclass
+from itertools import accumulate
+from pathlib import Path
+
+LINK_RE = re.compile(r'(?<!\!)\[(?P<text>[^\]]+)\]\((?P<url>[^)\s]+)(?:\s+"[^"]*")?\)')
+RELATIVE_RE = re.compile(
+    r'\]\(\s*(?!https?://|mailto:|#)(?:\.{1,2}/|/|docs/|src/|tests/|tools/|README\.md|[^)]+\.md(?:#[^)]+)?)(?:\s+"[^"]*")?\s*\)'
+)
+PLAIN_URL_RE = re.compile(r'(?P<url>https?://[^\s<>"\)\]]+)')
+LANG_SWITCH_BLOCK_RE = re.compile(
+    r"<!-- LANG_SWITCH:BEGIN -->\r?\n.*?\r?\n<!-- LANG_SWITCH:END -->",
+    re.DOTALL,
+)
+FENCE_RE = re.compile(r"^[ \t]*(?P<marker>`{3,}|~{3,})[ \t]*(?P<info>[^`\s]*)[^`]*$")
+HEADING_RE = re.compile(r"^ {0,3}(?P<hashes>#{1,6})[ \t]+(?P<text>.*?)(?:[ \t]+#+)?[ \t]*$")
+
+
+@dataclass(frozen=True)
+class FenceBlock:
+    info: str
+    start_line: int
+    end_line: int
+    start: int
+    end: int
+
+
+@dataclass(frozen=True)
+class Heading:
+    level: int
+    text: str
+    line: int
+
+
+@dataclass(frozen=True)
+class LinkToken:
+    kind: str
+    text: str
+    url: str
+    line: int
+    column: int
+
+
+@dataclass
+class MarkdownDocument:
+    """Single parsed view of a markdown file, shared by every check that reads it."""
+
+    path: Path
+    root: Path | None
+    text: str
+    line_starts: list[int]
+    fences: list[FenceBlock]
+    headings: list[Heading]
+    links: list[LinkToken]
+    plain_urls: list[LinkToken]
+    lang_switch_spans: list[tuple[int, int]]
+    relative_link_line: int | None
+
+    @property
+    def rel(self) -> Path:
+        return self.path if self.root is None else self.path.relative_to(self.root)
+
+    def location(self, line: int | None = None) -> str:
+        return f"{self.rel}:{line}" if line else str(self.rel)
+
+    def has_fence(self, info: str) -> bool:
+        return any(fence.info == info for fence in self.fences)
+
+
+def line_at(line_starts: list[int], offset: int) -> tuple[int, int]:
+    """Map a character offset to a 1-based `(line, column)` pair."""
+    index = bisect.bisect_right(line_starts, offset) - 1
+    return index + 1, offset - line_starts[index] + 1
+
+
+def parse_markdown(path: Path, text: str | None = None, root: Path | None = None) -> MarkdownDocument:
+    """Parse `path` (or `text` for it); `root` is what `rel` and `location` are relative to."""
+    if text is None:
+        text = path.read_text(encoding="utf-8")
+    # Offsets follow the same boundaries as splitlines(), which also breaks on \r, \f, \v, \x85 and U+2028.
+    lines = text.splitlines()
+    line_starts = [0, *accumulate(len(line) for line in text.splitlines(keepends=True))]
+
+    lang_spans = [m.span() for m in LANG_SWITCH_BLOCK_RE.finditer(text)]
+    lang_starts = [start for start, _ in lang_spans]
+
+    def outside_lang_switch(offset: int) -> bool:
+        index = bisect.bisect_right(lang_starts, offset) - 1
+        return index < 0 or offset >= lang_spans[index][1]
+
+    fences: list[FenceBlock] = []
+    headings: list[Heading] = []
+    open_fence: tuple[str, str, int, int] | None = None
+    for index, line in enumerate(lines):
+        line_no = index + 1
+        fence = FENCE_RE.match(line)
+        if open_fence is None:
+            if fence:
+                open_fence = (fence.group("marker"), fence.group("info").lower(), line_no, line_starts[index])
+                continue
+            heading = HEADING_RE.match(line)
+            if heading:
+                headings.append(Heading(len(heading.group("hashes")), heading.group("text").strip(), line_no))
+            continue
+        marker, info, start_line, start = open_fence
+        if fence and not fence.group("info") and fence.group("marker")[0] == marker[0] and len(fence.group("marker")) >= len(marker):
+            end = line_starts[index + 1]
+            fences.append(FenceBlock(info, start_line, line_no, start, end))
+            open_fence = None
+    if open_fence is not None:
+        marker, info, start_line, start = open_fence
+        fences.append(FenceBlock(info, start_line, len(lines), start, len(text)))
+
+    links: list[LinkToken] = []
+    for m in LINK_RE.finditer(text):
+        if not outside_lang_switch(m.start()):
+            continue
+        line, column = line_at(line_starts, m.start())
+        links.append(LinkToken("link", m.group("text").strip(), m.group("url").strip(), line, column))
+
+    plain_urls: list[LinkToken] = []
+    for m in PLAIN_URL_RE.finditer(text):
+        if not outside_lang_switch(m.start()):
+            continue
+        line, column = line_at(line_starts, m.start())
+        plain_urls.append(LinkToken("plain", "", m.group("url"), line, column))
+
+    relative_link_line: int | None = None
+    for m in RELATIVE_RE.finditer(text):
+        if outside_lang_switch(m.start()):
+            relative_link_line = line_at(line_starts, m.start())[0]
+            break
+
+    return MarkdownDocument(
+        path=path,
+        root=root,
+        text=text,
+        line_starts=line_starts,
+        fences=fences,
+        headings=headings,
+        links=links,
+        plain_urls=plain_urls,
+        lang_switch_spans=lang_spans,
+        relative_link_line=relative_link_line,
+    )
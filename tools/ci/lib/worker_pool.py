@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+import importlib.util
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from types import ModuleType
+
+
+def load_script(name: str, path: str) -> None:
+    """Pool initializer: import the script at `path` as module `name` unless this process already has it."""
+    if name in sys.modules or name == "__main__":
+        return
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module from {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+
+
+def script_pool(module: ModuleType, jobs: int) -> ProcessPoolExecutor:
+    """Process pool for functions of a script loaded by file path.
+
+    Such scripts are registered under names that are not importable, so spawn and forkserver workers could not
+    unpickle references to their functions; every worker loads the script by path before taking work.
+    """
+    return ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=load_script,
+        initargs=(module.__name__, str(module.__file__)),
+    )
@@ -7,18 +7,28 @@ import argparse
 import json
 import os
 import re
+import shutil
+import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
+LIB_DIR = Path(__file__).resolve().parents[1] / "ci" / "lib"
+if str(LIB_DIR) not in sys.path:
+    sys.path.insert(0, str(LIB_DIR))
+
+from worker_pool import script_pool  # noqa: E402
 
 LANG_BEGIN = "<!-- LANG_SWITCH:BEGIN -->"
 LANG_END = "<!-- LANG_SWITCH:END -->"
 HEADER_PATTERN = re.compile(
-    r"(?ms)^<!-- LANG_SWITCH:BEGIN -->\r?\n.*?\r?\n<!-- LANG_SWITCH:END -->\r?\n?"
+    r"(?s)\A<!-- LANG_SWITCH:BEGIN -->\r?\n.*?\r?\n<!-- LANG_SWITCH:END -->\r?\n?"
 )
 PREFIX_PATTERN = re.compile(r"^(?P<prefix>[01])(?P<nn>\d{2})_(?P<rest>.+)$")
 SUFFIX_LANG_PATTERN = re.compile(r"_(?P<lang>DE|EN)\.md$", re.IGNORECASE)
+# Large enough for any LANG_SWITCH block; --check only reads past this when the header is missing or malformed.
+CHECK_PREFIX_BYTES = 4096
+JOURNAL_NAME = ".lang_switch_journal.json"
 
 
 @dataclass(frozen=True)
@@ -31,6 +41,7 @@ class FileRecord:
 class Resolution:
     current: FileRecord
     counterpart: Path
+    counterpart_rel: str
     source: str
     status: str
     needs_map: bool
@@ -39,7 +50,7 @@ class Resolution:
     en_target: Path
 
 
-def parse_args() -> argparse.Namespace:
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
     parser = argparse.ArgumentParser(
         description="Add/update language switch headers for docs markdown files."
     )
@@ -63,7 +74,18 @@ def parse_args() -> argparse.Namespace:
         action="store_true",
         help="Always rewrite reports even when no markdown header changed.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only verify headers and lang_map.json without writing; exit 1 on drift.",
+    )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Compute updated files in N worker processes (0 = one per CPU; default: 1).",
+    )
+    return parser.parse_args(argv)
 
 
 def to_rel(repo_root: Path, path: Path) -> str:
@@ -73,24 +95,68 @@ def to_rel(repo_root: Path, path: Path) -> str:
         return os.path.relpath(path, repo_root).replace(os.sep, "/")
 
 
+class PathIndex:
+    """Relative paths of every file in the docs tree and the repository root, from one os.scandir walk.
+
+    Counterpart lookups become set membership tests; paths outside the indexed area fall back to a stat.
+    """
+
+    def __init__(self, repo_root: Path, docs_dir: Path) -> None:
+        self.repo_root = repo_root
+        self.docs_rel = to_rel(repo_root, docs_dir)
+        self.files: Set[str] = set()
+        self.root_files: List[str] = []
+        with os.scandir(repo_root) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    self.root_files.append(entry.name)
+                    self.files.add(entry.name)
+        self.docs_files = self._walk(docs_dir, self.docs_rel)
+
+    def _walk(self, directory: Path, rel_dir: str) -> List[str]:
+        found: List[str] = []
+        pending = [(os.fspath(directory), rel_dir)]
+        while pending:
+            current, current_rel = pending.pop()
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    rel = f"{current_rel}/{entry.name}"
+                    if entry.is_dir():
+                        pending.append((entry.path, rel))
+                    elif entry.is_file():
+                        found.append(rel)
+        self.files.update(found)
+        return found
+
+    def covers(self, rel_path: str) -> bool:
+        return "/" not in rel_path or rel_path.startswith(f"{self.docs_rel}/")
+
+    def is_file(self, path: Path, rel_path: str) -> bool:
+        if self.covers(rel_path):
+            return rel_path in self.files
+        return path.is_file()
+
+
 def collect_markdown_files(
     repo_root: Path,
     docs_dir: Path,
     include_readme: bool,
+    index: Optional[PathIndex] = None,
 ) -> List[FileRecord]:
+    if index is None:
+        index = PathIndex(repo_root, docs_dir)
     records: List[FileRecord] = []
 
-    for path in docs_dir.rglob("*"):
-        if not path.is_file() or path.suffix.lower() != ".md":
-            continue
-        if path.name == "lang_switch_report.md":
+    for rel_path in index.docs_files:
+        name = rel_path.rsplit("/", 1)[-1]
+        if not name.lower().endswith(".md") or name == "lang_switch_report.md":
             continue
-        records.append(FileRecord(path=path, rel_path=to_rel(repo_root, path)))
+        records.append(FileRecord(path=repo_root / rel_path, rel_path=rel_path))
 
     if include_readme:
-        for path in repo_root.glob("README*.md"):
-            if path.is_file():
-                records.append(FileRecord(path=path, rel_path=to_rel(repo_root, path)))
+        for name in index.root_files:
+            if name.startswith("README") and name.endswith(".md"):
+                records.append(FileRecord(path=repo_root / name, rel_path=name))
 
     return sorted(records, key=lambda item: item.rel_path)
 
@@ -137,7 +203,7 @@ def map_counterpart(
     mapped = lang_map.get(rel_path)
     if not mapped:
         return None
-    mapped_path = (repo_root / mapped).resolve()
+    mapped_path = Path(os.path.normpath(repo_root / mapped))
     return mapped_path
 
 
@@ -160,6 +226,7 @@ def resolve_file(
     repo_root: Path,
     record: FileRecord,
     lang_map: Dict[str, str],
+    index: Optional[PathIndex] = None,
 ) -> Resolution:
     schema_target = schema_counterpart(record.path)
     source = "schema"
@@ -167,16 +234,22 @@ def resolve_file(
 
     if schema_target is not None:
         counterpart = schema_target
+        counterpart_rel = f"{record.rel_path[:-len(record.path.name)]}{schema_target.name}"
     else:
         source = "map"
         mapped = map_counterpart(repo_root, record.rel_path, lang_map)
         if mapped is None:
             needs_map = True
             counterpart = record.path
+            counterpart_rel = record.rel_path
         else:
             counterpart = mapped
+            counterpart_rel = to_rel(repo_root, mapped)
 
-    counterpart_exists = counterpart.exists() and counterpart.is_file()
+    if index is None:
+        counterpart_exists = counterpart.is_file()
+    else:
+        counterpart_exists = index.is_file(counterpart, counterpart_rel)
     status = "ok"
     if needs_map:
         status = "needs_map"
@@ -195,6 +268,7 @@ def resolve_file(
     return Resolution(
         current=record,
         counterpart=counterpart,
+        counterpart_rel=counterpart_rel,
         source=source,
         status=status,
         needs_map=needs_map,
@@ -204,6 +278,15 @@ def resolve_file(
     )
 
 
+def resolve_all(
+    repo_root: Path,
+    files: List[FileRecord],
+    lang_map: Dict[str, str],
+    index: PathIndex,
+) -> List[Resolution]:
+    return [resolve_file(repo_root=repo_root, record=record, lang_map=lang_map, index=index) for record in files]
+
+
 def make_relative_link(from_file: Path, to_file: Path) -> str:
     rel = os.path.relpath(to_file, from_file.parent)
     return rel.replace(os.sep, "/")
@@ -234,6 +317,130 @@ def normalize_with_header(path: Path, de_target: Path, en_target: Path) -> Tuple
     return updated, updated != original
 
 
+def header_in_sync(path: Path, de_target: Path, en_target: Path) -> Tuple[bool, bool]:
+    """Return (in_sync, full_read) for the header `normalize_with_header` would produce.
+
+    Only the first CHECK_PREFIX_BYTES are read while the file starts with a complete LANG_SWITCH block;
+    a missing or malformed header falls back to a full read and normalization.
+    """
+    with path.open("rb") as handle:
+        prefix = handle.read(CHECK_PREFIX_BYTES)
+        at_eof = not handle.read(1)
+
+    begin = LANG_BEGIN.encode("ascii")
+    end = LANG_END.encode("ascii")
+    if not prefix.startswith(begin) or prefix.find(end, len(begin)) < 0:
+        _, changed = normalize_with_header(path, de_target, en_target)
+        return not changed, True
+
+    # Same universal-newline view as read_text(), so the expected header always uses "\n".
+    prefix = prefix.replace(b"\r\n", b"\n").replace(b"\r", b"\n")
+    header = build_header(path, de_target, en_target, "\n").encode("utf-8")
+    head = header + b"\n\n"
+    if prefix.startswith(head) and len(prefix) > len(head):
+        return prefix[len(head):len(head) + 1] != b"\n", False
+    return at_eof and prefix == header + b"\n", False
+
+
+def updated_content(resolution: Resolution) -> Optional[str]:
+    updated, changed = normalize_with_header(
+        path=resolution.current.path,
+        de_target=resolution.de_target,
+        en_target=resolution.en_target,
+    )
+    return updated if changed else None
+
+
+def compute_updates(resolutions: List[Resolution], jobs: int = 1) -> List[Tuple[FileRecord, str]]:
+    """New contents of every file whose header changes, in resolution order."""
+    if jobs <= 1 or len(resolutions) < 2:
+        contents = list(map(updated_content, resolutions))
+    else:
+        chunksize = max(1, len(resolutions) // (jobs * 4))
+        with script_pool(sys.modules[__name__], jobs) as pool:
+            contents = list(pool.map(updated_content, resolutions, chunksize=chunksize))
+    return [(item.current, updated) for item, updated in zip(resolutions, contents) if updated is not None]
+
+
+def staging_paths(path: Path) -> Tuple[Path, Path]:
+    return path.with_name(f".{path.name}.lang-switch.tmp"), path.with_name(f".{path.name}.lang-switch.bak")
+
+
+def rollback_journal(journal_path: Path) -> List[str]:
+    """Restore every file listed in an interrupted batch's journal; returns the restored paths.
+
+    Without a journal there is nothing to undo: backups left behind then belong to a committed batch.
+    """
+    if not journal_path.exists():
+        return []
+    entries = json.loads(journal_path.read_text(encoding="utf-8"))
+    restored: List[str] = []
+    for entry in entries:
+        target = Path(entry)
+        tmp_path, backup_path = staging_paths(target)
+        if backup_path.exists():
+            # A hard-linked backup of a file that was never replaced is the file itself; rename() would be a no-op.
+            if target.exists() and os.path.samefile(backup_path, target):
+                backup_path.unlink()
+            else:
+                os.replace(backup_path, target)
+            restored.append(entry)
+        if tmp_path.exists():
+            tmp_path.unlink()
+    journal_path.unlink()
+    return restored
+
+
+def apply_batch(updates: List[Tuple[FileRecord, str]], journal_path: Path) -> int:
+    """Write all updates or none: stage temp files and backups, then os.replace each file into place.
+
+    The journal lists every target before anything is staged, so a failed or interrupted batch is undone
+    by `rollback_journal` (immediately, or at the start of the next run). Removing the journal commits the
+    batch; backups are deleted only afterwards. Returns the bytes written.
+    """
+    if not updates:
+        return 0
+    journal_path.write_text(
+        json.dumps([str(record.path) for record, _ in updates], indent=2, ensure_ascii=True) + "\n",
+        encoding="utf-8",
+    )
+    written = 0
+    try:
+        for record, updated in updates:
+            tmp_path, backup_path = staging_paths(record.path)
+            tmp_path.write_text(updated, encoding="utf-8")
+            shutil.copymode(record.path, tmp_path)
+            written += tmp_path.stat().st_size
+            try:
+                os.link(record.path, backup_path)
+            except OSError:
+                shutil.copy2(record.path, backup_path)
+        for record, _ in updates:
+            os.replace(staging_paths(record.path)[0], record.path)
+    except BaseException:
+        rollback_journal(journal_path)
+        raise
+
+    journal_path.unlink()
+    for record, _ in updates:
+        staging_paths(record.path)[1].unlink(missing_ok=True)
+    return written
+
+
+def discard_orphaned_backups(index: PathIndex) -> List[str]:
+    """Delete staging leftovers of committed batches; only valid once no journal remains."""
+    orphans = [
+        rel
+        for rel in index.files
+        if Path(rel).name.startswith(".")
+        and (rel.endswith(".lang-switch.bak") or rel.endswith(".lang-switch.tmp"))
+    ]
+    for rel in orphans:
+        (index.repo_root / rel).unlink(missing_ok=True)
+        index.files.discard(rel)
+    return sorted(orphans)
+
+
 def write_lang_map_if_needed(
     lang_map_path: Path,
     lang_map: Dict[str, str],
@@ -266,7 +473,7 @@ def report_payload(repo_root: Path, resolutions: List[Resolution], changed_files
         records.append(
             {
                 "file": item.current.rel_path,
-                "counterpart": to_rel(repo_root, item.counterpart),
+                "counterpart": item.counterpart_rel,
                 "source": item.source,
                 "status": item.status,
                 "counterpart_exists": item.counterpart_exists,
@@ -338,8 +545,32 @@ def write_reports(
     )
 
 
-def main() -> int:
-    args = parse_args()
+def check_headers(resolutions: List[Resolution], lang_map: Dict[str, str]) -> int:
+    drifted: List[str] = []
+    full_reads = 0
+    for resolution in resolutions:
+        record = resolution.current
+        if resolution.needs_map and record.rel_path not in lang_map:
+            drifted.append(f"{record.rel_path}: missing lang_map.json entry")
+        in_sync, full_read = header_in_sync(record.path, resolution.de_target, resolution.en_target)
+        full_reads += int(full_read)
+        if not in_sync:
+            drifted.append(f"{record.rel_path}: language switch header out of date")
+
+    for message in drifted:
+        print(message, file=sys.stderr)
+    print(
+        json.dumps(
+            {"total_files": len(resolutions), "drifted": len(drifted), "full_reads": full_reads},
+            ensure_ascii=True,
+        )
+    )
+    return 1 if drifted else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_args(argv)
+    jobs = args.jobs if args.jobs > 0 else os.cpu_count() or 1
     repo_root = Path(args.repo_root).resolve()
     docs_dir = (repo_root / args.docs_dir).resolve()
     lang_map_path = (docs_dir / "lang_map.json").resolve()
@@ -349,35 +580,34 @@ def main() -> int:
     if not docs_dir.exists() or not docs_dir.is_dir():
         raise SystemExit(f"Documentation directory not found: {docs_dir}")
 
+    journal_path = docs_dir / JOURNAL_NAME
+    if not args.check:
+        restored = rollback_journal(journal_path)
+        if restored:
+            print(f"Rolled back {len(restored)} file(s) from an interrupted batch.", file=sys.stderr)
+
+    index = PathIndex(repo_root, docs_dir)
+    if not args.check:
+        discard_orphaned_backups(index)
     files = collect_markdown_files(
-        repo_root=repo_root, docs_dir=docs_dir, include_readme=args.include_readme
+        repo_root=repo_root, docs_dir=docs_dir, include_readme=args.include_readme, index=index
     )
     lang_map = load_lang_map(lang_map_path)
+    resolutions = resolve_all(repo_root=repo_root, files=files, lang_map=lang_map, index=index)
+    if args.check:
+        return check_headers(resolutions=resolutions, lang_map=lang_map)
 
-    resolutions: List[Resolution] = []
-    changed_files: List[str] = []
-    missing_map_keys: List[str] = []
-
-    for record in files:
-        resolution = resolve_file(repo_root=repo_root, record=record, lang_map=lang_map)
-        resolutions.append(resolution)
-
-        if resolution.needs_map:
-            missing_map_keys.append(record.rel_path)
-
-        updated, changed = normalize_with_header(
-            path=record.path,
-            de_target=resolution.de_target,
-            en_target=resolution.en_target,
-        )
-        if changed:
-            record.path.write_text(updated, encoding="utf-8")
-            changed_files.append(record.rel_path)
+    missing_map_keys = [item.current.rel_path for item in resolutions if item.needs_map]
+    updates = compute_updates(resolutions, jobs)
+    bytes_written = apply_batch(updates, journal_path)
+    changed_files = [record.rel_path for record, _ in updates]
 
     map_changed = write_lang_map_if_needed(lang_map_path, lang_map, sorted(set(missing_map_keys)))
     payload = report_payload(repo_root=repo_root, resolutions=resolutions, changed_files=changed_files)
 
-    report_exists = report_md_path.exists() and report_json_path.exists()
+    report_exists = index.is_file(report_md_path, to_rel(repo_root, report_md_path)) and index.is_file(
+        report_json_path, to_rel(repo_root, report_json_path)
+    )
     should_write_report = (
         bool(changed_files)
         or map_changed
@@ -398,6 +628,7 @@ def main() -> int:
             {
                 "total_files": len(files),
                 "changed_files": len(changed_files),
+                "bytes_written": bytes_written,
                 "missing_counterpart": payload["summary"]["missing_counterpart"],
                 "needs_map": payload["summary"]["needs_map"],
                 "report_written": should_write_report,
@@ -0,0 +1,288 @@
+from __future__ import annotations
+
+import importlib.util
+import multiprocessing
+import re
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CHECK_PATH = REPO_ROOT / "tools" / "check-doc-consistency.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("check_doc_consistency_module", CHECK_PATH)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module from {CHECK_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+check_consistency = _load_module()
+
+SAMPLE = (
+    "# Demo\r\n"
+    "See docs/01_FUNCTIONS.md and 02_architecture_and_flows.MD.\n"
+    "\n"
+    "Legacy: docs/04_DIN_SPECIFICATION_DE.md\x0cnext docs/guides/README.md\n"
+    "Unrelated 001_FUNCTIONS.mdx and OPTIONS_CHANGE_GUIDE.md\n"
+)
+
+
+RULES_YAML = """rules_schema_version: 1
+rules:
+  - rule_id: CI-DOCS-002
+    policy_type: docs_drift
+    severity: fail
+    title: Docs must not reference legacy document paths
+    description: docs must only reference canonical SSOT document paths
+    applies_to:
+      - preflight
+    params:
+      docs_paths:
+        - docs
+        - README.md
+      allowed_paths:
+        - docs/001_HISTORY.MD
+      forbidden_patterns:
+        - '(?i)\\b(?:docs/)?01_FUNCTIONS\\.md\\b'
+"""
+
+
+def _per_line_hits(matcher, text: str) -> list[tuple[int, str]]:
+    return [
+        (line_no, rule.pattern.pattern)
+        for line_no, line in enumerate(text.splitlines(), start=1)
+        for rule in matcher.rules
+        if rule.pattern.search(line)
+    ]
+
+
+class RuleMatcherTests(unittest.TestCase):
+    def test_prefiltered_scan_reports_every_rule_hit_per_line(self) -> None:
+        matcher = check_consistency.load_matcher(cache_path=None)
+        hits = [(line_no, rule.pattern.pattern) for line_no, _, rule in matcher.hits(SAMPLE)]
+        self.assertEqual(_per_line_hits(matcher, SAMPLE), hits)
+        self.assertIn((4, r"(?i)\bdocs/04_[A-Z0-9_]+\.md\b"), hits)
+        self.assertIn((4, r"(?i)\b(?:docs/)?04_DIN_SPECIFICATION_DE\.md\b"), hits)
+        self.assertIn((5, r"(?i)\b(?:docs/)?guides/README\.md\b"), hits)
+
+    def test_flags_stay_scoped_to_their_rule(self) -> None:
+        rules = (
+            check_consistency.DriftRule("X-1", re.compile(r"(?i)\blegacy\.md\b"), "a"),
+            check_consistency.DriftRule("X-2", re.compile(r"\bLEGACY\.MD\b"), "b"),
+        )
+        matcher = check_consistency.compile_rules(rules)
+        hits = [(line_no, rule.rule_id) for line_no, _, rule in matcher.hits("legacy.md\nLEGACY.MD\n")]
+        self.assertEqual([(1, "X-1"), (2, "X-1"), (2, "X-2")], hits)
+        hits = [(line_no, rule.rule_id) for line_no, _, rule in matcher.hits("Legacy.Md\nLEGACY.MDX\n")]
+        self.assertEqual([(1, "X-1")], hits)
+        dotless_rule = check_consistency.DriftRule("X-3", re.compile(r"(?i)index\.md"), "c")
+        dotless = check_consistency.compile_rules((dotless_rule,))
+        self.assertEqual([1], [line_no for line_no, _, _ in dotless.hits("\u0131ndex.md\n")])
+
+    def test_rules_match_within_single_lines(self) -> None:
+        rules = (
+            check_consistency.DriftRule("X-1", re.compile(r"^legacy\.md$"), "a"),
+            check_consistency.DriftRule("X-2", re.compile(r"foo\s+bar"), "b"),
+            check_consistency.DriftRule("X-3", re.compile(r"bar"), "c"),
+        )
+        matcher = check_consistency.compile_rules(rules)
+        text = "intro\nlegacy.md\nx foo\nbar baz\n"
+        self.assertEqual(
+            [(2, "X-1"), (4, "X-3")],
+            [(line_no, rule.rule_id) for line_no, _, rule in matcher.hits(text)],
+        )
+
+    def test_required_literal_is_contained_in_every_match(self) -> None:
+        cases = {
+            r"\brequired_artifacts\b": "required_artifacts",
+            r"(?i)\b(?:docs/)?01_FUNCTIONS\.md\b": "01_functions.md",
+            r"(?i)\bdocs/04_[A-Z0-9_]+\.md\b": "docs/04_",
+            r"^legacy\.md$": "legacy.md",
+            r"ab?cd": "cd",
+            r"x[]a]yz+": "yz",
+            r"old|new": "",
+            r"(?x)legacy \. md": "",
+        }
+        for pattern, literal in cases.items():
+            self.assertEqual(literal, check_consistency.required_literal(re.compile(pattern)), pattern)
+
+
+class PolicyYamlTests(unittest.TestCase):
+    def test_reads_the_block_subset_of_the_rule_files(self) -> None:
+        text = (
+            "# comment\n"
+            "rules_schema_version: 1\n"
+            "rules:\n"
+            "- rule_id: CI-DOCS-009  # trailing comment\n"
+            "  params:\n"
+            "    forbidden_patterns:\n"
+            "      - '(?i)\\bit''s:\\.md\\b'\n"
+            "      - plain # comment\n"
+            "    allowed_paths:\n"
+            "    - docs/001_HISTORY.MD\n"
+        )
+        self.assertEqual(
+            {
+                "rules_schema_version": 1,
+                "rules": [
+                    {
+                        "rule_id": "CI-DOCS-009",
+                        "params": {
+                            "forbidden_patterns": ["(?i)\\bit's:\\.md\\b", "plain"],
+                            "allowed_paths": ["docs/001_HISTORY.MD"],
+                        },
+                    }
+                ],
+            },
+            check_consistency.parse_policy_yaml(text),
+        )
+
+    def test_rejects_constructs_outside_the_subset(self) -> None:
+        rejected = {
+            "flow mapping": "a: {b: 1}\n",
+            "flow sequence": "a: [x, y]\n",
+            "anchor": "a: &anchor x\n",
+            "alias": "a: *anchor\n",
+            "tag": "a: !!str x\n",
+            "block scalar": "a: |\n  text\n",
+            "double-quoted scalar": 'a: "x"\n',
+            "unterminated quote": "a: 'open\n",
+            "misaligned item": "a:\n  - x\n   - y\n",
+            "tab indentation": "a:\n\t- x\n",
+            "missing value": "a:\nb: 1\n",
+            "document marker": "---\na: 1\n",
+            "empty file": "# only a comment\n",
+        }
+        for name, text in rejected.items():
+            with self.assertRaises(ValueError, msg=name):
+                check_consistency.parse_policy_yaml(text)
+
+
+class DriftRuleLoadingTests(unittest.TestCase):
+    def test_rules_follow_policy_docs_paths_and_allowed_paths(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            rules_path = Path(tmp) / "docs_drift.yaml"
+            rules_path.write_text(RULES_YAML, encoding="utf-8")
+            matcher = check_consistency.load_matcher(rules_path, cache_path=None, hints_path=None)
+
+        text = "See docs/01_FUNCTIONS.md\n"
+        root = check_consistency.ROOT
+        self.assertEqual(
+            [
+                "docs/010_API_CORE.MD:1 [CI-DOCS-002] See docs/01_FUNCTIONS.md "
+                "-> Docs must not reference legacy document paths"
+            ],
+            check_consistency.check_text(root / "docs" / "010_API_CORE.MD", text, matcher),
+        )
+        self.assertEqual([], check_consistency.check_text(root / "docs" / "001_HISTORY.MD", text, matcher))
+        self.assertEqual([], check_consistency.check_text(root / "src" / "README.md", text, matcher))
+
+    def test_hints_restore_legacy_ids_and_replacement_paths(self) -> None:
+        matcher = check_consistency.load_matcher(cache_path=None)
+        self.assertEqual(
+            ["docs/010_API_CORE.MD:1 [DOC-CONSISTENCY-001] See docs/01_FUNCTIONS.md -> Use docs/010_API_CORE.MD"],
+            check_consistency.check_text(
+                check_consistency.ROOT / "docs" / "010_API_CORE.MD", "See docs/01_FUNCTIONS.md\n", matcher
+            ),
+        )
+        with tempfile.TemporaryDirectory() as tmp:
+            rules_path = Path(tmp) / "docs_drift.yaml"
+            rules_path.write_text(RULES_YAML.replace("01_FUNCTIONS", "05_FUNCTIONS"), encoding="utf-8")
+            with self.assertRaisesRegex(ValueError, "no forbidden pattern requires: 01_functions"):
+                check_consistency.load_matcher(rules_path, cache_path=None)
+
+    def test_cache_skips_rule_parsing_until_rule_file_changes(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            rules_path = Path(tmp) / "docs_drift.yaml"
+            cache_path = Path(tmp) / "cache" / "drift-rules.json"
+            rules_path.write_text(RULES_YAML, encoding="utf-8")
+            check_consistency.load_matcher(rules_path, cache_path, hints_path=None)
+            self.assertTrue(cache_path.exists())
+
+            parse = check_consistency.parse_policy_yaml
+            with patch.object(check_consistency, "parse_policy_yaml", wraps=parse) as parsed:
+                cached = check_consistency.load_matcher(rules_path, cache_path, hints_path=None)
+                self.assertEqual(1, len(cached.rules))
+                self.assertEqual(0, parsed.call_count)
+                rules_path.write_text(RULES_YAML.replace("01_FUNCTIONS", "02_FUNCTIONS"), encoding="utf-8")
+                check_consistency.load_matcher(rules_path, cache_path, hints_path=None)
+                self.assertEqual(1, parsed.call_count)
+
+            rules_path.write_text(RULES_YAML, encoding="utf-8")
+            cache_path.write_text("{not json", encoding="utf-8")
+            matcher = check_consistency.load_matcher(rules_path, cache_path, hints_path=None)
+            self.assertEqual("CI-DOCS-002", matcher.rules[0].rule_id)
+            self.assertIn('"rules_sha256"', cache_path.read_text(encoding="utf-8"))
+
+    def test_parallel_scan_matches_serial_scan(self) -> None:
+        matcher = check_consistency.load_matcher(cache_path=None)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "docs").mkdir()
+            files = []
+            for idx in range(6):
+                md = root / "docs" / f"{idx:03d}_DEMO.MD"
+                md.write_text(f"# Demo {idx}\n\n{SAMPLE}", encoding="utf-8")
+                files.append(md)
+
+            with patch.object(check_consistency, "ROOT", root):
+                serial = check_consistency.scan_files(files, None, matcher, jobs=1)
+                default_method = multiprocessing.get_start_method(allow_none=True)
+                for method in multiprocessing.get_all_start_methods():
+                    multiprocessing.set_start_method(method, force=True)
+                    try:
+                        parallel = check_consistency.scan_files(files, None, matcher, jobs=3)
+                    finally:
+                        multiprocessing.set_start_method(default_method, force=True)
+                    self.assertEqual(serial, parallel, method)
+
+        self.assertTrue(serial)
+
+    def test_spawned_workers_load_the_checker_by_path(self) -> None:
+        matcher = check_consistency.load_matcher(cache_path=None)
+        files = check_consistency.collect_markdown_files()[:4]
+        texts = {file: SAMPLE for file in files}
+        serial = check_consistency.scan_files(files, texts, matcher, jobs=1)
+        method = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method("spawn", force=True)
+        try:
+            parallel = check_consistency.scan_files(files, texts, matcher, jobs=2)
+        finally:
+            multiprocessing.set_start_method(method, force=True)
+
+        self.assertTrue(serial)
+        self.assertEqual(serial, parallel)
+
+    def test_result_cache_rescans_only_changed_files(self) -> None:
+        matcher = check_consistency.load_matcher(cache_path=None)
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            (root / "docs").mkdir()
+            stale = root / "docs" / "001_STALE.MD"
+            fresh = root / "docs" / "002_FRESH.MD"
+            stale.write_text(SAMPLE, encoding="utf-8")
+            fresh.write_text("# Clean\n", encoding="utf-8")
+            cache_path = root / "cache" / "results.json"
+
+            with patch.object(check_consistency, "ROOT", root):
+                cache = check_consistency.ContentCache(cache_path, "ruleset").load()
+                expected = check_consistency.scan_files([stale, fresh], None, matcher, cache=cache)
+                cache.save()
+
+                fresh.write_text("# Still clean\n", encoding="utf-8")
+                cache = check_consistency.ContentCache(cache_path, "ruleset").load()
+                with patch.object(check_consistency, "scan_file", wraps=check_consistency.scan_file) as scan:
+                    self.assertEqual(expected, check_consistency.scan_files([stale, fresh], None, matcher, cache=cache))
+                self.assertEqual([fresh], [call.args[0] for call in scan.call_args_list])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CHECK_PATH = REPO_ROOT / "tools" / "check-doc-parity.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("check_doc_parity_module", CHECK_PATH)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module from {CHECK_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+parity = _load_module()
+
+DE_DOC = """<!-- LANG_SWITCH:BEGIN -->
+[DE](001_GUIDE.MD) | [EN](../../1_en/guides/001_GUIDE.MD)
+<!-- LANG_SWITCH:END -->
+
+# Leitfaden
+
+Siehe [API](../010_API_CORE.MD#ueberblick), [Index](../../001_INDEX_CORE.MD) und [Abschnitt](#details).
+
+## Details
+
+| Option | Wert |
+| --- | --- |
+| a | b |
+
+```mermaid
+flowchart LR
+  A --> B
+```
+
+```bash
+# [not a link](ignored.MD)
+echo ok
+```
+"""
+
+EN_DOC = """<!-- LANG_SWITCH:BEGIN -->
+[DE](../../0_de/guides/001_GUIDE.MD) | [EN](001_GUIDE.MD)
+<!-- LANG_SWITCH:END -->
+
+# Guide
+
+See [API](../010_API_CORE.MD#overview), [Index](../../101_INDEX_CORE.MD) and [section](#details).
+
+## Details
+
+| Option | Value |
+|:--|--:|
+| a | b |
+
+```mermaid
+flowchart LR
+  A --> B
+```
+
+```bash
+echo ok
+```
+"""
+
+
+class FingerprintTests(unittest.TestCase):
+    def test_counterparts_share_a_fingerprint_structure(self) -> None:
+        de = parity.fingerprint("docs/0_de/guides/001_GUIDE.MD", DE_DOC)
+        en = parity.fingerprint("docs/1_en/guides/001_GUIDE.MD", EN_DOC)
+
+        self.assertEqual(((1, "Leitfaden", 5), (2, "Details", 9)), de.headings)
+        self.assertEqual((1, 1, 1), (de.tables, de.fences, de.mermaid))
+        self.assertEqual(("docs/<lang>/010_API_CORE.MD", "docs/x01_INDEX_CORE.MD"), de.links)
+        self.assertEqual([], parity.compare(de, en))
+        self.assertEqual(de, parity.Fingerprint.from_json(de.to_json()))
+
+    def test_compare_reports_each_divergence(self) -> None:
+        de = parity.fingerprint("docs/0_de/guides/001_GUIDE.MD", DE_DOC)
+        en_text = EN_DOC.replace("## Details", "### Details").replace("```mermaid", "```text")
+        en_text = en_text.replace("[Index](../../101_INDEX_CORE.MD)", "[Repo](https://example.org/repo)")
+        en = parity.fingerprint("docs/1_en/guides/001_GUIDE.MD", en_text)
+
+        self.assertEqual(
+            [
+                "heading outline differs at heading 2 (2 DE vs 2 EN): "
+                "DE h2 'Details' (line 9) vs EN h3 'Details' (line 9)",
+                "fences: 1 DE vs 2 EN",
+                "mermaid: 1 DE vs 0 EN",
+                "link targets only in DE: docs/x01_INDEX_CORE.MD",
+                "link targets only in EN: https://example.org/repo",
+            ],
+            parity.compare(de, en),
+        )
+
+
+class ParityCheckTests(unittest.TestCase):
+    def _run(self, root: Path) -> tuple[int, str]:
+        with (
+            patch.object(parity, "ROOT", root),
+            patch.object(parity, "DOCS_DIR", root / "docs"),
+            patch.object(parity, "LANG_MAP_PATH", root / "docs" / "lang_map.json"),
+            patch.object(parity, "DE_DIR", root / "docs" / "0_de"),
+            patch.object(parity, "EN_DIR", root / "docs" / "1_en"),
+            patch.object(parity, "FINGERPRINT_CACHE_PATH", root / "cache" / "fingerprints.json"),
+            contextlib.redirect_stdout(io.StringIO()) as output,
+        ):
+            rc = parity.main([])
+        return rc, output.getvalue()
+
+    def test_reports_divergent_and_unpaired_documents_and_reuses_cached_fingerprints(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            for lang, text in (("0_de", DE_DOC), ("1_en", EN_DOC)):
+                (root / "docs" / lang / "guides").mkdir(parents=True)
+                (root / "docs" / lang / "guides" / "001_GUIDE.MD").write_text(text, encoding="utf-8")
+            extra = root / "docs" / "0_de" / "guides" / "002_EXTRA.MD"
+            extra.write_text("# Extra\n", encoding="utf-8")
+
+            rc, output = self._run(root)
+            self.assertEqual(1, rc)
+            self.assertIn("(1 pair(s), 2 fingerprinted,", output)
+            self.assertIn("- docs/0_de/guides/002_EXTRA.MD: no counterpart docs/1_en/guides/002_EXTRA.MD\n", output)
+
+            (root / "docs" / "1_en" / "guides" / "002_EXTRA.MD").write_text("# Extra\n\n## More\n", encoding="utf-8")
+            rc, output = self._run(root)
+            self.assertEqual(1, rc)
+            self.assertIn("(2 pair(s), 2 fingerprinted,", output)
+            self.assertIn(
+                "- docs/0_de/guides/002_EXTRA.MD <-> docs/1_en/guides/002_EXTRA.MD: heading outline differs at "
+                "heading 2 (1 DE vs 2 EN): DE (none) vs EN h2 'More' (line 3)\n",
+                output,
+            )
+
+            extra.write_text("# Mehr\n\n## Mehr\n", encoding="utf-8")
+            rc, output = self._run(root)
+            self.assertEqual(0, rc)
+            self.assertIn("Doc parity check OK (2 pair(s), 1 fingerprinted,", output)
+
+    def test_pairs_numbered_and_mapped_documents_like_lang_switch(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            guides = root / "docs" / "guides"
+            guides.mkdir(parents=True)
+            (guides / "010_SETUP.MD").write_text("# Einrichtung\n", encoding="utf-8")
+            (guides / "110_SETUP.MD").write_text("# Setup\n\n## Steps\n", encoding="utf-8")
+            (guides / "020_ONLY_DE.MD").write_text("# Nur Deutsch\n", encoding="utf-8")
+            (guides / "NOTES_DE.MD").write_text("# Notizen\n", encoding="utf-8")
+            (guides / "NOTES_EN.MD").write_text("# Notes\n\n## Extra\n", encoding="utf-8")
+            (guides / "UNPAIRED.MD").write_text("# Unpaired\n", encoding="utf-8")
+            (root / "docs" / "lang_map.json").write_text(
+                '{"docs/guides/NOTES_EN.MD": "docs/guides/NOTES_DE.MD"}\n', encoding="utf-8"
+            )
+
+            rc, output = self._run(root)
+            self.assertEqual(1, rc)
+            self.assertIn("(2 pair(s), 4 fingerprinted,", output)
+            self.assertIn("- docs/guides/020_ONLY_DE.MD: no counterpart docs/guides/120_ONLY_DE.MD\n", output)
+            self.assertIn(
+                "- docs/guides/010_SETUP.MD <-> docs/guides/110_SETUP.MD: heading outline differs at heading 2 "
+                "(1 DE vs 2 EN): DE (none) vs EN h2 'Steps' (line 3)\n",
+                output,
+            )
+            self.assertIn(
+                "- docs/guides/NOTES_DE.MD <-> docs/guides/NOTES_EN.MD: heading outline differs at heading 2 "
+                "(1 DE vs 2 EN): DE (none) vs EN h2 'Extra' (line 3)\n",
+                output,
+            )
+            self.assertNotIn("UNPAIRED", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
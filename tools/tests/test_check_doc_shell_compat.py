@@ -1,6 +1,9 @@
 from __future__ import annotations
 
 import importlib.util
+import multiprocessing
+import os
+import sys
 import tempfile
 import unittest
 from pathlib import Path
@@ -16,12 +19,32 @@ def _load_module():
     if spec is None or spec.loader is None:
         raise RuntimeError(f"Unable to load module from {CHECK_PATH}")
     module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
     spec.loader.exec_module(module)
     return module
 
 
 check_shell = _load_module()
 
+# Emits a json1 finding for every `$` on line 2 of every script and logs each invocation.
+FAKE_SHELLCHECK = f"""#!{sys.executable}
+import json, os, sys
+scripts = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+with open(os.environ["FAKE_SHELLCHECK_LOG"], "a", encoding="utf-8") as log:
+    log.write(" ".join(sys.argv[1:]) + "\\n")
+comments = []
+for name in scripts:
+    with open(name, encoding="utf-8") as script:
+        line = script.read().splitlines()[1]
+    comments.extend(
+        {{"file": name, "line": 2, "column": col + 1, "code": 2086, "message": "Double quote to prevent globbing."}}
+        for col, char in enumerate(line)
+        if char == "$"
+    )
+print(json.dumps({{"comments": comments}}))
+sys.exit(1 if comments else 0)
+"""
+
 
 class DocShellCompatTests(unittest.TestCase):
     def test_flags_unquoted_gh_api_query_in_bash_fence(self) -> None:
@@ -66,6 +89,100 @@ class DocShellCompatTests(unittest.TestCase):
 
             self.assertEqual([], errors)
 
+    def test_parallel_scan_matches_serial_order(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            files = []
+            for idx in range(6):
+                md = root / f"{idx:03d}_DEMO.MD"
+                md.write_text(
+                    f"""# Demo\n\n```bash\ngh api repos/org/repo/pulls?page={idx}\nls artifacts/nuget/*.nupkg\n```\n""",
+                    encoding="utf-8",
+                )
+                files.append(md)
+
+            with patch.object(check_shell, "ROOT", root):
+                serial = check_shell.scan_files(files, None, jobs=1)
+                default_method = multiprocessing.get_start_method(allow_none=True)
+                for method in multiprocessing.get_all_start_methods():
+                    multiprocessing.set_start_method(method, force=True)
+                    try:
+                        parallel = check_shell.scan_files(files, None, jobs=3)
+                    finally:
+                        multiprocessing.set_start_method(default_method, force=True)
+                    self.assertEqual(serial, parallel, method)
+
+            self.assertEqual(12, len(serial))
+
+    def test_spawned_workers_load_the_checker_by_path(self) -> None:
+        files = check_shell.collect_markdown_files()[:4]
+        texts = {file: "# Demo\n\n```bash\nls artifacts/nuget/*.nupkg\n```\n" for file in files}
+        serial = check_shell.scan_files(files, texts, jobs=1)
+        method = multiprocessing.get_start_method(allow_none=True)
+        multiprocessing.set_start_method("spawn", force=True)
+        try:
+            parallel = check_shell.scan_files(files, texts, jobs=2)
+        finally:
+            multiprocessing.set_start_method(method, force=True)
+
+        self.assertEqual(4, len(serial))
+        self.assertEqual(serial, parallel)
+
+    def test_result_cache_replays_unchanged_files_and_discards_foreign_caches(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            md = root / "README.md"
+            md.write_text("""# Demo\n\n```bash\nls artifacts/nuget/*.nupkg\n```\n""", encoding="utf-8")
+            cache_path = root / "cache" / "results.json"
+
+            with patch.object(check_shell, "ROOT", root):
+                cache = check_shell.ContentCache(cache_path, "rules-v1").load()
+                first = check_shell.scan_files([md], None, cache=cache)
+                cache.save()
+
+                with patch.object(check_shell, "check_file", side_effect=AssertionError("rescanned")):
+                    cache = check_shell.ContentCache(cache_path, "rules-v1").load()
+                    self.assertEqual(first, check_shell.scan_files([md], None, cache=cache))
+
+                md.write_text("# Demo\n", encoding="utf-8")
+                cache = check_shell.ContentCache(cache_path, "rules-v1").load()
+                self.assertEqual([], check_shell.scan_files([md], None, cache=cache))
+
+            self.assertEqual({}, check_shell.ContentCache(cache_path, "rules-v2").load().entries)
+            cache_path.write_text("{truncated", encoding="utf-8")
+            self.assertEqual({}, check_shell.ContentCache(cache_path, "rules-v1").load().entries)
+
+    def test_shellcheck_runs_once_for_all_fences_and_maps_lines_back(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            binary = root / "shellcheck"
+            binary.write_text(FAKE_SHELLCHECK, encoding="utf-8")
+            binary.chmod(0o755)
+            log = root / "calls.log"
+            first = root / "README.md"
+            first.write_text("# A\n\n```bash\necho one\necho $x $x\n```\n\n```bash\nls\nls $y\n```\n", encoding="utf-8")
+            second = root / "SECURITY.md"
+            second.write_text("# B\n```bash\ncd /\necho $z\n```\n```text\nnot shell\n```\n", encoding="utf-8")
+
+            with patch.object(check_shell, "ROOT", root), patch.dict(os.environ, {"FAKE_SHELLCHECK_LOG": str(log)}):
+                errors = check_shell.scan_files(
+                    [first, second], None, jobs=1, shellcheck=check_shell.Shellcheck(str(binary), "warning")
+                )
+
+            self.assertEqual(
+                [
+                    "README.md:5:6 [SC2086] Double quote to prevent globbing.",
+                    "README.md:5:9 [SC2086] Double quote to prevent globbing.",
+                    "README.md:10:4 [SC2086] Double quote to prevent globbing.",
+                    "SECURITY.md:4:6 [SC2086] Double quote to prevent globbing.",
+                ],
+                errors,
+            )
+            calls = log.read_text(encoding="utf-8").splitlines()
+            self.assertEqual(1, len(calls))
+            self.assertIn("--format=json1", calls[0])
+            self.assertIn("--severity=warning", calls[0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CHECK_PATH = REPO_ROOT / "tools" / "check-docs-lint.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("check_docs_lint_module", CHECK_PATH)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module from {CHECK_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+docs_lint = _load_module()
+
+
+class FileStoreTests(unittest.TestCase):
+    def test_walks_once_skips_git_and_reads_each_file_once(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / ".git").mkdir()
+            (root / ".git" / "HEAD").write_text("ref: refs/heads/main\n", encoding="utf-8")
+            (root / "docs").mkdir()
+            doc = root / "docs" / "001_INDEX.MD"
+            doc.write_text("# Index\n", encoding="utf-8")
+            (root / "README.md").write_text("# Demo\n", encoding="utf-8")
+
+            store = docs_lint.FileStore(root)
+            self.assertEqual([root / "README.md", doc], list(store))
+            self.assertNotIn(root / ".git" / "HEAD", store)
+
+            self.assertEqual("# Index\n", store[doc])
+            doc.write_text("# Changed\n", encoding="utf-8")
+            self.assertEqual("# Index\n", store[doc])
+            self.assertEqual(1, store.reads)
+            with self.assertRaises(KeyError):
+                store[root / "missing.md"]
+
+    def test_checker_file_selection_matches_direct_walk(self) -> None:
+        store = docs_lint.FileStore(docs_lint.ROOT)
+        for script in ("check-doc-consistency.py", "check-doc-shell-compat.py"):
+            module = docs_lint.load_checker(script)
+            self.assertEqual(module.collect_markdown_files(), module.collect_markdown_files(store), script)
+        check_docs = docs_lint.load_checker("check-docs.py")
+        self.assertEqual(check_docs.collect_targets(), check_docs.collect_targets(store))
+        self.assertEqual(check_docs.check_docs_naming(), check_docs.check_docs_naming(store))
+        self.assertEqual(
+            check_docs.check_readme_coverage_and_template(),
+            check_docs.check_readme_coverage_and_template(texts=store),
+        )
+
+
+class WatchSessionTests(unittest.TestCase):
+    def test_change_rechecks_documents_linking_to_the_changed_file(self) -> None:
+        check_docs = docs_lint.load_checker("check-docs.py")
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / "docs").mkdir()
+            index = root / "docs" / "001_INDEX.MD"
+            target = root / "docs" / "002_TARGET.MD"
+            other = root / "docs" / "003_OTHER.MD"
+            index.write_text(
+                "# Index\n\n[Setup](https://github.com/tomtastisch/FileClassifier/blob/main/docs/002_TARGET.MD#setup)\n",
+                encoding="utf-8",
+            )
+            target.write_text("# Target\n\n## Setup\n", encoding="utf-8")
+            other.write_text("# Other\n", encoding="utf-8")
+
+            args = docs_lint.parse_args(["--only", "docs", "--no-url-cache"])
+            session = docs_lint.WatchSession(args, docs_lint.FileStore(root), {"docs": check_docs})
+            with (
+                patch.object(check_docs, "ROOT", root),
+                patch.object(check_docs, "DOCS_DIR", root / "docs"),
+                patch.object(check_docs, "SRC_FTD_DIR", root / "src" / "FileTypeDetection"),
+                contextlib.redirect_stdout(io.StringIO()) as output,
+            ):
+                self.assertEqual(0, session.cycle(None))
+
+                target.write_text("# Target\n\n## Install\n", encoding="utf-8")
+                self.assertEqual(1, session.cycle({target}))
+                session.close()
+
+            report = output.getvalue()
+            self.assertIn("1 change(s), 2 file(s) re-checked", report)
+            self.assertIn(
+                "- [docs] broken internal repo URL in docs/001_INDEX.MD:3: "
+                "https://github.com/tomtastisch/FileClassifier/blob/main/docs/002_TARGET.MD#setup "
+                "(anchor not found in docs/002_TARGET.MD (#setup))",
+                report,
+            )
+
+
+class ParseArgsTests(unittest.TestCase):
+    def test_unknown_options_pass_through_to_check_docs(self) -> None:
+        args = docs_lint.parse_args(["--only", "docs", "--no-url-cache"])
+        self.assertEqual(["docs"], args.only)
+        self.assertEqual(["--no-url-cache"], args.docs_argv)
+
+    def test_unknown_options_rejected_without_docs_check(self) -> None:
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            docs_lint.parse_args(["--only", "drift", "--no-url-cache"])
+
+    def test_parity_runs_only_when_requested(self) -> None:
+        default = docs_lint.selected_plugins(docs_lint.parse_args([]))
+        self.assertEqual(["docs", "drift", "shell", "roc"], [plugin.name for plugin in default])
+        requested = docs_lint.selected_plugins(docs_lint.parse_args(["--only", "parity", "--only", "docs"]))
+        self.assertEqual(["docs", "parity"], [plugin.name for plugin in requested])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import json
+import subprocess
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CHECK_PATH = REPO_ROOT / "tools" / "ci" / "bin" / "check_naming_snt.py"
+SSOT_PATH = REPO_ROOT / "tools" / "ci" / "policies" / "data" / "naming.json"
+
+FIXTURE = {
+    "src/FileTypeDetection/FileTypeDetectionLib.vbproj": (
+        "<Project>\n  <PropertyGroup>\n    <PackageId>Wrong.Id</PackageId>\n"
+        "    <RootNamespace>Tomtastisch.FileClassifier</RootNamespace>\n"
+        "    <AssemblyName>Tomtastisch.FileClassifier</AssemblyName>\n  </PropertyGroup>\n</Project>\n"
+    ),
+    "src/FileTypeDetection/A.vb": "Namespace Tomtastisch.FileClassifier\nEnd Namespace\n",
+    "src/FileTypeDetection/sub/B.vb": "Namespace Global.FileTypeDetection.Legacy\nEnd Namespace\n  Namespace Other\n",
+    "README.md": (
+        "# Readme\r\n\x0cintro\r\nsee Tomtastisch.FileTypeDetection docs\n\n"
+        "```bash\ndotnet add package Tomtastisch.FileTypeDetection\n```\n"
+    ),
+    "docs/021_USAGE_NUGET.MD": '# Usage\n\n<PackageReference Include="Tomtastisch.FileClassifier" />\n',
+    "docs/guides/003_GUIDE_PORTABLE.MD": "# Portable\n\nno package here\n",
+    "samples/PortableConsumer/PortableConsumer.csproj": (
+        '<Project><ItemGroup><PackageReference Include="Tomtastisch.FileClassifier" /></ItemGroup></Project>\n'
+    ),
+    "tests/PackageBacked.Tests/PackageBacked.Tests.csproj": "<Project></Project>\n",
+}
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("check_naming_snt_module", CHECK_PATH)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module from {CHECK_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+naming_snt = _load_module()
+
+
+def _make_repo(root: Path) -> None:
+    for rel, text in FIXTURE.items():
+        path = root / rel
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(text.encode("utf-8"))
+    (root / "naming.json").write_bytes(SSOT_PATH.read_bytes())
+    (root / "artifacts").mkdir()
+    subprocess.run(["git", "init", "-q", str(root)], check=True)
+    subprocess.run(
+        ["git", "-C", str(root), "remote", "add", "origin", "git@github.com:tomtastisch/FileClassifier.git"],
+        check=True,
+    )
+
+
+def _run(root: Path) -> tuple[int, dict[str, object]]:
+    argv = ["check_naming_snt.py", str(root), str(root / "naming.json"), str(root / "artifacts" / "summary.json")]
+    with patch.object(sys, "argv", argv), contextlib.redirect_stdout(io.StringIO()):
+        rc = naming_snt.main()
+    return rc, json.loads((root / "artifacts" / "naming_snt_report.json").read_text(encoding="utf-8"))
+
+
+class FileStoreTests(unittest.TestCase):
+    def test_line_numbers_follow_splitlines_and_large_files_use_mmap(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "sample.txt"
+            text = "a\r\nb\rc\x0cneedle\n\u2028d needle\n"
+            path.write_text(text, encoding="utf-8", newline="")
+            store = naming_snt.FileStore()
+
+            expected = [idx for idx, line in enumerate(text.splitlines(), start=1) if "needle" in line][0]
+            self.assertEqual(expected, store.first_line(path, "needle"))
+            self.assertEqual(1, store.first_line(path, "missing"))
+            self.assertEqual(6, store.line_of(path, text.rindex("needle")))
+            self.assertEqual(1, store.reads)
+
+            other = Path(tmp) / "large.lock.json"
+            other.write_text('{"Tomtastisch.FileClassifier": "1.0.0"}\n', encoding="utf-8")
+            needle_set = naming_snt.NeedleSet(["Tomtastisch.FileClassifier", "Tomtastisch.FileTypeDetection"])
+            with patch.object(naming_snt, "LARGE_FILE_BYTES", 1):
+                store = naming_snt.FileStore()
+                self.assertEqual({"Tomtastisch.FileClassifier"}, store.needles_in(other, needle_set))
+            self.assertEqual(0, store.reads)
+            self.assertEqual({"Tomtastisch.FileClassifier"}, naming_snt.FileStore().needles_in(other, needle_set))
+
+
+class NeedleSetTests(unittest.TestCase):
+    def test_reports_every_overlapping_occurrence_like_a_naive_search(self) -> None:
+        needles = ["he", "she", "his", "hers", "Tomtastisch.File", "Tomtastisch.FileClassifier", "File"]
+        text = "ushers say: dotnet add package Tomtastisch.FileClassifier; shehis Tomtastisch.FileTypeDetection"
+        needle_set = naming_snt.NeedleSet([*needles, "", "he"])
+
+        expected = sorted(
+            (start, needle)
+            for needle in needles
+            for start in range(len(text))
+            if text.startswith(needle, start)
+        )
+        self.assertEqual(tuple(needles), needle_set.needles)
+        self.assertEqual(expected, needle_set.scan(text))
+        self.assertEqual([], needle_set.scan("nothing to find"))
+
+
+class NamingSntTests(unittest.TestCase):
+    def test_evidence_lines_are_resolved_from_a_single_read_per_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            _make_repo(root)
+            with patch.object(Path, "read_text", autospec=True, side_effect=Path.read_text) as read_text:
+                rc, report = _run(root)
+
+        self.assertEqual(1, rc)
+        self.assertEqual(
+            [
+                ("vbproj.PackageId", "src/FileTypeDetection/FileTypeDetectionLib.vbproj:3"),
+                ("code.namespace.prefix", "src/FileTypeDetection/sub/B.vb:1"),
+                ("code.namespace.prefix", "src/FileTypeDetection/sub/B.vb:3"),
+                ("canonical_reference", "README.md"),
+                ("canonical_reference", "docs/guides/003_GUIDE_PORTABLE.MD"),
+                ("canonical_reference", "tests/PackageBacked.Tests/PackageBacked.Tests.csproj"),
+                ("deprecated_id_in_install_docs", "README.md:4"),
+            ],
+            [(v["scope"], v["evidence"]) for v in report["violations"]],
+        )
+        self.assertEqual(
+            [{"id": "Tomtastisch.FileTypeDetection", "evidence": "README.md:4"}],
+            report["deprecated_hits"],
+        )
+        reads = [call.args[0].relative_to(root).as_posix() for call in read_text.call_args_list]
+        self.assertEqual(len(reads), len(set(reads)), reads)
+
+    def test_namespaces_are_cached_by_content_and_build_output_is_skipped(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            _make_repo(root)
+            for build_dir in ("obj/Debug", "bin"):
+                generated = root / "src" / "FileTypeDetection" / build_dir / "Generated.vb"
+                generated.parent.mkdir(parents=True)
+                generated.write_text("Namespace Generated\nEnd Namespace\n", encoding="utf-8")
+
+            def namespace_violations(report: dict[str, object]) -> list[str]:
+                return [v["evidence"] for v in report["violations"] if v["scope"] == "code.namespace.prefix"]
+
+            _, cold = _run(root)
+            self.assertEqual(["src/FileTypeDetection/sub/B.vb:1", "src/FileTypeDetection/sub/B.vb:3"],
+                             namespace_violations(cold))
+            self.assertNotIn("src/FileTypeDetection/bin/Generated.vb", cold["checked_paths"])
+            self.assertNotIn("src/FileTypeDetection/obj/Debug/Generated.vb", cold["checked_paths"])
+
+            (root / "src" / "FileTypeDetection" / "A.vb").write_text("Namespace Elsewhere\n", encoding="utf-8")
+            with patch.object(
+                naming_snt, "declared_namespaces", side_effect=naming_snt.declared_namespaces
+            ) as parse:
+                _, warm = _run(root)
+            self.assertEqual(1, parse.call_count)
+            self.assertEqual(
+                [
+                    "src/FileTypeDetection/A.vb:1",
+                    "src/FileTypeDetection/sub/B.vb:1",
+                    "src/FileTypeDetection/sub/B.vb:3",
+                ],
+                namespace_violations(warm),
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CHECK_PATH = REPO_ROOT / "tools" / "check-policy-roc.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("check_policy_roc_module", CHECK_PATH)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module from {CHECK_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+policy_roc = _load_module()
+
+
+class PolicyRocIndexTests(unittest.TestCase):
+    def _run(self, root: Path, *argv: str) -> tuple[int, str]:
+        with (
+            patch.object(policy_roc, "ROOT", root),
+            patch.object(policy_roc, "DOCS", root / "docs"),
+            patch.object(policy_roc, "RULES", root / "tools" / "ci" / "policies" / "rules"),
+            contextlib.redirect_stdout(io.StringIO()) as output,
+        ):
+            rc = policy_roc.main(["--out", "out/matrix.tsv", "--index", "out/index.json", *argv])
+        return rc, output.getvalue()
+
+    def test_index_answers_both_directions_and_reparses_only_changed_policies(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            rules = root / "tools" / "ci" / "policies" / "rules"
+            rules.mkdir(parents=True)
+            (rules / "docs_drift.yaml").write_text("rules: []\n", encoding="utf-8")
+            (rules / "naming.yaml").write_text("rules: []\n", encoding="utf-8")
+            (root / "docs").mkdir()
+            ci = root / "docs" / "001_POLICY_CI.MD"
+            naming = root / "docs" / "002_POLICY_NAMING.MD"
+            ci.write_text("# CI\n\n`tools/ci/policies/rules/docs_drift.yaml`\n", encoding="utf-8")
+            naming.write_text(
+                "# Naming\n\n"
+                "[rule](https://github.com/tomtastisch/FileClassifier/blob/main/tools/ci/policies/rules/naming.yaml)\n"
+                "`tools/ci/policies/rules/docs_drift.yaml`\n",
+                encoding="utf-8",
+            )
+
+            self.assertEqual(0, self._run(root)[0])
+            matrix = (root / "out" / "matrix.tsv").read_text(encoding="utf-8")
+            self.assertEqual((0, "docs/001_POLICY_CI.MD\ndocs/002_POLICY_NAMING.MD\n"),
+                             self._run(root, "--policies-citing", "docs_drift.yaml"))
+            self.assertEqual(
+                (0, "tools/ci/policies/rules/docs_drift.yaml\ntools/ci/policies/rules/naming.yaml\n"),
+                self._run(root, "--rules-cited-by", "docs/002_POLICY_NAMING.MD"),
+            )
+            self.assertEqual(1, self._run(root, "--policies-citing", "missing.yaml")[0])
+
+            ci.write_text("# CI\n\nNo rule links any more.\n", encoding="utf-8")
+            with patch.object(policy_roc, "extract_rule_refs", wraps=policy_roc.extract_rule_refs) as extract:
+                self.assertEqual(1, self._run(root)[0])
+            self.assertEqual(1, extract.call_count)
+            self.assertEqual((0, "docs/002_POLICY_NAMING.MD\n"), self._run(root, "--policies-citing", "docs_drift.yaml"))
+
+            ci.write_text("# CI\n\n`tools/ci/policies/rules/docs_drift.yaml`\n", encoding="utf-8")
+            self.assertEqual(0, self._run(root)[0])
+            self.assertEqual(matrix, (root / "out" / "matrix.tsv").read_text(encoding="utf-8"))
+
+    def test_query_without_index_fails(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            rc, output = self._run(Path(tmp).resolve(), "--policies-citing", "docs_drift.yaml")
+        self.assertEqual(2, rc)
+        self.assertIn("policy/rule index not found", output)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,277 @@
+from __future__ import annotations
+
+import contextlib
+import importlib.util
+import io
+import multiprocessing
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+CHECK_PATH = REPO_ROOT / "tools" / "lang_switch" / "update_lang_headers.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("update_lang_headers_module", CHECK_PATH)
+    if spec is None or spec.loader is None:
+        raise RuntimeError(f"Unable to load module from {CHECK_PATH}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+lang_headers = _load_module()
+
+HEADER = "<!-- LANG_SWITCH:BEGIN -->\n[DE](001_DEMO.MD) | [EN](101_DEMO.MD)\n<!-- LANG_SWITCH:END -->"
+
+
+class HeaderCheckTests(unittest.TestCase):
+    def test_prefix_check_agrees_with_full_normalization(self) -> None:
+        cases = {
+            "in_sync": f"{HEADER}\n\n# Demo\n",
+            "crlf_in_sync": f"{HEADER}\n\n# Demo\n".replace("\n", "\r\n"),
+            "header_only": f"{HEADER}\n",
+            "trailing_blank_lines": f"{HEADER}\n\n",
+            "extra_blank_line": f"{HEADER}\n\n\n# Demo\n",
+            "single_blank_missing": f"{HEADER}\n# Demo\n",
+            "stale_link": f"{HEADER.replace('101_DEMO', '102_DEMO')}\n\n# Demo\n",
+            "crlf_body_lf_header": f"{HEADER}\r\n\r\n# Demo\r\n",
+            "crlf_extra_blank_line": f"{HEADER}\n\n\r\n# Demo\n",
+            "missing_header": "# Demo\n",
+            "unterminated_header": "<!-- LANG_SWITCH:BEGIN -->\n" + "x" * 5000,
+            "long_body": f"{HEADER}\n\n" + "# Demo\n" * 2000,
+            "later_block": f"{HEADER}\n\n# Demo\n\n```markdown\n{HEADER}\n```\n",
+        }
+        with tempfile.TemporaryDirectory() as tmp:
+            docs = Path(tmp)
+            path, de_target, en_target = docs / "001_DEMO.MD", docs / "001_DEMO.MD", docs / "101_DEMO.MD"
+            for name, text in cases.items():
+                path.write_bytes(text.encode("utf-8"))
+                _, changed = lang_headers.normalize_with_header(path, de_target, en_target)
+                in_sync, full_read = lang_headers.header_in_sync(path, de_target, en_target)
+                self.assertEqual(not changed, in_sync, name)
+                self.assertEqual(name in {"missing_header", "unterminated_header"}, full_read, name)
+
+    def test_write_mode_keeps_blocks_after_the_leading_header(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            docs = Path(tmp)
+            path, de_target, en_target = docs / "001_DEMO.MD", docs / "001_DEMO.MD", docs / "101_DEMO.MD"
+            example = f"# Demo\n\n```markdown\n{HEADER}\n```\n"
+            path.write_text(f"{HEADER.replace('101_DEMO', '102_DEMO')}\n\n{example}", encoding="utf-8")
+            updated, changed = lang_headers.normalize_with_header(path, de_target, en_target)
+            self.assertTrue(changed)
+            self.assertEqual(f"{HEADER}\n\n{example}", updated)
+
+    def test_check_mode_reports_drift_without_writing(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            docs = root / "docs"
+            docs.mkdir()
+            (docs / "001_DEMO.MD").write_text(f"{HEADER}\n\n# Demo\n", encoding="utf-8")
+            stale = docs / "101_DEMO.MD"
+            stale.write_text("# Demo\n", encoding="utf-8")
+
+            argv = ["--repo-root", str(root), "--check"]
+            with (
+                contextlib.redirect_stdout(io.StringIO()) as output,
+                contextlib.redirect_stderr(io.StringIO()) as errors,
+            ):
+                self.assertEqual(1, lang_headers.main(argv))
+            self.assertIn('"drifted": 1', output.getvalue())
+            self.assertEqual("docs/101_DEMO.MD: language switch header out of date\n", errors.getvalue())
+            self.assertEqual("# Demo\n", stale.read_text(encoding="utf-8"))
+            self.assertEqual(["001_DEMO.MD", "101_DEMO.MD"], sorted(p.name for p in docs.iterdir()))
+
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(0, lang_headers.main(["--repo-root", str(root)]))
+            with (
+                patch.object(lang_headers, "normalize_with_header") as normalize,
+                contextlib.redirect_stdout(io.StringIO()),
+            ):
+                self.assertEqual(0, lang_headers.main(argv))
+            normalize.assert_not_called()
+
+
+class CounterpartResolutionTests(unittest.TestCase):
+    def test_index_resolves_counterparts_without_stat_calls(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp).resolve()
+            (root / "docs" / "sub").mkdir(parents=True)
+            (root / "src").mkdir()
+            for rel in ("docs/sub/001_A.MD", "docs/sub/101_A.MD", "docs/sub/002_B.MD", "docs/guide_DE.md",
+                        "docs/guide_EN.md", "docs/notes.md", "src/NOTES_EN.md", "README.md"):
+                (root / rel).write_text("# Demo\n", encoding="utf-8")
+            lang_map = {
+                "docs/guide_DE.md": "docs/guide_EN.md",
+                "docs/guide_EN.md": "docs/../docs/missing_DE.md",
+                "docs/notes.md": "src/NOTES_EN.md",
+            }
+
+            index = lang_headers.PathIndex(root, root / "docs")
+            files = lang_headers.collect_markdown_files(root, root / "docs", True, index)
+            with patch.object(Path, "is_file", side_effect=AssertionError("unexpected stat")):
+                in_tree = [r for r in files if r.rel_path != "docs/notes.md"]
+                resolved = lang_headers.resolve_all(root, in_tree, lang_map, index)
+            outside = [r for r in files if r.rel_path == "docs/notes.md"]
+            resolved += lang_headers.resolve_all(root, outside, lang_map, index)
+
+        self.assertEqual(
+            [
+                ("README.md", "README.md", "needs_map"),
+                ("docs/guide_DE.md", "docs/guide_EN.md", "ok"),
+                ("docs/guide_EN.md", "docs/missing_DE.md", "missing_counterpart"),
+                ("docs/sub/001_A.MD", "docs/sub/101_A.MD", "ok"),
+                ("docs/sub/002_B.MD", "docs/sub/102_B.MD", "missing_counterpart"),
+                ("docs/sub/101_A.MD", "docs/sub/001_A.MD", "ok"),
+                ("docs/notes.md", "src/NOTES_EN.md", "ok"),
+            ],
+            [(r.current.rel_path, r.counterpart_rel, r.status) for r in resolved],
+        )
+
+
+class BatchApplyTests(unittest.TestCase):
+    def _tree(self, root: Path) -> dict[Path, str]:
+        docs = root / "docs"
+        docs.mkdir()
+        originals = {}
+        for idx in range(4):
+            for prefix in ("0", "1"):
+                path = docs / f"{prefix}{idx:02d}_DEMO.MD"
+                originals[path] = f"# Demo {prefix}{idx}\n"
+                path.write_text(originals[path], encoding="utf-8")
+        return originals
+
+    def test_parallel_batch_matches_serial_and_leaves_no_staging_files(self) -> None:
+        default_method = multiprocessing.get_start_method(allow_none=True)
+        runs = [("serial", "1"), *((method, "3") for method in multiprocessing.get_all_start_methods())]
+        trees = {}
+        for label, jobs in runs:
+            with tempfile.TemporaryDirectory() as tmp:
+                root = Path(tmp)
+                originals = self._tree(root)
+                if label != "serial":
+                    multiprocessing.set_start_method(label, force=True)
+                try:
+                    with contextlib.redirect_stdout(io.StringIO()) as output:
+                        self.assertEqual(0, lang_headers.main(["--repo-root", tmp, "--jobs", jobs]))
+                finally:
+                    multiprocessing.set_start_method(default_method, force=True)
+                self.assertIn('"changed_files": 8', output.getvalue())
+                trees[label] = {p.name: p.read_bytes() for p in sorted((root / "docs").iterdir())}
+
+        for label, tree in trees.items():
+            self.assertEqual(trees["serial"], tree, label)
+        self.assertEqual(
+            sorted(["lang_switch_report.json", "lang_switch_report.md", *(p.name for p in originals)]),
+            sorted(trees["serial"]),
+        )
+
+    def test_failed_replace_rolls_back_every_file(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            originals = self._tree(root)
+            calls = []
+            real_replace = os.replace
+
+            def failing_replace(src, dst):
+                calls.append(dst)
+                if len(calls) == 3:
+                    raise OSError("disk full")
+                real_replace(src, dst)
+
+            with patch.object(lang_headers.os, "replace", side_effect=failing_replace), self.assertRaises(OSError):
+                lang_headers.main(["--repo-root", tmp])
+
+            self.assertEqual(originals, {p: p.read_text(encoding="utf-8") for p in originals})
+            self.assertEqual(sorted(p.name for p in originals), sorted(p.name for p in (root / "docs").iterdir()))
+
+    def test_interrupted_batch_is_rolled_back_on_next_run(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            originals = self._tree(root)
+            index = lang_headers.PathIndex(root, root / "docs")
+            files = lang_headers.collect_markdown_files(root, root / "docs", False, index)
+            resolutions = lang_headers.resolve_all(root, files, {}, index)
+            updates = lang_headers.compute_updates(resolutions)
+            journal = root / "docs" / lang_headers.JOURNAL_NAME
+            real_replace = os.replace
+
+            def interrupted_replace(src, dst):
+                real_replace(src, dst)
+                raise KeyboardInterrupt
+
+            with (
+                patch.object(lang_headers, "rollback_journal"),
+                patch.object(lang_headers.os, "replace", side_effect=interrupted_replace),
+                self.assertRaises(KeyboardInterrupt),
+            ):
+                lang_headers.apply_batch(updates, journal)
+            self.assertNotEqual(originals[updates[0][0].path], updates[0][0].path.read_text(encoding="utf-8"))
+
+            with (
+                patch.object(lang_headers, "apply_batch", return_value=0),
+                contextlib.redirect_stdout(io.StringIO()),
+                contextlib.redirect_stderr(io.StringIO()) as errors,
+            ):
+                lang_headers.main(["--repo-root", tmp])
+
+            self.assertEqual(f"Rolled back {len(updates)} file(s) from an interrupted batch.\n", errors.getvalue())
+            self.assertFalse(journal.exists())
+            self.assertEqual(originals, {p: p.read_text(encoding="utf-8") for p in originals})
+            self.assertEqual(
+                sorted([p.name for p in originals] + ["lang_switch_report.json", "lang_switch_report.md"]),
+                sorted(p.name for p in (root / "docs").iterdir()),
+            )
+
+    def test_interrupted_backup_cleanup_keeps_the_committed_batch(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            originals = self._tree(root)
+            with contextlib.redirect_stdout(io.StringIO()):
+                lang_headers.main(["--repo-root", tmp])
+            committed = {p: p.read_text(encoding="utf-8") for p in originals}
+            self.assertNotEqual(originals, committed)
+
+            backups = [lang_headers.staging_paths(p)[1] for p in originals]
+            for path, backup in zip(originals, backups):
+                backup.write_text(originals[path], encoding="utf-8")
+            with (
+                contextlib.redirect_stdout(io.StringIO()),
+                contextlib.redirect_stderr(io.StringIO()) as errors,
+            ):
+                self.assertEqual(0, lang_headers.main(["--repo-root", tmp]))
+
+            self.assertEqual("", errors.getvalue())
+            self.assertEqual(committed, {p: p.read_text(encoding="utf-8") for p in originals})
+            self.assertFalse(any(backup.exists() for backup in backups))
+
+    def test_journal_is_removed_before_backups(self) -> None:
+        with tempfile.TemporaryDirectory() as tmp:
+            root = Path(tmp)
+            self._tree(root)
+            index = lang_headers.PathIndex(root, root / "docs")
+            files = lang_headers.collect_markdown_files(root, root / "docs", False, index)
+            updates = lang_headers.compute_updates(lang_headers.resolve_all(root, files, {}, index))
+            journal = root / "docs" / lang_headers.JOURNAL_NAME
+            journal_present = []
+            real_unlink = Path.unlink
+
+            def recording_unlink(path, missing_ok=False):
+                if path.name.endswith(".lang-switch.bak"):
+                    journal_present.append(journal.exists())
+                real_unlink(path, missing_ok=missing_ok)
+
+            with patch.object(Path, "unlink", recording_unlink):
+                lang_headers.apply_batch(updates, journal)
+
+            self.assertEqual([False] * len(updates), journal_present)
+
+
+if __name__ == "__main__":
+    unittest.main()